@@ -0,0 +1,227 @@
+"""
+This module holds the admission queue of harvest starts. It caps the
+number of concurrent harvests globally and per owner (settings.
+HARVEST_CONCURRENCY). Starts beyond the cap are queued in the database
+and released in order by the poller, on every tick, as soon as running
+harvests finish. A harvester without a status snapshot occupies a slot
+and its own start stays queued until its state is known. All harvest
+starts (GUI, API and the harvest scheduler) go through start_harvests().
+"""
+import contextlib
+import logging
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.response import Response
+
+from api import harvester_cache
+from api.constants import HCCJSONConstants as HCCJC
+from api.harvester_api import call_harvester_apis
+from api.models import AdmissionLock, Harvester, QueuedHarvest
+
+__author__ = "Jan Frömberg"
+__copyright__ = "Copyright 2018, GeRDI Project"
+__credits__ = ["Jan Frömberg"]
+__license__ = "Apache 2.0"
+__maintainer__ = "Jan Frömberg"
+__email__ = "jan.froemberg@tu-dresden.de"
+
+# Get an instance of a logger
+LOGGER = logging.getLogger(__name__)
+
+# primary key of the AdmissionLock row
+LOCK = 1
+
+
+def is_capped():
+    """Return True if the number of concurrent harvests is limited."""
+    conf = settings.HARVEST_CONCURRENCY
+    return bool(conf['MAX'] or conf['MAX_PER_OWNER'])
+
+
+def started_key(harvester):
+    """Return the cache key of the last admitted start of a harvester."""
+    return "hcc:admission:started:{}".format(harvester.name)
+
+
+@contextlib.contextmanager
+def admission_lock():
+    """
+    Serialize admission decisions of all worker processes: the update of
+    the lock row keeps the row (the database on sqlite) locked until the
+    transaction of the admission ends.
+    """
+    with transaction.atomic():
+        if not AdmissionLock.objects.filter(pk=LOCK).update(
+                acquired=timezone.now()):
+            # the first admission creates the lock row
+            try:
+                with transaction.atomic():
+                    AdmissionLock.objects.create(pk=LOCK,
+                                                 acquired=timezone.now())
+            except IntegrityError:
+                AdmissionLock.objects.filter(pk=LOCK).update(
+                    acquired=timezone.now())
+        yield
+
+
+def is_running(harvester, snapshot):
+    """
+    Return True if a harvester is harvesting according to its last status
+    snapshot or if its harvest was admitted after that snapshot was taken
+    (a start takes a while to show up in the status). Return None if its
+    state is unknown, i.e. it has no snapshot.
+    """
+    started = cache.get(started_key(harvester))
+    if started is not None and (
+            snapshot is None or snapshot[harvester_cache.TIMESTAMP] < started):
+        return True
+    if snapshot is None:
+        return None
+    return harvester_cache.is_active(
+        harvester_cache.snapshot_feedback(harvester, snapshot))
+
+
+def running_harvesters():
+    """
+    Return the running harvesters and the harvesters of unknown state,
+    each as a dictionary of owner ids by name.
+    """
+    harvesters = list(Harvester.objects.filter(enabled=True))
+    snapshots = harvester_cache.get_snapshots(harvesters)
+    running, unknown = {}, {}
+    for harvester in harvesters:
+        state = is_running(harvester, snapshots.get(harvester.name))
+        if state:
+            running[harvester.name] = harvester.owner_id
+        elif state is None:
+            unknown[harvester.name] = harvester.owner_id
+    return running, unknown
+
+
+def has_capacity(harvester, running):
+    """Return True if the harvest of a harvester may start now."""
+    conf = settings.HARVEST_CONCURRENCY
+    if conf['MAX'] and len(running) >= conf['MAX']:
+        return False
+    if conf['MAX_PER_OWNER']:
+        owned = sum(1 for owner in running.values()
+                    if owner == harvester.owner_id)
+        if owned >= conf['MAX_PER_OWNER']:
+            return False
+    return True
+
+
+def admit(running, unknown):
+    """
+    Remove the queued harvests which may start now from the queue
+    (in queue order, skipping owners at their limit). Harvesters of
+    unknown state occupy a slot and stay queued until their state is known.
+
+    :param running: the running harvesters (see running_harvesters)
+    :param unknown: the harvesters of unknown state (see running_harvesters)
+    :return: the admitted harvesters
+    """
+    admitted = []
+    queued = QueuedHarvest.objects.select_related('harvester')
+    for entry in queued:
+        harvester = entry.harvester
+        if not harvester.enabled or harvester.name in running:
+            entry.delete()
+            continue
+        if harvester.name in unknown:
+            continue
+        occupied = dict(unknown, **running)
+        if has_capacity(harvester, occupied):
+            entry.delete()
+            running[harvester.name] = harvester.owner_id
+            cache.set(started_key(harvester), time.time(),
+                      settings.HARVEST_CONCURRENCY['START_GRACE'])
+            admitted.append(harvester)
+        elif settings.HARVEST_CONCURRENCY['MAX'] and len(
+                occupied) >= settings.HARVEST_CONCURRENCY['MAX']:
+            break
+    return admitted
+
+
+def queued_response(harvester, entry):
+    """Return the response of a queued harvest start."""
+    position = QueuedHarvest.objects.filter(
+        date_queued__lte=entry.date_queued).count()
+    return Response({harvester.name: {
+        HCCJC.STATUS: HCCJC.QUEUED,
+        HCCJC.HEALTH: 'harvest queued (position {})'.format(position),
+        HCCJC.GUI_STATUS: HCCJC.INFO,
+    }}, status=status.HTTP_202_ACCEPTED)
+
+
+def start_harvests(harvesters):
+    """
+    Start the harvests of several harvesters through the admission queue.
+    Without a cap, all harvests are started right away.
+
+    :param harvesters: an iterable of harvester model instances
+    :return: a list of (harvester, response) tuples in the given order,
+        queued starts get a 202 response
+    """
+    harvesters = list(harvesters)
+    if not is_capped():
+        return call_harvester_apis(harvesters, 'start_harvest')
+
+    with admission_lock():
+        QueuedHarvest.objects.bulk_create(
+            [QueuedHarvest(harvester=harvester) for harvester in harvesters],
+            ignore_conflicts=True)
+        admitted = admit(*running_harvesters())
+    responses = dict((harvester.name, response) for harvester, response
+                     in call_harvester_apis(admitted, 'start_harvest'))
+    queued = {entry.harvester_id: entry for entry in
+              QueuedHarvest.objects.filter(harvester__in=harvesters)}
+    feedback = []
+    for harvester in harvesters:
+        if harvester.name in responses:
+            feedback.append((harvester, responses[harvester.name]))
+        elif harvester.id in queued:
+            feedback.append((harvester, queued_response(
+                harvester, queued[harvester.id])))
+        else:
+            # admitted by another request or already running
+            feedback.append((harvester, Response(
+                {harvester.name: {HCCJC.HEALTH: 'harvest already running',
+                                  HCCJC.GUI_STATUS: HCCJC.INFO}},
+                status=status.HTTP_409_CONFLICT)))
+    return feedback
+
+
+def dequeue(harvesters):
+    """
+    Drop queued harvest starts and admitted starts, e.g. when the harvests
+    are stopped.
+    """
+    if is_capped():
+        harvesters = list(harvesters)
+        QueuedHarvest.objects.filter(harvester__in=harvesters).delete()
+        cache.delete_many([started_key(harvester) for harvester in harvesters])
+
+
+def release():
+    """
+    Start the queued harvests which may start now. Called by the poller
+    on every tick, after harvests are stopped and after harvesters pushed
+    their state.
+
+    :return: a list of (harvester, response) tuples
+    """
+    if not is_capped() or not QueuedHarvest.objects.exists():
+        return []
+    with admission_lock():
+        admitted = admit(*running_harvesters())
+    started = call_harvester_apis(admitted, 'start_harvest')
+    for harvester, response in started:
+        LOGGER.info("%s queued harvest started: %s", harvester.name,
+                    response.status_code)
+    return started
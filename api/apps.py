@@ -5,3 +5,8 @@ from django.apps import AppConfig
 class ApiConfig(AppConfig):
     """Django app config"""
     name = 'api'
+
+    def ready(self):
+        """Warm the caches of a fresh worker in the background."""
+        from api import warmup
+        warmup.start()
@@ -0,0 +1,130 @@
+"""
+This module holds the cached token authentication of the API. Machine
+clients call the API several times per second, so the user of a token is
+kept in a small in-process LRU instead of being looked up on every request.
+The shared cache (see settings.CACHES) only keeps the user id and active
+flag by a hash of the token, so other processes look the user up by its
+primary key. Entries are dropped when a token is deleted or its user is
+changed (see the receivers in api.models); the short lifetime of the
+in-process entries bounds how long other worker processes may still
+accept them.
+"""
+import collections
+import hashlib
+import threading
+import time
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from rest_framework.authentication import TokenAuthentication
+
+__author__ = "Jan Frömberg"
+__copyright__ = "Copyright 2018, GeRDI Project"
+__credits__ = ["Jan Frömberg"]
+__license__ = "Apache 2.0"
+__maintainer__ = "Jan Frömberg"
+__email__ = "jan.froemberg@tu-dresden.de"
+
+
+def cache_key(key):
+    """Return the cache key of a token, tokens are not stored in clear."""
+    return "hcc:token:{}".format(
+        hashlib.sha256(key.encode('utf-8')).hexdigest())
+
+
+class LocalTokenCache:
+    """
+    A thread-safe in-process LRU of (user, token) pairs by token key.
+    Entries expire after ttl seconds, the least recently used ones are
+    evicted beyond max_size entries.
+    """
+
+    def __init__(self, max_size, ttl):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """Return the (user, token) pair of a key or None."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires, credentials = entry
+            if expires <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return credentials
+
+    def set(self, key, credentials):
+        """Remember the (user, token) pair of a key."""
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, credentials)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def delete(self, key):
+        """Drop the entry of a key."""
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        """Drop all entries."""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+LOCAL_CACHE = LocalTokenCache(settings.TOKEN_CACHE['LOCAL_SIZE'],
+                              settings.TOKEN_CACHE['LOCAL_TTL'])
+
+
+def invalidate(*keys):
+    """Drop the cached users of tokens in this process and the shared cache."""
+    for key in keys:
+        LOCAL_CACHE.delete(key)
+    cache.delete_many([cache_key(key) for key in keys])
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """
+    A TokenAuthentication which looks the token up in the in-process LRU
+    first, then its user id in the shared cache and finally the token in
+    the database. Unknown tokens and inactive users are not cached and
+    fail as before.
+    """
+
+    def authenticate_credentials(self, key):
+        credentials = LOCAL_CACHE.get(key)
+        if credentials is not None:
+            return credentials
+        credentials = self.shared_credentials(key)
+        if credentials is None:
+            credentials = super().authenticate_credentials(key)
+            user = credentials[0]
+            cache.set(cache_key(key), (user.pk, user.is_active),
+                      settings.TOKEN_CACHE['TTL'])
+        LOCAL_CACHE.set(key, credentials)
+        return credentials
+
+    def shared_credentials(self, key):
+        """
+        Return the (user, token) pair of a token from the user id in the
+        shared cache or None.
+        """
+        cached = cache.get(cache_key(key))
+        if cached is None:
+            return None
+        user_id, is_active = cached
+        user = get_user_model().objects.filter(
+            pk=user_id, is_active=True).first() if is_active else None
+        if user is None:
+            cache.delete(cache_key(key))
+            return None
+        return user, self.get_model()(key=key, user=user)
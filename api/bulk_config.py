@@ -0,0 +1,105 @@
+"""
+This module holds the bulk config push. One set of 'section.key' changes
+(see create_config_fields) is pushed concurrently to many harvesters. Only
+harvesters with a supported library version get the changes, and only the
+parameters their configuration has. The outcome of every harvester is
+reported, including partially applied changes.
+"""
+import logging
+
+from requests.exceptions import RequestException
+
+from api import harvester_cache
+from api.config_diff import fetch_config
+from api.constants import HCCJSONConstants as HCCJC
+from api.harvester_api import map_harvester_apis
+
+__author__ = "Jan Frömberg"
+__copyright__ = "Copyright 2018, GeRDI Project"
+__credits__ = ["Jan Frömberg"]
+__license__ = "Apache 2.0"
+__maintainer__ = "Jan Frömberg"
+__email__ = "jan.froemberg@tu-dresden.de"
+
+# Get an instance of a logger
+LOGGER = logging.getLogger(__name__)
+
+# library versions with a configuration api
+CONFIG_VERSIONS = (6, 7)
+
+# outcomes of a harvester
+UNCHANGED = "unchanged"
+SOME_ISSUES = "some issues"
+FAILED = "failed"
+INCOMPATIBLE = "incompatible"
+
+
+def config_status(health):
+    """
+    Return the status and message of a set_harvester_config response
+    (the health of the harvester). Harvesters accept a part of the changes
+    and refuse the rest (e.g. while harvesting), which is reported as
+    SOME_ISSUES.
+    """
+    if not isinstance(health, dict):
+        return FAILED, str(health)
+    message = health.get("message", "")
+    result = health.get("status", FAILED)
+    if ("Cannot change value" in message) and ("Set parameter" in message):
+        result = SOME_ISSUES
+    return result, message
+
+
+def push_config(api, harvester, changes):
+    """
+    Push configuration changes to one harvester.
+
+    :param changes: a dictionary of new values by 'section.key'
+    :return: the report of the harvester, unreachable harvesters and
+        invalid answers are FAILED
+    """
+    try:
+        return _push_config(api, harvester, changes)
+    except (RequestException, ValueError) as _e:
+        LOGGER.warning("%s config push failed: %s", harvester.name, _e)
+        return {'status': FAILED, 'error': str(_e)}
+
+
+def _push_config(api, harvester, changes):
+    version = harvester_cache.get_version(harvester)
+    if version not in CONFIG_VERSIONS:
+        return {'status': INCOMPATIBLE,
+                'error': 'library version {} has no configuration api'.format(
+                    version)}
+
+    config, error = fetch_config(api, harvester)
+    if config is None:
+        return {'status': FAILED, 'error': error}
+    known = {key: value for key, value in changes.items() if key in config}
+    report = {'unknown': sorted(key for key in changes if key not in config)}
+    if not known:
+        report['status'] = UNCHANGED
+        return report
+
+    response = api.save_harvester_config_data(known)
+    feedback = harvester_cache.get_feedback(harvester, response.data)
+    health = feedback.get(HCCJC.HEALTH) if isinstance(
+        feedback, dict) else feedback
+    report['status'], report['message'] = config_status(health)
+    report['changed'] = sorted(known)
+    LOGGER.info("%s config pushed: %s (%s)", harvester.name, report['status'],
+                ", ".join(report['changed']))
+    return report
+
+
+def push_configs(harvesters, changes):
+    """
+    Push the same configuration changes to several harvesters concurrently.
+
+    :param harvesters: an iterable of harvester model instances
+    :param changes: a dictionary of new values by 'section.key'
+    :return: a dictionary of reports by harvester name
+    """
+    return {harvester.name: report for harvester, report in map_harvester_apis(
+        lambda api, harvester: push_config(api, harvester, changes),
+        harvesters)}
@@ -0,0 +1,90 @@
+"""
+This module holds the bulk schedule management. Desired crontabs of many
+harvesters are applied concurrently: the current crontabs of every
+harvester are fetched, only the difference is deleted and added, and the
+outcome of every harvester is reported.
+"""
+import logging
+
+from requests.exceptions import RequestException
+from rest_framework import status
+
+from api import harvester_cache
+from api.constants import HCCJSONConstants as HCCJC
+from api.harvester_api import map_harvester_apis
+
+__author__ = "Jan Frömberg"
+__copyright__ = "Copyright 2018, GeRDI Project"
+__credits__ = ["Jan Frömberg"]
+__license__ = "Apache 2.0"
+__maintainer__ = "Jan Frömberg"
+__email__ = "jan.froemberg@tu-dresden.de"
+
+# Get an instance of a logger
+LOGGER = logging.getLogger(__name__)
+
+# outcomes of a harvester
+UNCHANGED = "unchanged"
+UPDATED = "updated"
+FAILED = "failed"
+
+
+def schedule_diff(current, desired):
+    """
+    Return the minimal changes from the current to the desired crontabs.
+
+    :return: (crontabs to add, crontabs to delete) in the given order
+    """
+    add = []
+    for crontab in desired:
+        if crontab not in current and crontab not in add:
+            add.append(crontab)
+    delete = [crontab for crontab in current if crontab not in desired]
+    return add, delete
+
+
+def update_schedule(api, harvester, desired):
+    """
+    Bring the crontabs of one harvester to the desired ones. Unreachable
+    harvesters and invalid answers are reported as FAILED.
+    """
+    try:
+        return _update_schedule(api, harvester, desired)
+    except (RequestException, ValueError) as _e:
+        LOGGER.warning("%s schedules failed: %s", harvester.name, _e)
+        return {'status': FAILED, 'error': str(_e)}
+
+
+def _update_schedule(api, harvester, desired):
+    response = api.schedules()
+    feedback = harvester_cache.get_feedback(harvester, response.data)
+    if response.status_code != status.HTTP_200_OK or not isinstance(
+            feedback, dict) or HCCJC.CRONTAB not in feedback:
+        return {'status': FAILED,
+                'error': feedback.get(HCCJC.HEALTH) if isinstance(
+                    feedback, dict) else feedback}
+
+    add, delete = schedule_diff(feedback[HCCJC.CRONTAB], desired)
+    if not add and not delete:
+        return {'status': UNCHANGED, HCCJC.CRONTAB: list(desired)}
+
+    response = api.update_schedules(add, delete)
+    report = response.data[harvester.name]
+    report['status'] = UPDATED if response.status_code == status.HTTP_200_OK \
+        else FAILED
+    LOGGER.info("%s schedules %s: added %s, deleted %s", harvester.name,
+                report['status'], report['added'], report['deleted'])
+    return report
+
+
+def apply_schedules(schedules):
+    """
+    Apply desired crontabs to several harvesters concurrently.
+
+    :param schedules: a dictionary of crontab lists by harvester
+    :return: a dictionary of reports by harvester name
+    """
+    return {harvester.name: report for harvester, report in map_harvester_apis(
+        lambda api, harvester: update_schedule(api, harvester,
+                                               schedules[harvester]),
+        schedules)}
@@ -0,0 +1,127 @@
+"""
+This module compares the configurations of several harvesters. The configs
+are fetched concurrently, flattened to 'section.key' parameters (the field
+names of the ConfigForm, see create_config_fields) and cached for a short
+time (settings.HCC_CACHE_TTL['FLAT_CONFIG']). Only the parameters whose
+values differ between the harvesters are reported.
+"""
+import hashlib
+
+from django import forms
+from requests.exceptions import RequestException
+from rest_framework import status
+
+from api import harvester_cache
+from api.constants import HCCJSONConstants as HCCJC
+from api.forms import create_config_fields
+from api.harvester_api import map_harvester_apis
+
+__author__ = "Jan Frömberg"
+__copyright__ = "Copyright 2018, GeRDI Project"
+__credits__ = ["Jan Frömberg"]
+__license__ = "Apache 2.0"
+__maintainer__ = "Jan Frömberg"
+__email__ = "jan.froemberg@tu-dresden.de"
+
+# value of a parameter missing in a harvester config
+MISSING = None
+
+
+def mask(value):
+    """Return a password as short digest, equal passwords stay equal."""
+    if not value:
+        return value
+    return "secret:{}".format(
+        hashlib.sha256(str(value).encode('utf-8')).hexdigest()[:8])
+
+
+def flatten(config_data):
+    """
+    Flatten the configuration data of a harvester.
+
+    :param config_data: JSON configuration data (see create_config_fields)
+    :return: a dictionary of values by 'section.key', passwords are masked
+    """
+    fields, data = create_config_fields(config_data)
+    return {key: mask(value) if isinstance(
+        fields[key].widget, forms.PasswordInput) else value
+        for key, value in data.items()}
+
+
+def fetch_config(api, harvester):
+    """
+    Return the flattened config of a harvester and None or None and the
+    error message of the harvester, e.g. if it cannot be reached.
+    """
+    try:
+        response = api.get_harvester_config_data(cached=False)
+    except (RequestException, ValueError) as _e:
+        return None, str(_e)
+    feedback = harvester_cache.get_feedback(harvester, response.data)
+    config_data = feedback.get(HCCJC.HEALTH) if isinstance(
+        feedback, dict) else feedback
+    if response.status_code != status.HTTP_200_OK or not isinstance(
+            config_data, dict):
+        return None, str(config_data)
+    try:
+        config = flatten(config_data)
+    except (KeyError, TypeError, AttributeError):
+        return None, "unexpected configuration data"
+    harvester_cache.set_flat_config(harvester, config)
+    return config, None
+
+
+def fetch_configs(harvesters):
+    """
+    Return the flattened configs of several harvesters, missing ones are
+    fetched concurrently.
+
+    :return: (configs by harvester name, error messages by harvester name)
+    """
+    harvesters = list(harvesters)
+    configs = harvester_cache.get_flat_configs(harvesters)
+    errors = {}
+    missing = [harvester for harvester in harvesters
+               if harvester.name not in configs]
+    for harvester, (config, error) in map_harvester_apis(fetch_config,
+                                                         missing):
+        if config is None:
+            errors[harvester.name] = error
+        else:
+            configs[harvester.name] = config
+    return configs, errors
+
+
+def differences(configs):
+    """
+    Return the parameters whose values differ between the configs.
+
+    :param configs: flattened configs by harvester name
+    :return: a dictionary of {harvester name: value} by parameter, sorted
+        by parameter. Parameters a harvester does not have are MISSING.
+    """
+    keys = set()
+    for config in configs.values():
+        keys.update(config)
+    matrix = {}
+    for key in sorted(keys):
+        values = {name: config.get(key, MISSING)
+                  for name, config in configs.items()}
+        if len({repr(value) for value in values.values()}) > 1:
+            matrix[key] = values
+    return matrix
+
+
+def config_diff(harvesters):
+    """
+    Compare the configurations of several harvesters.
+
+    :return: a dictionary with the compared harvester names, the differing
+        parameters (see differences) and the harvesters which failed
+    """
+    configs, errors = fetch_configs(harvesters)
+    return {
+        'harvesters': sorted(configs),
+        'differences': differences(configs),
+        'errors': errors,
+    }
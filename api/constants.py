@@ -19,6 +19,7 @@ class HCCJSONConstants:
     """
     HEALTH = "health"
     GUI_STATUS = "gui_status"
+    STATUS_AGE = "status_age"
     STATUS = "status"
     STATE = "state"
     CACHED_DOCS = "cached_docs"
@@ -34,6 +35,9 @@ class HCCJSONConstants:
     # in millisecs
     REMAIN_HARVEST_TIME = "remainingHarvestTime"
     LAST_HARVEST_DATE = "lastHarvestDate"
+    LAST_ACTIVATED = "lastActivated"
+    # estimated harvest throughput in documents per second
+    HARVEST_RATE = "harvestRate"
     NEXT_HARVEST_DATE = "nextHarvestDate"
     CRONTAB = "cron"
     POSTCRONTAB = "cronTab"
@@ -51,7 +55,12 @@ class HCCJSONConstants:
     HARV = "harvesting"
     IDLE = "idle"
     IDLE_OLD = "ideling"
-    HARVESTER_STATES = [INIT, HARV, IDLE, IDLE_OLD]
+    QUEUED = "queued"
+    # placeholder until the status of a harvester is loaded
+    LOADING = "loading..."
+    HARVESTER_STATES = [INIT, HARV, IDLE, IDLE_OLD, QUEUED]
+    # states of a running harvest
+    ACTIVE_STATES = [INIT, HARV, QUEUED]
 
     WARNING = "warning"
     SUCCESS = "success"
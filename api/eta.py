@@ -0,0 +1,103 @@
+"""
+This module holds the ETA estimator of running harvests. Harvesters
+without a remainingHarvestTime only report their harvested count, so the
+count is sampled on every progress request and the throughput is smoothed
+by an exponentially weighted moving average (EWMA). The average throughput
+of the past runs of a harvester (see api.harvest_runs) is the prior until
+the first samples arrive. The start of a harvest is taken from its state
+history once per harvest. Samples are kept in the shared cache, so all
+workers estimate the same harvest, and dropped when the harvest is over.
+"""
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+
+from api import harvest_runs
+from api.constants import HCCJSONConstants as HCCJC
+
+__author__ = "Jan Frömberg"
+__copyright__ = "Copyright 2018, GeRDI Project"
+__credits__ = ["Jan Frömberg"]
+__license__ = "Apache 2.0"
+__maintainer__ = "Jan Frömberg"
+__email__ = "jan.froemberg@tu-dresden.de"
+
+# keys of an estimate
+QUEUED = "queued"
+STARTED = "started"
+COUNT = "count"
+TIME = "time"
+RATE = "rate"
+ETA = "eta"
+
+
+def cache_key(harvester):
+    """Return the cache key of the samples of a harvester."""
+    return "hcc:eta:{}".format(harvester.name)
+
+
+def estimate(harvester, state, count, max_documents=None, now=None,
+             current_run=None):
+    """
+    Add a sample of a running harvest and estimate its remaining time.
+
+    :param harvester: the harvester model instance
+    :param state: the harvester state, e.g. queued or harvesting
+    :param count: the harvested count
+    :param max_documents: the expected number of documents or None
+    :param now: the current timestamp
+    :param current_run: a callable returning the open HarvestRun of the
+        harvester or None, it is only called when a harvest is first seen
+        queued or harvesting to take its timestamps from the state history
+    :return: a dictionary with the timestamps the harvest was queued and
+        started (or None), the smoothed rate in documents per second and
+        the ETA in seconds (both None if unknown)
+    """
+    conf = settings.HARVEST_ETA
+    now = now if now is not None else time.time()
+
+    if state not in (HCCJC.QUEUED, HCCJC.HARV):
+        # the harvest is over, the next one starts with new samples
+        cache.delete(cache_key(harvester))
+        sample = {QUEUED: None, STARTED: None, COUNT: count, TIME: now,
+                  RATE: None}
+    else:
+        sample = cache.get(cache_key(harvester))
+        if sample is None or count < sample[COUNT]:
+            # a new harvest
+            sample = {QUEUED: None, STARTED: None, COUNT: count, TIME: now,
+                      RATE: harvest_runs.throughput(harvester)}
+            _since(sample, state, now, current_run)
+        elif state == HCCJC.HARV and sample[STARTED] is None:
+            sample.update({COUNT: count, TIME: now})
+            _since(sample, state, now, current_run)
+        elif state == HCCJC.HARV and now - sample[TIME] >= conf['MIN_INTERVAL']:
+            rate = (count - sample[COUNT]) / (now - sample[TIME])
+            if sample[RATE] is not None:
+                rate = conf['ALPHA'] * rate + (1 - conf['ALPHA']) * sample[RATE]
+            sample.update({COUNT: count, TIME: now, RATE: rate})
+        cache.set(cache_key(harvester), sample, conf['TTL'])
+
+    result = dict(sample, **{ETA: None})
+    if isinstance(max_documents, int) and max_documents > 0:
+        remaining = max(0, max_documents - count)
+        if remaining == 0:
+            result[ETA] = 0
+        elif sample[RATE]:
+            result[ETA] = remaining / sample[RATE]
+    return result
+
+
+def _since(sample, state, now, current_run):
+    """
+    Set the timestamp a harvest was queued or started: from its open run,
+    if known, else the first time it was seen in that state.
+    """
+    run = current_run() if current_run is not None else None
+    if state == HCCJC.QUEUED:
+        queued = run.queued if run is not None else None
+        sample[QUEUED] = queued / 1000 if queued is not None else now
+    else:
+        started = run.started if run is not None else None
+        sample[STARTED] = started / 1000 if started is not None else now
@@ -0,0 +1,128 @@
+"""
+This module records the harvest runs of the harvesters (see HarvestRun).
+The state history of a harvester (/etls) only grows, so it is diffed
+against the last recorded transition and only new transitions are stored.
+Throughput and duration trends are then queried from the database
+instead of downloading the history again.
+"""
+import logging
+
+from django.db import IntegrityError, transaction
+from django.db.models import Avg, ExpressionWrapper, F, FloatField
+
+from api.constants import HCCJSONConstants as HCCJC
+from api.models import Harvester, HarvestRun
+
+__author__ = "Jan Frömberg"
+__copyright__ = "Copyright 2018, GeRDI Project"
+__credits__ = ["Jan Frömberg"]
+__license__ = "Apache 2.0"
+__maintainer__ = "Jan Frömberg"
+__email__ = "jan.froemberg@tu-dresden.de"
+
+# Get an instance of a logger
+LOGGER = logging.getLogger(__name__)
+
+QUEUED = "QUEUED"
+HARVESTING = "HARVESTING"
+
+
+def last_transition(run):
+    """Return the timestamp of the last recorded transition of a run."""
+    return max(value for value in (run.queued, run.started, run.ended, 0)
+               if value is not None)
+
+
+def ingest(harvester, etls_data):
+    """
+    Record the new transitions of the state history of a harvester.
+
+    A run is opened by QUEUED or HARVESTING and ended by any other state.
+    The harvested count of the harvester belongs to its latest run.
+
+    :param harvester: the harvester model instance
+    :param etls_data: the JSON response of the /etls endpoint
+    :return: the new or changed runs
+    """
+    # the poller and views ingest the same history at the same time:
+    # the harvester row serializes them (where the database can lock rows)
+    # and the unique runs catch the rest
+    try:
+        with transaction.atomic():
+            list(Harvester.objects.select_for_update().filter(
+                pk=harvester.pk).order_by().values_list('pk'))
+            return _ingest(harvester, etls_data)
+    except IntegrityError:
+        LOGGER.debug("%s: harvest runs already recorded.", harvester.name)
+        return []
+
+
+def _ingest(harvester, etls_data):
+    info = etls_data.get("overallInfo", {}) if isinstance(
+        etls_data, dict) else {}
+    history = sorted(info.get("stateHistory") or [],
+                     key=lambda entry: entry["timestamp"])
+
+    run = HarvestRun.objects.filter(harvester=harvester).order_by('-id').first()
+    cursor = last_transition(run) if run is not None else 0
+    if run is not None and run.ended is not None:
+        run = None
+
+    changed = []
+    touched = False
+    for entry in history:
+        timestamp, state = entry["timestamp"], str(entry["value"]).upper()
+        if timestamp <= cursor:
+            continue
+        if state in (QUEUED, HARVESTING):
+            if run is None:
+                run = HarvestRun(harvester=harvester)
+            if state == QUEUED and run.queued is None and run.started is None:
+                run.queued = timestamp
+                touched = True
+            elif state == HARVESTING and run.started is None:
+                run.started = timestamp
+                touched = True
+        elif run is not None:
+            run.ended = timestamp
+            run.final_state = state.lower()
+            if run.started is not None:
+                run.duration = (run.ended - run.started) / 1000
+            changed.append(run)
+            run = None
+            touched = False
+    if run is not None and touched:
+        changed.append(run)
+
+    count = info.get(HCCJC.HARVESTED_COUNT)
+    latest = changed[-1] if changed else run
+    if isinstance(count, int) and latest is not None and latest.documents != count:
+        latest.documents = count
+        if latest not in changed:
+            changed.append(latest)
+    for changed_run in changed:
+        changed_run.save()
+    if changed:
+        LOGGER.debug("%s: %d harvest runs recorded.", harvester.name,
+                     len(changed))
+    return changed
+
+
+def current_run(harvester):
+    """Return the latest run of a harvester, if it has not ended, or None."""
+    run = HarvestRun.objects.filter(harvester=harvester).order_by('-id').first()
+    return run if run is not None and run.ended is None else None
+
+
+def throughput(harvester, runs=10):
+    """
+    Return the average throughput (documents per second) of the last
+    finished runs of a harvester or None if there is none.
+    """
+    finished = HarvestRun.objects.filter(
+        harvester=harvester, duration__gt=0, documents__isnull=False
+    ).order_by('-ended').values_list('id', flat=True)[:runs]
+    return HarvestRun.objects.filter(id__in=list(finished)).aggregate(
+        throughput=Avg(ExpressionWrapper(F('documents') / F('duration'),
+                                         output_field=FloatField()))
+    )['throughput']
@@ -0,0 +1,153 @@
+"""
+This module holds the central harvest scheduler. Instead of a crontab on
+every harvester (which mostly is the suggested '0 0 * * *', so all harvests
+start at midnight), the HCC owns the daily start times of the enabled
+harvesters without a crontab of their own. Each harvester gets a fixed
+place in a window, by a hash of its name, and a daily random jitter (see
+settings.HARVEST_SCHEDULE). The harvests are started via the harvester
+API, through the admission queue (see api.admission). It is run by the
+poller: python manage.py poll_harvesters
+"""
+import datetime
+import hashlib
+import logging
+import random
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+
+from api import harvester_cache
+from api.admission import start_harvests
+from api.constants import HCCJSONConstants as HCCJC
+from api.models import Harvester, ScheduledHarvest
+
+__author__ = "Jan Frömberg"
+__copyright__ = "Copyright 2018, GeRDI Project"
+__credits__ = ["Jan Frömberg"]
+__license__ = "Apache 2.0"
+__maintainer__ = "Jan Frömberg"
+__email__ = "jan.froemberg@tu-dresden.de"
+
+# Get an instance of a logger
+LOGGER = logging.getLogger(__name__)
+
+
+def window_start(day):
+    """Return the (aware) start of the harvest window of a day."""
+    hour, minute = (int(value) for value in
+                    settings.HARVEST_SCHEDULE['START'].split(':'))
+    return timezone.make_aware(
+        datetime.datetime.combine(day, datetime.time(hour, minute)))
+
+
+def start_times(names, day):
+    """
+    Return the start times of the harvests of a day by harvester name.
+    The place of a harvester in the window only depends on its name, so
+    adding or removing a harvester does not move the others. The jitter
+    only depends on the name and the day, so every poller computes the
+    same times.
+
+    :param names: names of the harvesters to schedule
+    :param day: a date
+    :return: a dictionary of aware datetimes by harvester name
+    """
+    conf = settings.HARVEST_SCHEDULE
+    start = window_start(day)
+    jitter = min(conf['JITTER'], conf['WINDOW'])
+    times = {}
+    for name in names:
+        place = int(hashlib.md5(name.encode('utf-8')).hexdigest(), 16) / 2 ** 128
+        offset = place * (conf['WINDOW'] - jitter) + random.Random(
+            '{}:{}'.format(name, day)).uniform(0, jitter)
+        times[name] = start + datetime.timedelta(seconds=offset)
+    return times
+
+
+def has_own_schedule(harvester, snapshot):
+    """
+    Return True if a harvester starts its harvests by its own crontab or
+    its schedules are unknown: it has no status snapshot yet or its
+    snapshot lacks the schedules (e.g. a pushed state or a failed poll).
+    """
+    feedback = harvester_cache.snapshot_feedback(harvester, snapshot)
+    if not isinstance(feedback, dict) or HCCJC.CRONTAB not in feedback:
+        return True
+    crontab = feedback[HCCJC.CRONTAB]
+    if isinstance(crontab, list):
+        return bool(crontab)
+    # v6 harvesters report one crontab, or no crontab or no cron support
+    return (isinstance(crontab, str) and bool(crontab.strip())
+            and crontab != HCCJC.NO_CRONTAB and 'not supported' not in crontab)
+
+
+class HarvestScheduler:
+    """
+    Custom HarvestScheduler class to start the harvests of the enabled
+    harvesters without a crontab once a day at their staggered start times.
+    Started harvests are recorded in the database (see ScheduledHarvest),
+    so a harvest is started only once, even if the poller is restarted or
+    runs twice.
+    """
+
+    @staticmethod
+    def claim(harvester, day):
+        """Record the harvest of a day, return False if it is recorded."""
+        try:
+            with transaction.atomic():
+                ScheduledHarvest.objects.create(harvester=harvester, day=day)
+        except IntegrityError:
+            return False
+        return True
+
+    def due(self, harvesters, now):
+        """
+        Return the harvesters whose start time has come. Start times which
+        passed more than the window length ago (e.g. while the poller was
+        down) are skipped, so they do not all start at once.
+        """
+        window = datetime.timedelta(seconds=settings.HARVEST_SCHEDULE['WINDOW'])
+        names = [harvester.name for harvester in harvesters]
+        today = timezone.localtime(now).date()
+        days = (today - datetime.timedelta(days=1), today)
+        due = {}
+        # a window may reach into the next day
+        for day in days:
+            for name, start in start_times(names, day).items():
+                if start <= now < start + window:
+                    due[name] = day
+        harvesters = [harvester for harvester in harvesters
+                      if harvester.name in due]
+        if not harvesters:
+            return []
+        started = set(ScheduledHarvest.objects.filter(
+            harvester__in=harvesters, day__in=days).values_list(
+                'harvester_id', 'day'))
+        snapshots = harvester_cache.get_snapshots(harvesters)
+        return [(harvester, due[harvester.name]) for harvester in harvesters
+                if (harvester.id, due[harvester.name]) not in started
+                and not has_own_schedule(harvester,
+                                         snapshots.get(harvester.name))]
+
+    def run_due(self, now=None):
+        """
+        Start the harvests of all due harvesters.
+
+        :return: a list of (harvester, response) tuples
+        """
+        now = now if now is not None else timezone.now()
+        due = self.due(list(Harvester.objects.filter(enabled=True)), now)
+        if not due:
+            return []
+        # claim the starts, another poller may be about to start them
+        harvesters = [harvester for harvester, day in due
+                      if self.claim(harvester, day)]
+        ScheduledHarvest.objects.filter(
+            day__lt=timezone.localtime(now).date() -
+            datetime.timedelta(days=2)).delete()
+        started = start_harvests(harvesters)
+        for harvester, response in started:
+            LOGGER.info("%s harvest started by the HCC scheduler: %s",
+                        harvester.name, response.status_code)
+        return started
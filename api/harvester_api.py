@@ -2,12 +2,15 @@
 This module initiaized a harvester and determines its version to decide the protocol language.
 """
 import json
+from concurrent.futures import ThreadPoolExecutor
 
-import requests
+from django.conf import settings
+from django.db import connections
 from requests.exceptions import RequestException
 from rest_framework import status
 from rest_framework.response import Response
 
+from api import harvester_cache, single_flight, structured_log
 from api.constants import HarvesterApiConstants as HAC
 from api.harvester_api_strategy import (BaseStrategy, HarvesterApiStrategy,
                                         VersionBased6Strategy,
@@ -34,9 +37,14 @@ class InitHarvester:
         self.harvester = harvester
 
         if harvester.enabled:
+            cached_version = harvester_cache.get_version(harvester)
+            if cached_version is not None:
+                self._harvester_version = cached_version
+                return
+
             try:
-                response = requests.get(harvester.url + HAC.G_VERSIONS,
-                                        timeout=5)
+                response = single_flight.get(harvester.url + HAC.G_VERSIONS,
+                                             timeout=5)
             except RequestException as _e:
                 response = Response(
                     "A Connection Error. Harvester initialization failed. " +
@@ -61,6 +69,7 @@ class InitHarvester:
                     self._harvester_version = 6
             else:
                 self._harvester_version = "not supported"
+            harvester_cache.set_version(harvester, self._harvester_version)
         else:
             self._harvester_version = "harvester disabled"
 
@@ -85,3 +94,51 @@ class InitHarvester:
             api = HarvesterApiStrategy(self.harvester, BaseStrategy())
 
         return api
+
+
+def map_harvester_apis(func, harvesters):
+    """
+    Call func(api, harvester) with the API of several harvesters
+    concurrently, e.g. to pass different arguments to each harvester.
+    The number of parallel calls is limited by settings.HARVESTER_API_WORKERS.
+
+    :param func: a function of a HarvesterApiStrategy and a harvester
+    :param harvesters: an iterable of harvester model instances
+    :return: a list of (harvester, result) tuples in the given order
+    """
+    harvesters = list(harvesters)
+    # the threads log with the request id of the caller
+    run = structured_log.copy_context()
+
+    def call(harvester):
+        with structured_log.log_context(harvester=harvester.name):
+            return func(InitHarvester(harvester).get_harvester_api(),
+                        harvester)
+
+    workers = min(settings.HARVESTER_API_WORKERS, len(harvesters))
+    if workers <= 1:
+        return [(harvester, call(harvester)) for harvester in harvesters]
+
+    def call_in_thread(harvester):
+        try:
+            return run(call, harvester)
+        finally:
+            # Django closes the connections of request threads only
+            connections.close_all()
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return list(zip(harvesters, executor.map(call_in_thread, harvesters)))
+
+
+def call_harvester_apis(harvesters, method, *args):
+    """
+    Call an API method (e.g. 'harvester_status' or 'start_harvest') of several
+    harvesters concurrently. The number of parallel requests is limited by
+    settings.HARVESTER_API_WORKERS.
+
+    :param harvesters: an iterable of harvester model instances
+    :param method: name of a HarvesterApiStrategy method
+    :return: a list of (harvester, response) tuples in the given order
+    """
+    return map_harvester_apis(
+        lambda api, _harvester: getattr(api, method)(*args), harvesters)
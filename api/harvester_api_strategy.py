@@ -5,14 +5,20 @@ import abc
 import datetime
 import json
 import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
 
 import requests
+from django.conf import settings
 from requests.exceptions import RequestException
 from rest_framework import status
 from rest_framework.response import Response
 
+from api import eta, harvest_runs, harvester_cache, single_flight
 from api.constants import HarvesterApiConstantsV6, HarvesterApiConstantsV7
 from api.constants import HCCJSONConstants as HCCJC
+from api.log_cache import get_log_cache
+from api.serializers import HarvesterStateSerializer
 
 __author__ = "Jan Frömberg, Laura Höhle"
 __copyright__ = "Copyright 2018, GeRDI Project"
@@ -24,6 +30,13 @@ __email__ = "jan.froemberg@tu-dresden.de"
 # Get an instance of a logger
 LOGGER = logging.getLogger(__name__)
 
+# background refreshes of stale status snapshots (by harvester name)
+REFRESH_EXECUTOR = ThreadPoolExecutor(
+    max_workers=settings.HARVESTER_API_WORKERS,
+    thread_name_prefix='hcc-refresh')
+REFRESH_LOCK = threading.Lock()
+REFRESHING = set()
+
 
 class Strategy(metaclass=abc.ABCMeta):
     """
@@ -38,7 +51,7 @@ class Strategy(metaclass=abc.ABCMeta):
         """abstract method for harvester status"""
 
     @abc.abstractmethod
-    def get_harvester_log(self, harvester):
+    def get_harvester_log(self, harvester, date=None):
         """abstract method for harvester log"""
 
     @abc.abstractmethod
@@ -61,6 +74,10 @@ class Strategy(metaclass=abc.ABCMeta):
     def post_delete_harvester_schedule(self, harvester, crontab):
         """abstract method for deleting a harvester schedule"""
 
+    @abc.abstractmethod
+    def get_harvester_schedule(self, harvester):
+        """abstract method for getting the schedules (crontabs) of a harvester"""
+
     @abc.abstractmethod
     def get_harvester_progress(self, harvester):
         """abstract method for harvester progress"""
@@ -97,32 +114,83 @@ class HarvesterApiStrategy:
         return self.harvester
 
     def harvester_status(self):
-        """return the status of a harvester"""
+        """
+        return the status of a harvester from the shared snapshot with its
+        age. A stale snapshot is served while it is refreshed in the
+        background, only a missing one is requested from the harvester.
+        """
+        snapshot = harvester_cache.get_snapshot(self.harvester)
+        if snapshot is None:
+            response = self.fetch_status()
+            snapshot = harvester_cache.set_snapshot(
+                self.harvester, response.data, response.status_code)
+        elif not harvester_cache.is_fresh(snapshot):
+            self.refresh_status(harvester_cache.lifetime(snapshot))
+
+        data = snapshot[harvester_cache.DATA]
+        feedback = harvester_cache.get_feedback(self.harvester, data)
+        if isinstance(feedback, dict):
+            data = dict(data)
+            data[self.harvester.name] = dict(
+                feedback, **{HCCJC.STATUS_AGE: harvester_cache.age(snapshot)})
+        return Response(data, status=snapshot[harvester_cache.STATUS])
+
+    def fetch_status(self):
+        """request the status of a harvester, bypassing the snapshot"""
         return self._strategy.get_harvester_status(self.harvester)
 
+    def refresh_status(self, timeout=None):
+        """
+        refresh the status snapshot of a harvester in the background,
+        keeping the lifetime (timeout) the poller chose for the stale one
+        """
+        name = self.harvester.name
+        with REFRESH_LOCK:
+            if name in REFRESHING:
+                return
+            REFRESHING.add(name)
+
+        def refresh():
+            try:
+                response = self.fetch_status()
+                harvester_cache.set_snapshot(self.harvester, response.data,
+                                             response.status_code,
+                                             timeout=timeout)
+            except Exception:
+                LOGGER.exception("Refreshing the status of %s failed.", name)
+            finally:
+                with REFRESH_LOCK:
+                    REFRESHING.discard(name)
+
+        REFRESH_EXECUTOR.submit(refresh)
+
     def start_harvest(self):
         """start a single harvester"""
         LOGGER.info("%s harvester started by user.", self.harvester.name)
+        harvester_cache.invalidate(self.harvester, harvester_cache.SNAPSHOT)
         return self._strategy.post_start_harvest(self.harvester)
 
     def stop_harvest(self):
         """stop a single harvester"""
         LOGGER.info("%s harvester stopped by user.", self.harvester.name)
+        harvester_cache.invalidate(self.harvester, harvester_cache.SNAPSHOT)
         return self._strategy.post_stop_harvest(self.harvester)
 
     def reset_harvest(self):
         """reset a single harvester"""
         LOGGER.info("%s harvester resetted by user.", self.harvester.name)
+        harvester_cache.invalidate(self.harvester, harvester_cache.SNAPSHOT)
         return self._strategy.post_reset_harvest(self.harvester)
 
-    def harvester_log(self):
-        """get the harvester logfile of today"""
-        return self._strategy.get_harvester_log(self.harvester)
+    def harvester_log(self, date=None):
+        """get the harvester logfile of a day (default: today)"""
+        return self._strategy.get_harvester_log(self.harvester, date)
 
     def add_schedule(self, crontab):
         """set a crontab for a harvester"""
         LOGGER.info("%s harvester schedule added by user.",
                     self.harvester.name)
+        harvester_cache.invalidate(self.harvester, harvester_cache.SNAPSHOT)
         return self._strategy.post_add_harvester_schedule(
             self.harvester, crontab)
 
@@ -130,19 +198,55 @@ class HarvesterApiStrategy:
         """del all schedules of a harvester"""
         LOGGER.info("%s harvester schedule deleted by user.",
                     self.harvester.name)
+        harvester_cache.invalidate(self.harvester, harvester_cache.SNAPSHOT)
         return self._strategy.post_delete_harvester_schedule(
             self.harvester, crontab)
 
+    def schedules(self):
+        """get the current crontabs of a harvester"""
+        return self._strategy.get_harvester_schedule(self.harvester)
+
+    def update_schedules(self, add, delete):
+        """
+        delete and add crontabs of a harvester,
+        the response holds the outcome of every change
+        """
+        changes = [('deleted', crontab, self.delete_schedule)
+                   for crontab in delete]
+        changes += [('added', crontab, self.add_schedule) for crontab in add]
+        feedback = {HCCJC.HEALTH: [], 'added': [], 'deleted': []}
+        status_code = status.HTTP_200_OK
+        for change, crontab, call in changes:
+            response = call(crontab)
+            feedback[HCCJC.HEALTH].append(
+                response.data[self.harvester.name].get(HCCJC.HEALTH))
+            if response.status_code < status.HTTP_300_MULTIPLE_CHOICES:
+                feedback[change].append(crontab)
+            else:
+                status_code = response.status_code
+        return Response({self.harvester.name: feedback}, status=status_code)
+
     def harvester_progress(self):
         """get harvesting progress"""
         return self._strategy.get_harvester_progress(self.harvester)
 
-    def get_harvester_config_data(self):
-        """get configuration data"""
-        return self._strategy.get_harvester_config(self.harvester)
+    def get_harvester_config_data(self, cached=True):
+        """
+        get configuration data (shared cached data if available and cached),
+        fetched data is shared in any case
+        """
+        config = harvester_cache.get_config(self.harvester) if cached else None
+        if config is not None:
+            return Response(config, status=status.HTTP_200_OK)
+        response = self._strategy.get_harvester_config(self.harvester)
+        if response.status_code == status.HTTP_200_OK:
+            harvester_cache.set_config(self.harvester, response.data)
+        return response
 
     def save_harvester_config_data(self, changes):
         """set configuration data"""
+        harvester_cache.invalidate(self.harvester, harvester_cache.CONFIG,
+                                   harvester_cache.FLAT_CONFIG)
         return self._strategy.set_harvester_config(self.harvester, changes)
 
     def status_history(self):
@@ -165,13 +269,13 @@ def a_response(harvester_name, url, method):
     try:
 
         if method == 'Get':
-            response = requests.get(url, timeout=5)
+            response = single_flight.get(url, timeout=5)
         elif method == 'Put':
-            response = requests.put(url, timeout=5)
+            response = single_flight.request('PUT', url, timeout=5)
         elif method == 'Post':
-            response = requests.post(url, timeout=9)
+            response = single_flight.request('POST', url, timeout=9)
         elif method == 'Delete':
-            response = requests.delete(url, timeout=5)
+            response = single_flight.request('DELETE', url, timeout=5)
 
         try:
             harvester_json = json.loads(response.text)
@@ -207,6 +311,24 @@ def a_response(harvester_name, url, method):
                     status.HTTP_408_REQUEST_TIMEOUT), harvester_json
 
 
+def current_run(harvester):
+    """
+    Record the state history (/etls) of a harvester and return its open
+    harvest run or None. Errors are logged only.
+    """
+    response, etls_data = a_response(
+        harvester.name, harvester.url + HarvesterApiConstantsV7.STATE_HISTORY,
+        'Get')
+    if response.status_code == status.HTTP_200_OK and isinstance(
+            etls_data, dict):
+        try:
+            harvest_runs.ingest(harvester, etls_data)
+        except Exception:
+            LOGGER.exception("Recording the harvest runs of %s failed.",
+                             harvester.name)
+    return harvest_runs.current_run(harvester)
+
+
 class BaseStrategy(Strategy):
     """
     Fallback strategy alorithm for basic harvester support.
@@ -219,7 +341,7 @@ class BaseStrategy(Strategy):
         if harvester.enabled:
             try:
                 feedback[harvester.name] = {}
-                response = requests.get(harvester.url, timeout=5)
+                response = single_flight.get(harvester.url, timeout=5)
 
                 if response.status_code == status.HTTP_401_UNAUTHORIZED:
                     feedback[harvester.name][
@@ -268,7 +390,7 @@ class BaseStrategy(Strategy):
         return Response({harvester.name: 'stop not supported'},
                         status=status.HTTP_501_NOT_IMPLEMENTED)
 
-    def get_harvester_log(self, harvester):
+    def get_harvester_log(self, harvester, date=None):
         return Response({harvester.name: {
             HCCJC.LOGS: 'log not supported'
         }},
@@ -293,6 +415,12 @@ class BaseStrategy(Strategy):
         }},
             status=status.HTTP_501_NOT_IMPLEMENTED)
 
+    def get_harvester_schedule(self, harvester):
+        return Response({harvester.name: {
+            HCCJC.HEALTH: 'cron not supported'
+        }},
+            status=status.HTTP_501_NOT_IMPLEMENTED)
+
     def get_harvester_config(self, harvester):
         return Response({harvester.name: {
             HCCJC.HEALTH: 'config not supported'
@@ -330,7 +458,7 @@ class VersionBased6Strategy(Strategy):
         if method == 'Get':
             try:
                 feedback[harvester_name] = {}
-                response = requests.get(url, timeout=5)
+                response = single_flight.get(url, timeout=5)
                 feedback[harvester_name] = response.text
             except RequestException as _e:
                 feedback[harvester_name][HCCJC.HEALTH] = str(_e)
@@ -343,7 +471,7 @@ class VersionBased6Strategy(Strategy):
         if method == 'Put':
             try:
                 feedback[harvester_name] = {}
-                response = requests.put(url, timeout=5)
+                response = single_flight.request('PUT', url, timeout=5)
                 feedback[harvester_name] = response.text
             except RequestException as _e:
                 feedback[harvester_name][HCCJC.HEALTH] = str(_e)
@@ -356,7 +484,7 @@ class VersionBased6Strategy(Strategy):
         if method == 'Post':
             try:
                 feedback[harvester_name] = {}
-                response = requests.post(url, timeout=9)
+                response = single_flight.request('POST', url, timeout=9)
                 feedback[harvester_name] = response.text
             except RequestException as _e:
                 feedback[harvester_name][HCCJC.HEALTH] = str(_e)
@@ -376,7 +504,7 @@ class VersionBased6Strategy(Strategy):
             try:
                 feedback[harvester.name] = {}
                 stat_url = harvester.url + HarvesterApiConstantsV6.G_STATUS
-                response = requests.get(stat_url, timeout=5)
+                response = single_flight.get(stat_url, timeout=5)
 
                 if response.status_code == status.HTTP_401_UNAUTHORIZED:
                     feedback[harvester.name][
@@ -394,22 +522,22 @@ class VersionBased6Strategy(Strategy):
                     return Response(feedback, status=status.HTTP_404_NOT_FOUND)
 
                 feedback[harvester.name][HCCJC.STATUS] = response.text
-                response = requests.get(
+                response = single_flight.get(
                     harvester.url + HarvesterApiConstantsV6.G_HARVESTED_DOCS,
                     timeout=5)
                 feedback[harvester.name][HCCJC.CACHED_DOCS] = response.text
 
-                response = requests.get(
+                response = single_flight.get(
                     harvester.url + HarvesterApiConstantsV6.G_DATA_PROVIDER,
                     timeout=5)
                 feedback[harvester.name][HCCJC.DATA_PROVIDER] = response.text
 
                 maxdoc_url = harvester.url + HarvesterApiConstantsV6.G_MAX_DOCS
-                response = requests.get(maxdoc_url, timeout=5)
+                response = single_flight.get(maxdoc_url, timeout=5)
                 feedback[harvester.name][HCCJC.MAX_DOCUMENTS] = response.text
 
                 health_url = harvester.url + HarvesterApiConstantsV6.G_HEALTH
-                response = requests.get(health_url, timeout=5)
+                response = single_flight.get(health_url, timeout=5)
                 feedback[harvester.name][HCCJC.HEALTH] = response.text
 
                 if feedback[harvester.name][
@@ -428,7 +556,7 @@ class VersionBased6Strategy(Strategy):
                     feedback[harvester.name][HCCJC.GUI_STATUS] = HCCJC.INFO
 
                 progress_url = harvester.url + HarvesterApiConstantsV6.G_PROGRESS
-                response = requests.get(progress_url, timeout=5)
+                response = single_flight.get(progress_url, timeout=5)
                 feedback[harvester.name][HCCJC.PROGRESS] = response.text
                 if response.status_code != status.HTTP_500_INTERNAL_SERVER_ERROR:
                     feedback[harvester.name][
@@ -445,7 +573,7 @@ class VersionBased6Strategy(Strategy):
                              int(response.text.split("/")[1])) * 100)
 
                 cron_url = harvester.url + HarvesterApiConstantsV6.GD_HARVEST_CRON
-                response = requests.get(cron_url, timeout=5)
+                response = single_flight.get(cron_url, timeout=5)
                 crontab = "Schedules:"
                 cron = response.text.find(crontab)
                 cronstring = response.text[cron + 11:cron + 11 + 9]
@@ -492,7 +620,7 @@ class VersionBased6Strategy(Strategy):
         }},
             status=status.HTTP_423_LOCKED)
 
-    def get_harvester_log(self, harvester):
+    def get_harvester_log(self, harvester, date=None):
         return Response({harvester.name: {
             HCCJC.LOGS: 'not implemented'
         }},
@@ -507,10 +635,11 @@ class VersionBased6Strategy(Strategy):
     def post_add_harvester_schedule(self, harvester, crontab):
         feedback = {}
         feedback[harvester.name] = {}
-        del_response = requests.delete(harvester.url +
-                                       HarvesterApiConstantsV6.GD_HARVEST_CRON,
-                                       timeout=5)
-        response = requests.post(
+        del_response = single_flight.request(
+            'DELETE', harvester.url + HarvesterApiConstantsV6.GD_HARVEST_CRON,
+            timeout=5)
+        response = single_flight.request(
+            'POST',
             harvester.url + HarvesterApiConstantsV6.PD_HARVEST_CRON + crontab,
             timeout=5)
         feedback[harvester.name][
@@ -521,21 +650,39 @@ class VersionBased6Strategy(Strategy):
         feedback = {}
         feedback[harvester.name] = {}
         if crontab:
-            response = requests.delete(
+            response = single_flight.request(
+                'DELETE',
                 harvester.url + HarvesterApiConstantsV6.PD_HARVEST_CRON +
                 crontab,
                 timeout=5)
             feedback[harvester.name][HCCJC.HEALTH] = response.text
         else:
-            response = requests.delete(harvester.url +
-                                       HarvesterApiConstantsV6.GD_HARVEST_CRON,
-                                       timeout=5)
+            response = single_flight.request(
+                'DELETE',
+                harvester.url + HarvesterApiConstantsV6.GD_HARVEST_CRON,
+                timeout=5)
             feedback[harvester.name][HCCJC.HEALTH] = response.text
         return Response(feedback, status=response.status_code)
 
+    def get_harvester_schedule(self, harvester):
+        feedback = {}
+        feedback[harvester.name] = {}
+        cron_url = harvester.url + HarvesterApiConstantsV6.GD_HARVEST_CRON
+        try:
+            response = single_flight.get(cron_url, timeout=5)
+        except RequestException as _e:
+            feedback[harvester.name][HCCJC.HEALTH] = str(_e)
+            return Response(feedback, status=status.HTTP_408_REQUEST_TIMEOUT)
+        # v6 harvesters have one schedule at most
+        cron = response.text.find("Schedules:")
+        cronstring = response.text[cron + 11:cron + 11 + 9]
+        feedback[harvester.name][HCCJC.CRONTAB] = [] if (
+            cron < 0 or cronstring[:1] in ('', '-')) else [cronstring]
+        return Response(feedback, status=response.status_code)
+
     def get_harvester_config(self, harvester):
         get_url = harvester.url + HarvesterApiConstantsV7.G_HARVEST_CONFIG
-        response = requests.get(get_url)
+        response = single_flight.get(get_url)
         feedback = {}
         feedback[harvester.name] = {}
         if response.status_code == status.HTTP_200_OK:
@@ -547,7 +694,7 @@ class VersionBased6Strategy(Strategy):
 
     def set_harvester_config(self, harvester, changes):
         set_url = harvester.url + HarvesterApiConstantsV7.P_HARVEST_CONFIG
-        response = requests.post(set_url, json=changes)
+        response = single_flight.request('POST', set_url, json=changes)
         feedback = {}
         feedback[harvester.name] = {}
         if response.status_code == status.HTTP_200_OK:
@@ -564,7 +711,7 @@ class VersionBased6Strategy(Strategy):
     def get_api_info(self, harvester):
         feedback = {}
         try:
-            response = requests.get(
+            response = single_flight.get(
                 harvester.url +
                 HarvesterApiConstantsV6.PRETTY_FLAG,
                 timeout=5)
@@ -588,10 +735,67 @@ class VersionBased7Strategy(Strategy):
     library v7.x.x and v8.x.x using the strategy interface.
     """
 
+    @staticmethod
+    def state_feedback(harvester_json):
+        """
+        Return the HCC status of a harvester state document,
+        i.e. the response of GET / (without the schedules).
+        """
+        feedback = {}
+        max_documents = False
+        feedback[HCCJC.HEALTH] = harvester_json[HCCJC.HEALTH]
+        # to be legacy (prior lib v7) compatible in html template
+        # set the old STATUS key to STATE
+        feedback[HCCJC.STATUS] = harvester_json[HCCJC.STATE].lower()
+        feedback[HCCJC.CACHED_DOCS] = harvester_json[HCCJC.HARVESTED_COUNT]
+        feedback[HCCJC.PROGRESS] = harvester_json[HCCJC.HARVESTED_COUNT]
+        feedback[HCCJC.DATA_PROVIDER] = harvester_json[HCCJC.REPO_NAME]
+
+        # harvester overall status
+        if harvester_json[HCCJC.HEALTH] == HCCJC.OK and harvester_json[HCCJC.STATE].lower(
+        ) == HCCJC.IDLE:
+            feedback[HCCJC.GUI_STATUS] = HCCJC.SUCCESS
+        elif harvester_json[HCCJC.HEALTH] != HCCJC.OK:
+            feedback[HCCJC.GUI_STATUS] = HCCJC.WARNING
+        elif harvester_json[HCCJC.STATE].lower() in [HCCJC.HARV]:
+            feedback[HCCJC.GUI_STATUS] = HCCJC.PRIMARY
+        else:
+            feedback[HCCJC.GUI_STATUS] = HCCJC.INFO
+
+        # progress
+        if HCCJC.MAX_DOCUMENT_COUNT in harvester_json:
+            max_documents = True
+            feedback[HCCJC.MAX_DOCUMENTS] = \
+                harvester_json[HCCJC.MAX_DOCUMENT_COUNT]
+            feedback[HCCJC.PROGRESS_MAX] = \
+                harvester_json[HCCJC.MAX_DOCUMENT_COUNT]
+        else:
+            feedback[HCCJC.MAX_DOCUMENTS] = HCCJC.N_A
+
+        if max_documents:
+            if int(harvester_json[HCCJC.MAX_DOCUMENT_COUNT]) > 0:
+                feedback[HCCJC.PROGRESS_CURRENT] = \
+                    int((int(harvester_json[HCCJC.HARVESTED_COUNT]) * 100)
+                        / int(harvester_json[HCCJC.MAX_DOCUMENT_COUNT]))
+        else:
+            feedback[HCCJC.PROGRESS_CURRENT] = \
+                int(harvester_json[HCCJC.HARVESTED_COUNT])
+
+        # dates
+        if HCCJC.LAST_HARVEST_DATE in harvester_json:
+            feedback[HCCJC.LAST_HARVEST_DATE] = \
+                harvester_json[HCCJC.LAST_HARVEST_DATE]
+        if HCCJC.NEXT_HARVEST_DATE in harvester_json:
+            feedback[HCCJC.NEXT_HARVEST_DATE] = \
+                harvester_json[HCCJC.NEXT_HARVEST_DATE]
+        if HCCJC.REMAIN_HARVEST_TIME in harvester_json:
+            feedback[HCCJC.REMAIN_HARVEST_TIME] = \
+                harvester_json[HCCJC.REMAIN_HARVEST_TIME]
+        return feedback
+
     def get_harvester_status(self, harvester):
         feedback, harvester_json = {}, {}
         feedback[harvester.name] = {}
-        max_documents = False
         response = None
 
         if harvester.enabled:
@@ -623,55 +827,8 @@ class VersionBased7Strategy(Strategy):
 
                     # this line may produce a servererror 500 -> keyerror:
                     # health
-                    feedback[harvester.name][HCCJC.HEALTH] = harvester_json[HCCJC.HEALTH]
-                    # to be legacy (prior lib v7) compatible in html template
-                    # set the old STATUS key to STATE
-                    feedback[harvester.name][HCCJC.STATUS] = harvester_json[HCCJC.STATE].lower(
-                    )
-                    feedback[harvester.name][HCCJC.CACHED_DOCS] = harvester_json[HCCJC.HARVESTED_COUNT]
-                    feedback[harvester.name][HCCJC.PROGRESS] = harvester_json[HCCJC.HARVESTED_COUNT]
-                    feedback[harvester.name][HCCJC.DATA_PROVIDER] = harvester_json[HCCJC.REPO_NAME]
-
-                    # harvester overall status
-                    if harvester_json[HCCJC.HEALTH] == HCCJC.OK and harvester_json[HCCJC.STATE].lower(
-                    ) == HCCJC.IDLE:
-                        feedback[harvester.name][HCCJC.GUI_STATUS] = HCCJC.SUCCESS
-                    elif harvester_json[HCCJC.HEALTH] != HCCJC.OK:
-                        feedback[harvester.name][HCCJC.GUI_STATUS] = HCCJC.WARNING
-                    elif harvester_json[HCCJC.STATE].lower() in [HCCJC.HARV]:
-                        feedback[harvester.name][HCCJC.GUI_STATUS] = HCCJC.PRIMARY
-                    else:
-                        feedback[harvester.name][HCCJC.GUI_STATUS] = HCCJC.INFO
-
-                    # progress
-                    if HCCJC.MAX_DOCUMENT_COUNT in harvester_json:
-                        max_documents = True
-                        feedback[harvester.name][HCCJC.MAX_DOCUMENTS] = \
-                            harvester_json[HCCJC.MAX_DOCUMENT_COUNT]
-                        feedback[harvester.name][HCCJC.PROGRESS_MAX] = \
-                            harvester_json[HCCJC.MAX_DOCUMENT_COUNT]
-                    else:
-                        feedback[harvester.name][HCCJC.MAX_DOCUMENTS] = HCCJC.N_A
-
-                    if max_documents:
-                        if int(harvester_json[HCCJC.MAX_DOCUMENT_COUNT]) > 0:
-                            feedback[harvester.name][HCCJC.PROGRESS_CURRENT] = \
-                                int((int(harvester_json[HCCJC.HARVESTED_COUNT]) * 100)
-                                    / int(harvester_json[HCCJC.MAX_DOCUMENT_COUNT]))
-                    else:
-                        feedback[harvester.name][HCCJC.PROGRESS_CURRENT] = \
-                            int(harvester_json[HCCJC.HARVESTED_COUNT])
-
-                    # dates
-                    if HCCJC.LAST_HARVEST_DATE in harvester_json:
-                        feedback[harvester.name][HCCJC.LAST_HARVEST_DATE] = \
-                            harvester_json[HCCJC.LAST_HARVEST_DATE]
-                    if HCCJC.NEXT_HARVEST_DATE in harvester_json:
-                        feedback[harvester.name][HCCJC.NEXT_HARVEST_DATE] = \
-                            harvester_json[HCCJC.NEXT_HARVEST_DATE]
-                    if HCCJC.REMAIN_HARVEST_TIME in harvester_json:
-                        feedback[harvester.name][HCCJC.REMAIN_HARVEST_TIME] = \
-                            harvester_json[HCCJC.REMAIN_HARVEST_TIME]
+                    feedback[harvester.name].update(
+                        self.state_feedback(harvester_json))
 
                     # schedules
                     cron_url = harvester.url + HarvesterApiConstantsV7.G_HARVEST_CRON
@@ -716,16 +873,29 @@ class VersionBased7Strategy(Strategy):
             harvester.url + HarvesterApiConstantsV7.P_HARVEST_ABORT, 'Post')
         return response
 
-    def get_harvester_log(self, harvester):
-        now = datetime.datetime.now()
+    def get_harvester_log(self, harvester, date=None):
+        today = datetime.date.today()
+        if date is None:
+            date = today
         feedback = {}
         feedback[harvester.name] = {}
-        log_url = harvester.url + HarvesterApiConstantsV7.G_HARVEST_LOG + now.strftime(
+
+        # logs of finished days never change, so serve them from disk
+        log_cache = get_log_cache()
+        log_txt = log_cache.get(harvester.name, date)
+        if log_txt is not None:
+            feedback[harvester.name][HCCJC.LOGS] = log_txt
+            return Response(feedback, status=status.HTTP_200_OK)
+
+        log_url = harvester.url + HarvesterApiConstantsV7.G_HARVEST_LOG + date.strftime(
             HarvesterApiConstantsV7.HARVESTER_LOG_FORMAT)
         response, hjson = a_response(harvester.name, log_url, 'Get')
 
+        if response.status_code == status.HTTP_200_OK:
+            log_cache.set(harvester.name, date, str(hjson))
+
         log_txt = str(hjson) if str(
-            hjson) != "" else HCCJC.NO_LOGTEXT + ' for today: ' + str(now)
+            hjson) != "" else HCCJC.NO_LOGTEXT + ' for ' + str(date)
         feedback[harvester.name][HCCJC.LOGS] = log_txt
         return Response(feedback, status=response.status_code)
 
@@ -758,21 +928,25 @@ class VersionBased7Strategy(Strategy):
                     HCCJC.REMAIN_HARVEST_TIME] = harvester_json[
                         HCCJC.REMAIN_HARVEST_TIME]
             else:
-                # Get time of the beginning of the harvest, if remaining
-                # time is unknown.
-                # Call etls instead of harvester_json["lastHarvestDate"],
-                # because it is updated faster.
-                get_url = harvester.url + HarvesterApiConstantsV7.STATE_HISTORY
-                etls = requests.get(get_url, timeout=5)
-                if etls.status_code == status.HTTP_200_OK:
-                    etls_data = json.loads(etls.text)
-                    last = etls_data["overallInfo"]["stateHistory"][-1]
-                    if last["value"] == "HARVESTING":
-                        feedback[harvester.name][
-                            HCCJC.LAST_HARVEST_DATE] = last["timestamp"]
-                    elif last["value"] == "QUEUED":
-                        feedback[harvester.name][
-                            "lastActivated"] = last["timestamp"]
+                # estimate the remaining time from the throughput,
+                # if the harvester does not know it
+                estimate = eta.estimate(
+                    harvester, feedback[harvester.name][HCCJC.STATE],
+                    int(harvester_json[HCCJC.HARVESTED_COUNT]),
+                    int(harvester_json[HCCJC.MAX_DOCUMENT_COUNT])
+                    if max_documents else None,
+                    current_run=lambda: current_run(harvester))
+                feedback[harvester.name][HCCJC.HARVEST_RATE] = estimate[
+                    eta.RATE]
+                if estimate[eta.ETA] is not None:
+                    feedback[harvester.name][HCCJC.REMAIN_HARVEST_TIME] = int(
+                        estimate[eta.ETA] * 1000)
+                elif estimate[eta.STARTED] is not None:
+                    feedback[harvester.name][HCCJC.LAST_HARVEST_DATE] = int(
+                        estimate[eta.STARTED] * 1000)
+                elif estimate[eta.QUEUED] is not None:
+                    feedback[harvester.name][HCCJC.LAST_ACTIVATED] = int(
+                        estimate[eta.QUEUED] * 1000)
 
             if max_documents:
                 if int(harvester_json[HCCJC.MAX_DOCUMENT_COUNT]) > 0:
@@ -791,9 +965,9 @@ class VersionBased7Strategy(Strategy):
         feedback = {}
         feedback[harvester.name] = {}
         post_url = harvester.url + HarvesterApiConstantsV7.P_HARVEST_CRON
-        response = requests.post(post_url,
-                                 json={HCCJC.POSTCRONTAB: crontab},
-                                 timeout=5)
+        response = single_flight.request('POST', post_url,
+                                         json={HCCJC.POSTCRONTAB: crontab},
+                                         timeout=5)
         harvester_response = json.loads(response.text)
         LOGGER.info("created schedule for %s with crontab %s", harvester.name,
                     crontab)
@@ -805,15 +979,15 @@ class VersionBased7Strategy(Strategy):
         feedback[harvester.name] = {}
         if not crontab:
             delall_cron_url = harvester.url + HarvesterApiConstantsV7.DALL_HARVEST_CRON
-            response = requests.post(delall_cron_url, timeout=5)
+            response = single_flight.request('POST', delall_cron_url, timeout=5)
             harvester_response = json.loads(response.text)
             LOGGER.info("deleted all schedules for %s", harvester.name)
             feedback[harvester.name][HCCJC.HEALTH] = harvester_response
         else:
             delcron_url = harvester.url + HarvesterApiConstantsV7.D_HARVEST_CRON
-            response = requests.post(delcron_url,
-                                     json={HCCJC.POSTCRONTAB: crontab},
-                                     timeout=5)
+            response = single_flight.request('POST', delcron_url,
+                                             json={HCCJC.POSTCRONTAB: crontab},
+                                             timeout=5)
             harvester_response = json.loads(response.text)
             LOGGER.info(
                 "deleted cron %s for harvester %s",
@@ -822,9 +996,20 @@ class VersionBased7Strategy(Strategy):
             feedback[harvester.name][HCCJC.HEALTH] = harvester_response
         return Response(feedback, status=response.status_code)
 
+    def get_harvester_schedule(self, harvester):
+        cron_url = harvester.url + HarvesterApiConstantsV7.G_HARVEST_CRON
+        response, harvester_json = a_response(harvester.name, cron_url, 'Get')
+        if response.status_code != status.HTTP_200_OK or not isinstance(
+                harvester_json, dict):
+            return response
+        tasks = list(harvester_json.values())
+        return Response({harvester.name: {
+            HCCJC.CRONTAB: list(tasks[0] or []) if tasks else []
+        }}, status=response.status_code)
+
     def get_harvester_config(self, harvester):
         get_url = harvester.url + HarvesterApiConstantsV7.G_HARVEST_CONFIG
-        response = requests.get(get_url, timeout=5)
+        response = single_flight.get(get_url, timeout=5)
         feedback = {}
         feedback[harvester.name] = {}
         if response.status_code == status.HTTP_200_OK:
@@ -836,7 +1021,7 @@ class VersionBased7Strategy(Strategy):
 
     def set_harvester_config(self, harvester, changes):
         set_url = harvester.url + HarvesterApiConstantsV7.P_HARVEST_CONFIG
-        response = requests.post(set_url, json=changes, timeout=5)
+        response = single_flight.request('POST', set_url, json=changes, timeout=5)
         feedback = {}
         feedback[harvester.name] = {}
         feedback[harvester.name][HCCJC.HEALTH] = json.loads(response.text)
@@ -845,7 +1030,7 @@ class VersionBased7Strategy(Strategy):
     def get_status_history(self, harvester):
         get_url = harvester.url + HarvesterApiConstantsV7.STATE_HISTORY
         try:
-            response = requests.get(get_url, timeout=5)
+            response = single_flight.get(get_url, timeout=5)
         except requests.exceptions.ReadTimeout:
             feedback = "server is not responding for harvester {}".format(
                 harvester.name)
@@ -854,6 +1039,12 @@ class VersionBased7Strategy(Strategy):
         feedback = {}
         feedback[harvester.name] = {}
         if response.status_code == status.HTTP_200_OK:
+            # keep the runs, the history is only formatted below
+            try:
+                harvest_runs.ingest(harvester, response_data)
+            except Exception:
+                LOGGER.exception("Recording the harvest runs of %s failed.",
+                                 harvester.name)
             history_data = ""
             for info in response_data["overallInfo"]["stateHistory"]:
                 ms = info["timestamp"]
@@ -875,7 +1066,7 @@ class VersionBased7Strategy(Strategy):
         try:
             get_url = harvester.url + HarvesterApiConstantsV7.PG_HARVEST + \
                 HarvesterApiConstantsV7.PRETTY_FLAG
-            response = requests.get(get_url, timeout=5)
+            response = single_flight.get(get_url, timeout=5)
         except requests.exceptions.ConnectionError:
             feedback[harvester.name] = "unable do get api info of harvester {}".format(
                 harvester.name)
@@ -888,3 +1079,30 @@ class VersionBased7Strategy(Strategy):
             feedback[harvester.name] = "unable do get api info of harvester {}".format(
                 harvester.name)
         return Response(feedback, status=response.status_code)
+
+
+def push_harvester_state(harvester, harvester_json):
+    """
+    Store a state document pushed by a harvester (the shape of the
+    v7 GET / response) as its status snapshot, so the status is served
+    without polling the harvester. Schedules are not part of the state
+    document and are taken over from the previous snapshot.
+    Raises a ValueError if the document lacks a required key or a value
+    has the wrong type (see HarvesterStateSerializer).
+    """
+    serializer = HarvesterStateSerializer(data=harvester_json)
+    if not serializer.is_valid():
+        raise ValueError('; '.join(
+            '{}: {}'.format(key, ' '.join(str(error) for error in errors))
+            for key, errors in serializer.errors.items()))
+
+    feedback = VersionBased7Strategy.state_feedback(
+        dict(harvester_json, **serializer.validated_data))
+    snapshot = harvester_cache.get_snapshot(harvester)
+    if snapshot is not None:
+        previous = harvester_cache.snapshot_feedback(harvester, snapshot)
+        if isinstance(previous, dict) and HCCJC.CRONTAB in previous:
+            feedback[HCCJC.CRONTAB] = previous[HCCJC.CRONTAB]
+    return harvester_cache.set_snapshot(
+        harvester, {harvester.name: feedback}, status.HTTP_200_OK,
+        pushed=True)
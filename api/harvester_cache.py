@@ -0,0 +1,216 @@
+"""
+This module holds the shared harvester cache. It is backed by the Django
+cache framework (see settings.CACHES), so all worker processes see the same
+status snapshots, detected library versions and configuration data.
+"""
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+
+from api.constants import HCCJSONConstants as HCCJC
+
+__author__ = "Jan Frömberg"
+__copyright__ = "Copyright 2018, GeRDI Project"
+__credits__ = ["Jan Frömberg"]
+__license__ = "Apache 2.0"
+__maintainer__ = "Jan Frömberg"
+__email__ = "jan.froemberg@tu-dresden.de"
+
+SNAPSHOT = "snapshot"
+VERSION = "version"
+CONFIG = "config"
+FLAT_CONFIG = "flatconfig"
+SUMMARY = "hcc:summary"
+HEARTBEAT = "hcc:poller:heartbeat"
+
+# keys of the poller heartbeat
+LAST_POLL = "last_poll"
+
+# keys of a cached snapshot
+DATA = "data"
+STATUS = "status"
+TIMESTAMP = "timestamp"
+EXPIRES = "expires"
+PUSHED = "pushed"
+
+
+def cache_key(kind, harvester):
+    """
+    Return the cache key of a harvester entry. Versions belong to the
+    harvester url, everything else to the harvester name.
+    """
+    if kind == VERSION:
+        ident = hashlib.md5(harvester.url.encode('utf-8')).hexdigest()
+    else:
+        ident = harvester.name
+    return "hcc:{}:{}".format(kind, ident)
+
+
+def get_feedback(harvester, data):
+    """
+    Return the feedback of a harvester in response data of the shape
+    {name: feedback} (e.g. the data of a snapshot) or None.
+    """
+    return data.get(harvester.name) if isinstance(data, dict) else None
+
+
+def snapshot_feedback(harvester, snapshot):
+    """Return the feedback of a harvester in its snapshot or None."""
+    return get_feedback(harvester, snapshot[DATA] if snapshot else None)
+
+
+def is_active(feedback):
+    """Return True if the feedback of a harvester shows an active state."""
+    if not isinstance(feedback, dict):
+        return False
+    return str(feedback.get(HCCJC.STATUS, '')).lower() in HCCJC.ACTIVE_STATES
+
+
+def get_snapshots(harvesters):
+    """
+    Return the last status snapshots of several harvesters with a single
+    cache lookup as a dictionary by harvester name. Harvesters without
+    a snapshot are left out.
+    """
+    keys = {cache_key(SNAPSHOT, harvester): harvester.name
+            for harvester in harvesters}
+    return {keys[key]: snapshot
+            for key, snapshot in cache.get_many(list(keys)).items()}
+
+
+def get_snapshot(harvester):
+    """
+    Return the last status snapshot of a harvester as a dictionary with
+    the keys data, status, timestamp and expires or None if there is none.
+    The snapshot may be stale (see is_fresh).
+    """
+    return cache.get(cache_key(SNAPSHOT, harvester))
+
+
+def set_snapshot(harvester, data, status, timestamp=None, pushed=False,
+                 timeout=None):
+    """
+    Store a status snapshot (response data and status code) of a harvester.
+    Harvesters push their state on changes only, so pushed snapshots stay
+    fresh longer than polled ones. The harvester is polled again if it stays
+    silent for that long. A timeout (in seconds) overrides both lifetimes.
+    Expired snapshots are kept for another MAX_STALE seconds to be served
+    while they are revalidated.
+    """
+    if timestamp is None:
+        timestamp = time.time()
+    if timeout is None:
+        timeout = settings.HCC_CACHE_TTL['PUSHED' if pushed else 'SNAPSHOT']
+    snapshot = {
+        DATA: data,
+        STATUS: status,
+        TIMESTAMP: timestamp,
+        EXPIRES: timestamp + timeout,
+        PUSHED: pushed,
+    }
+    cache.set(cache_key(SNAPSHOT, harvester), snapshot,
+              timeout + settings.HCC_CACHE_TTL['MAX_STALE'])
+    return snapshot
+
+
+def is_fresh(snapshot, now=None):
+    """Return True if a snapshot has not expired yet."""
+    now = now if now is not None else time.time()
+    return now < snapshot.get(EXPIRES, 0)
+
+
+def lifetime(snapshot):
+    """Return the seconds a snapshot was fresh for when it was stored."""
+    return snapshot[EXPIRES] - snapshot[TIMESTAMP]
+
+
+def age(snapshot, now=None):
+    """Return the age of a snapshot in seconds."""
+    now = now if now is not None else time.time()
+    return max(0, int(now - snapshot[TIMESTAMP]))
+
+
+def get_version(harvester):
+    """Return the cached library version of a harvester or None."""
+    return cache.get(cache_key(VERSION, harvester))
+
+
+def set_version(harvester, version):
+    """
+    Store the detected library version of a harvester.
+    Failed detections are only cached for a short time.
+    """
+    if version in (6, 7):
+        timeout = settings.HCC_CACHE_TTL['VERSION']
+    else:
+        timeout = settings.HCC_CACHE_TTL['VERSION_UNKNOWN']
+    cache.set(cache_key(VERSION, harvester), version, timeout)
+
+
+def get_config(harvester):
+    """Return the cached configuration response data of a harvester or None."""
+    return cache.get(cache_key(CONFIG, harvester))
+
+
+def set_config(harvester, data):
+    """Store the configuration response data of a harvester."""
+    cache.set(cache_key(CONFIG, harvester), data,
+              settings.HCC_CACHE_TTL['CONFIG'])
+
+
+def get_flat_configs(harvesters):
+    """
+    Return the flattened configs (see api.config_diff) of several
+    harvesters with a single cache lookup as a dictionary by harvester name.
+    """
+    keys = {cache_key(FLAT_CONFIG, harvester): harvester.name
+            for harvester in harvesters}
+    return {keys[key]: config
+            for key, config in cache.get_many(list(keys)).items()}
+
+
+def set_flat_config(harvester, config):
+    """Store the flattened config of a harvester."""
+    cache.set(cache_key(FLAT_CONFIG, harvester), config,
+              settings.HCC_CACHE_TTL['FLAT_CONFIG'])
+
+
+def invalidate(harvester, *kinds):
+    """Delete cached entries of a harvester (default: all of them)."""
+    kinds = kinds or (SNAPSHOT, VERSION, CONFIG, FLAT_CONFIG)
+    cache.delete_many([cache_key(kind, harvester) for kind in kinds])
+
+
+def get_summary():
+    """Return the cached fleet summary (see api.summary) or None."""
+    return cache.get(SUMMARY)
+
+
+def set_summary(summary):
+    """Store the fleet summary."""
+    cache.set(SUMMARY, summary, settings.HCC_CACHE_TTL['SUMMARY'])
+
+
+def invalidate_summary():
+    """Drop the fleet summary, e.g. when harvesters are added or removed."""
+    cache.delete(SUMMARY)
+
+
+def get_heartbeat():
+    """Return the last heartbeat of the poller or None."""
+    return cache.get(HEARTBEAT)
+
+
+def set_heartbeat(timestamp, last_poll=None):
+    """
+    Store the heartbeat of the poller: the timestamp of its last tick and
+    of its last complete poll of all due harvesters (kept from the last
+    heartbeat if the tick failed).
+    """
+    heartbeat = get_heartbeat() or {}
+    cache.set(HEARTBEAT, {
+        TIMESTAMP: timestamp,
+        LAST_POLL: last_poll or heartbeat.get(LAST_POLL),
+    }, None)
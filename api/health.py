@@ -0,0 +1,76 @@
+"""
+This module holds the health checks of the control center for load
+balancers and orchestrators. They never call a harvester: liveness checks
+nothing but the process, readiness checks the database connection, the
+shared cache, the heartbeat of the poller and the age of its last complete
+poll. The state of the harvesters themselves is not checked.
+"""
+import time
+
+from django.conf import settings
+from django.db import DatabaseError, connection
+
+from api import harvester_cache
+
+__author__ = "Jan Frömberg"
+__copyright__ = "Copyright 2018, GeRDI Project"
+__credits__ = ["Jan Frömberg"]
+__license__ = "Apache 2.0"
+__maintainer__ = "Jan Frömberg"
+__email__ = "jan.froemberg@tu-dresden.de"
+
+OK = "ok"
+FAIL = "fail"
+
+
+def check_database():
+    """Return the state of the database connection."""
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT 1")
+    except DatabaseError as err:
+        return {"status": FAIL, "error": str(err)}
+    return {"status": OK}
+
+
+def check_age(timestamp, max_age, now):
+    """Return the state of something last done at timestamp."""
+    if timestamp is None:
+        return {"status": FAIL, "age": None}
+    age = max(0, int(now - timestamp))
+    return {"status": OK if age <= max_age else FAIL, "age": age}
+
+
+def check_poller(now):
+    """
+    Return the states of the poller heartbeat and of its last complete poll
+    or of the shared cache, if it cannot be read.
+    """
+    conf = settings.HEALTH
+    try:
+        heartbeat = harvester_cache.get_heartbeat() or {}
+    except Exception as err:  # the errors depend on the cache backend
+        return {"cache": {"status": FAIL, "error": str(err)}}
+    checks = {"poller": check_age(heartbeat.get(harvester_cache.TIMESTAMP),
+                                  conf['HEARTBEAT_MAX_AGE'], now)}
+    last_poll = heartbeat.get(harvester_cache.LAST_POLL)
+    # the poller has not completed a poll yet
+    if last_poll is not None:
+        checks["snapshots"] = check_age(last_poll, conf['SNAPSHOT_MAX_AGE'],
+                                        now)
+    return checks
+
+
+def readiness(now=None):
+    """
+    Run the readiness checks. Poller and snapshot checks are skipped if the
+    poller is disabled (settings.HEALTH['POLLER']).
+
+    :return: (ready, report) with a report of every check
+    """
+    now = now if now is not None else time.time()
+    checks = {"database": check_database()}
+    if settings.HEALTH['POLLER']:
+        checks.update(check_poller(now))
+    ready = all(check["status"] == OK for check in checks.values())
+    return ready, {"status": OK if ready else FAIL, "checks": checks}
@@ -0,0 +1,155 @@
+"""
+This module holds the on-disk cache for harvester logs.
+Logs of finished days never change, so they are fetched once from the
+harvester and served locally afterwards. Today's log is kept for a short
+TTL only.
+"""
+import datetime
+import gzip
+import logging
+import os
+import tempfile
+import threading
+import time
+
+from django.conf import settings
+
+__author__ = "Jan Frömberg"
+__copyright__ = "Copyright 2018, GeRDI Project"
+__credits__ = ["Jan Frömberg"]
+__license__ = "Apache 2.0"
+__maintainer__ = "Jan Frömberg"
+__email__ = "jan.froemberg@tu-dresden.de"
+
+# Get an instance of a logger
+LOGGER = logging.getLogger(__name__)
+
+LOG_FILE_SUFFIX = ".log.gz"
+
+# the directory is scanned for eviction every EVICT_EVERY writes,
+# in between only if the estimated size exceeds the maximum
+EVICT_EVERY = 100
+# estimated cache size and writes since the last scan by directory
+_ESTIMATES = {}
+_ESTIMATES_LOCK = threading.Lock()
+
+
+def end_of_day(date):
+    """Return the (local) timestamp of the midnight after a date."""
+    return time.mktime((date + datetime.timedelta(days=1)).timetuple())
+
+
+class HarvesterLogCache:
+    """
+    A compressed, date-addressable on-disk cache for harvester logs.
+    Entries live in <directory>/<harvester name>/<YYYY-MM-DD>.log.gz.
+    Entries of past days written after that day ended are immutable,
+    today's entry expires after today_ttl seconds and a past day's entry
+    written before midnight (a partial log) is fetched again.
+    If the cache grows beyond max_size bytes the least recently used
+    entries are evicted.
+    """
+
+    def __init__(self, directory, max_size, today_ttl):
+        self.directory = directory
+        self.max_size = max_size
+        self.today_ttl = today_ttl
+
+    def _path(self, harvester_name, date):
+        return os.path.join(self.directory, harvester_name,
+                            date.isoformat() + LOG_FILE_SUFFIX)
+
+    def get(self, harvester_name, date):
+        """
+        Return the cached log text of a harvester for the given date
+        or None if there is no (valid) entry.
+        """
+        path = self._path(harvester_name, date)
+        try:
+            mtime = os.path.getmtime(path)
+            if date >= datetime.date.today():
+                if time.time() - mtime > self.today_ttl:
+                    return None
+            elif mtime < end_of_day(date):
+                # cached while the day was still running
+                return None
+            with gzip.open(path, 'rt', encoding='utf-8') as file:
+                content = file.read()
+            # remember the access for the LRU eviction,
+            # but keep the mtime of today's entry for its TTL
+            os.utime(path, (time.time(), mtime))
+            return content
+        except (OSError, EOFError) as _e:
+            if not isinstance(_e, FileNotFoundError):
+                LOGGER.warning("unreadable log cache entry %s: %s", path, _e)
+            return None
+
+    def set(self, harvester_name, date, content):
+        """Store the log text of a harvester for the given date."""
+        path = self._path(harvester_name, date)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # write to a temporary file first to never serve half written logs
+            _fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path))
+            with os.fdopen(_fd, 'wb') as raw, \
+                    gzip.GzipFile(fileobj=raw, mode='wb') as file:
+                file.write(content.encode('utf-8'))
+            size = os.path.getsize(tmp_path)
+            os.replace(tmp_path, path)
+        except OSError as _e:
+            LOGGER.warning("unable to write log cache entry %s: %s", path, _e)
+            return
+        self._written(size)
+
+    def _written(self, size):
+        """Count a write and evict entries if the cache may be too large."""
+        with _ESTIMATES_LOCK:
+            total, writes = _ESTIMATES.get(self.directory, (None, 0))
+            if total is not None:
+                total += size
+                writes += 1
+                _ESTIMATES[self.directory] = (total, writes)
+        if total is None or total > self.max_size or writes >= EVICT_EVERY:
+            self.evict()
+
+    def size(self):
+        """Return the overall size of the cache in bytes."""
+        return sum(entry[2] for entry in self._entries())
+
+    def _entries(self):
+        entries = []
+        for root, _dirs, files in os.walk(self.directory):
+            for filename in files:
+                if not filename.endswith(LOG_FILE_SUFFIX):
+                    continue
+                path = os.path.join(root, filename)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((stat.st_atime, path, stat.st_size))
+        return entries
+
+    def evict(self):
+        """Delete least recently used entries until max_size is respected."""
+        entries = self._entries()
+        total = sum(entry[2] for entry in entries)
+        if total > self.max_size:
+            for _atime, path, size in sorted(entries):
+                try:
+                    os.remove(path)
+                except OSError:
+                    continue
+                total -= size
+                LOGGER.debug("evicted log cache entry %s", path)
+                if total <= self.max_size:
+                    break
+        with _ESTIMATES_LOCK:
+            _ESTIMATES[self.directory] = (total, 0)
+
+
+def get_log_cache():
+    """Return a log cache configured by settings.HARVESTER_LOG_CACHE."""
+    config = settings.HARVESTER_LOG_CACHE
+    return HarvesterLogCache(config['DIR'], config['MAX_SIZE'],
+                             config['TODAY_TTL'])
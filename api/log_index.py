@@ -0,0 +1,188 @@
+"""
+This module holds the local log index. The JSON lines of the structured log
+file and its rotated backups (see settings.LOGGING['handlers']['filejson'])
+are indexed in a sqlite full text index (settings.LOG_INDEX['PATH']).
+Files are tracked by inode and offset, so rotated files are not indexed
+twice and every search only indexes the lines written since the last one.
+"""
+import datetime
+import glob
+import json
+import logging
+import os
+import sqlite3
+
+from django.conf import settings
+
+__author__ = "Jan Frömberg"
+__copyright__ = "Copyright 2018, GeRDI Project"
+__credits__ = ["Jan Frömberg"]
+__license__ = "Apache 2.0"
+__maintainer__ = "Jan Frömberg"
+__email__ = "jan.froemberg@tu-dresden.de"
+
+# Get an instance of a logger
+LOGGER = logging.getLogger(__name__)
+
+# the indexed fields of a log line, message is searched as full text
+COLUMNS = ('time', 'level', 'logger', 'message', 'request_id', 'user',
+           'harvester', 'url', 'method', 'status', 'latency')
+# fields which can be searched for an exact value
+FILTERS = ('level', 'logger', 'request_id', 'user', 'harvester', 'status')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS log_files (
+    inode INTEGER PRIMARY KEY,
+    offset INTEGER NOT NULL
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS log_lines USING fts5(
+    message, time UNINDEXED, level UNINDEXED, logger UNINDEXED,
+    request_id UNINDEXED, user UNINDEXED, harvester UNINDEXED, url,
+    method UNINDEXED, status UNINDEXED, latency UNINDEXED
+);
+"""
+
+
+def connect():
+    """Return a connection to the log index, create it if there is none."""
+    path = settings.LOG_INDEX['PATH']
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    connection = sqlite3.connect(path, timeout=10, isolation_level=None)
+    connection.row_factory = sqlite3.Row
+    connection.executescript(SCHEMA)
+    return connection
+
+
+def log_files():
+    """Return the structured log file and its backups, the oldest first."""
+    filename = settings.LOGGING['handlers']['filejson']['filename']
+    backups = [name for name in glob.glob(glob.escape(filename) + '.*')
+               if name.rsplit('.', 1)[1].isdigit()]
+    backups.sort(key=lambda name: int(name.rsplit('.', 1)[1]), reverse=True)
+    return backups + ([filename] if os.path.exists(filename) else [])
+
+
+def parse_line(line):
+    """Return the column values of a log line or None if it is no record."""
+    try:
+        entry = json.loads(line)
+    except ValueError:
+        return None
+    if not isinstance(entry, dict) or 'message' not in entry:
+        return None
+    return tuple(entry.get(column) for column in COLUMNS)
+
+
+def index_file(connection, filename, offsets):
+    """
+    Index the complete lines of a file written since the last update.
+
+    :return: the number of indexed lines
+    """
+    try:
+        with open(filename, 'rb') as file:
+            inode = os.fstat(file.fileno()).st_ino
+            offset = offsets.get(inode, 0)
+            if offset > os.fstat(file.fileno()).st_size:
+                # a new file with a reused inode
+                offset = 0
+            file.seek(offset)
+            rows = []
+            for line in file:
+                if not line.endswith(b'\n'):
+                    # the line is still being written
+                    break
+                offset += len(line)
+                row = parse_line(line.decode('utf-8', 'replace'))
+                if row is not None:
+                    rows.append(row)
+    except FileNotFoundError:
+        # rotated away in the meantime, it is indexed under its new name
+        return 0
+    connection.executemany(
+        "INSERT INTO log_lines ({}) VALUES ({})".format(
+            ', '.join(COLUMNS), ', '.join('?' * len(COLUMNS))), rows)
+    connection.execute(
+        "INSERT OR REPLACE INTO log_files (inode, offset) VALUES (?, ?)",
+        (inode, offset))
+    offsets[inode] = offset
+    return len(rows)
+
+
+def update(connection, now=None):
+    """
+    Index the new lines of all log files and drop the lines older than
+    settings.LOG_INDEX['MAX_AGE'] days. Workers updating at the same time
+    are serialized by the database lock.
+
+    :return: the number of indexed lines
+    """
+    now = now or datetime.datetime.now(datetime.timezone.utc)
+    oldest = now - datetime.timedelta(days=settings.LOG_INDEX['MAX_AGE'])
+    indexed = 0
+    connection.execute("BEGIN IMMEDIATE")
+    try:
+        offsets = dict(connection.execute(
+            "SELECT inode, offset FROM log_files").fetchall())
+        for filename in log_files():
+            indexed += index_file(connection, filename, offsets)
+        connection.execute("DELETE FROM log_lines WHERE time < ?",
+                           (oldest.isoformat(),))
+        connection.execute("COMMIT")
+    except BaseException:
+        connection.execute("ROLLBACK")
+        raise
+    if indexed:
+        LOGGER.debug("%d log lines indexed.", indexed)
+    return indexed
+
+
+def search(query=None, since=None, limit=None, **filters):
+    """
+    Search the structured logs, the newest records first.
+
+    :param query: a full text query of the message and url, e.g. 'timeout'
+    :param since: only records logged at or after this ISO 8601 time
+    :param limit: the maximum number of records
+        (at most settings.LOG_INDEX['MAX_RESULTS'])
+    :param filters: exact values of the FILTERS fields
+    :return: a list of records
+    :raises ValueError: if the full text query or a filter is invalid
+    """
+    max_results = settings.LOG_INDEX['MAX_RESULTS']
+    limit = min(int(limit), max_results) if limit else max_results
+    conditions, params = [], []
+    if query:
+        conditions.append("log_lines MATCH ?")
+        params.append(query)
+    if since:
+        conditions.append("time >= ?")
+        params.append(since)
+    for field in FILTERS:
+        value = filters.get(field)
+        if value is None:
+            continue
+        if field == 'status':
+            value = int(value)
+        elif field == 'level':
+            value = value.upper()
+        conditions.append("{} = ?".format(field))
+        params.append(value)
+    sql = "SELECT {} FROM log_lines{} ORDER BY time DESC, rowid DESC LIMIT ?".format(
+        ', '.join(COLUMNS),
+        " WHERE " + " AND ".join(conditions) if conditions else "")
+
+    connection = connect()
+    try:
+        update(connection)
+        try:
+            rows = connection.execute(sql, params + [limit]).fetchall()
+        except sqlite3.OperationalError as err:
+            # e.g. a syntax error of the full text query
+            if not query or 'locked' in str(err):
+                raise
+            raise ValueError("Invalid query: {}".format(err))
+    finally:
+        connection.close()
+    return [{column: row[column] for column in COLUMNS
+             if row[column] is not None} for row in rows]
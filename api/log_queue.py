@@ -0,0 +1,171 @@
+"""
+This module moves the log I/O out of the request threads. The handlers
+of settings.LOGGING (files and console) are replaced by queue handlers, and
+one listener thread per process writes the queued records. The queue is
+bounded (settings.LOG_QUEUE['MAX_SIZE']): if the disk cannot keep up,
+records are dropped and counted instead of blocking a request.
+"""
+import atexit
+import copy
+import logging
+import logging.config
+import os
+import queue
+from logging.handlers import QueueHandler, QueueListener
+
+__author__ = "Jan Frömberg"
+__copyright__ = "Copyright 2018, GeRDI Project"
+__credits__ = ["Jan Frömberg"]
+__license__ = "Apache 2.0"
+__maintainer__ = "Jan Frömberg"
+__email__ = "jan.froemberg@tu-dresden.de"
+
+# the listener of this process
+LISTENER = None
+# formats the tracebacks of queued records
+_FORMATTER = logging.Formatter()
+
+
+class DroppingQueueHandler(QueueHandler):
+    """
+    A QueueHandler which never blocks: records which do not fit into the
+    queue are dropped and counted. The number of dropped records is logged
+    as soon as the queue has room again.
+    """
+
+    def __init__(self, log_queue, route):
+        super().__init__(log_queue)
+        self.route = route
+        self.dropped = 0
+        self.unreported = 0
+
+    def prepare(self, record):
+        # like QueueHandler.prepare, but the traceback is kept apart from
+        # the message in exc_text, e.g. for the JSON logs
+        record = copy.copy(record)
+        record.message = record.getMessage()
+        if record.exc_info and not record.exc_text:
+            record.exc_text = _FORMATTER.formatException(record.exc_info)
+        record.msg = record.message
+        record.args = None
+        record.exc_info = None
+        record.queue_route = self.route
+        return record
+
+    def enqueue(self, record):
+        # called with the handler lock held (see logging.Handler.handle)
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+            self.unreported += 1
+            return
+        if self.unreported:
+            warning = logging.makeLogRecord({
+                'name': __name__, 'levelno': logging.WARNING,
+                'levelname': 'WARNING', 'queue_route': self.route,
+                'msg': '{} log records dropped, the log queue was full.'.format(
+                    self.unreported)})
+            try:
+                self.queue.put_nowait(warning)
+                self.unreported = 0
+            except queue.Full:
+                pass
+
+
+class RoutingQueueListener(QueueListener):
+    """
+    A QueueListener passing every record to the handlers its logger had
+    before (the route of its queue handler).
+    """
+
+    def __init__(self, log_queue, routes, queue_handlers):
+        super().__init__(log_queue, respect_handler_level=True)
+        self.routes = routes
+        self.queue_handlers = queue_handlers
+
+    def handle(self, record):
+        for handler in self.routes.get(record.queue_route, ()):
+            if record.levelno >= handler.level:
+                handler.handle(record)
+
+
+def install(max_size):
+    """
+    Replace the handlers of all configured loggers by queue handlers and
+    start the listener thread.
+
+    :param max_size: the maximum number of queued records
+    :return: the listener
+    """
+    global LISTENER
+    log_queue = queue.Queue(max_size)
+    routes = {}
+    queue_handlers = []
+    loggers = [logging.getLogger()] + [
+        logger for logger in logging.Logger.manager.loggerDict.values()
+        if isinstance(logger, logging.Logger)]
+    for logger in loggers:
+        if not logger.handlers or any(isinstance(
+                handler, DroppingQueueHandler) for handler in logger.handlers):
+            continue
+        routes[logger.name] = list(logger.handlers)
+        queue_handlers.append(DroppingQueueHandler(log_queue, logger.name))
+        logger.handlers = [queue_handlers[-1]]
+
+    LISTENER = RoutingQueueListener(log_queue, routes, queue_handlers)
+    LISTENER.start()
+    return LISTENER
+
+
+@atexit.register
+def stop():
+    """Write the queued records and stop the listener thread."""
+    if LISTENER is not None and LISTENER._thread is not None:
+        LISTENER.stop()
+
+
+def restart_after_fork():
+    """
+    Start a listener thread in a forked process, threads are not forked.
+    The queue is replaced, because its lock may have been held by the
+    listener thread of the parent.
+    """
+    if LISTENER is None:
+        return
+    log_queue = queue.Queue(LISTENER.queue.maxsize)
+    for handler in LISTENER.queue_handlers:
+        handler.queue = log_queue
+    LISTENER.queue = log_queue
+    LISTENER._thread = None
+    LISTENER.start()
+
+
+def dropped():
+    """Return the number of dropped log records of this process."""
+    if LISTENER is None:
+        return 0
+    return sum(handler.dropped for handler in LISTENER.queue_handlers)
+
+
+def configure(logging_settings):
+    """
+    Configure logging from settings.LOGGING with the context of the
+    structured logs (see api.structured_log) and move the log I/O to the
+    listener thread if settings.LOG_QUEUE['ENABLED'] is set
+    (see settings.LOGGING_CONFIG).
+    """
+    from django.conf import settings
+    from api import structured_log
+
+    structured_log.install()
+    logging.config.dictConfig(logging_settings)
+    conf = settings.LOG_QUEUE
+    if conf['ENABLED']:
+        # the handlers of a former configuration are closed
+        stop()
+        install(conf['MAX_SIZE'])
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=restart_after_fork)
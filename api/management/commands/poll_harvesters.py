@@ -0,0 +1,34 @@
+"""
+Management command to run the adaptive harvester status poller
+and the central harvest scheduler.
+"""
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from api.harvest_scheduler import HarvestScheduler
+from api.scheduler import Scheduler
+
+__author__ = "Jan Frömberg"
+__copyright__ = "Copyright 2018, GeRDI Project"
+__credits__ = ["Jan Frömberg"]
+__license__ = "Apache 2.0"
+__maintainer__ = "Jan Frömberg"
+__email__ = "jan.froemberg@tu-dresden.de"
+
+
+class Command(BaseCommand):
+    """Poll the status of all enabled harvesters adaptively."""
+    help = 'Poll the status of all enabled harvesters adaptively.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--ticks', type=int, default=None,
+            help='Stop after this number of ticks (default: run forever).')
+
+    def handle(self, *args, **options):
+        harvest_scheduler = None
+        if settings.HARVEST_SCHEDULE['ENABLED']:
+            self.stdout.write('Scheduling the harvests...')
+            harvest_scheduler = HarvestScheduler()
+        self.stdout.write('Polling the harvesters...')
+        Scheduler(harvest_scheduler).run(options['ticks'])
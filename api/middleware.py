@@ -0,0 +1,25 @@
+"""
+Middleware Module
+"""
+from django.middleware.gzip import GZipMiddleware
+
+__author__ = "Jan Frömberg"
+__copyright__ = "Copyright 2018, GeRDI Project"
+__credits__ = ["Jan Frömberg"]
+__license__ = "Apache 2.0"
+__maintainer__ = "Jan Frömberg"
+__email__ = "jan.froemberg@tu-dresden.de"
+
+
+class JSONGZipMiddleware(GZipMiddleware):
+    """
+    Compress JSON responses if the client accepts gzip.
+    HTML pages are left alone, because they carry CSRF tokens
+    (see the BREACH attack) and are small compared to fleet-wide
+    status payloads. Useful if no nginx compresses in front of Django.
+    """
+
+    def process_response(self, request, response):
+        if not response.get('Content-Type', '').startswith('application/json'):
+            return response
+        return super().process_response(request, response)
@@ -0,0 +1,32 @@
+# Generated by Django 3.0.2 on 2026-10-19 11:14
+
+from urllib.parse import urlparse
+
+from django.db import migrations, models
+
+
+def set_url_host(apps, schema_editor):
+    Harvester = apps.get_model('api', 'Harvester')
+    for harvester in Harvester.objects.all():
+        harvester.url_host = urlparse(harvester.url).hostname or ''
+        harvester.save(update_fields=['url_host'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0013_auto_20190827_1447'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='harvester',
+            name='url_host',
+            field=models.CharField(blank=True, db_index=True, editable=False, max_length=255),
+        ),
+        migrations.RunPython(set_url_host, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='harvester',
+            index=models.Index(fields=['enabled', 'name'], name='harvester_enabled_name_idx'),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 3.0.2 on 2026-10-19 11:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0014_auto_20261019_1314'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='harvester',
+            index=models.Index(fields=['owner', 'name'], name='harvester_owner_name_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='harvester',
+            index=models.Index(fields=['owner', 'enabled'], name='harvester_owner_enabled_idx'),
+        ),
+    ]
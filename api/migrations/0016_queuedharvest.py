@@ -0,0 +1,25 @@
+# Generated by Django 3.0.2 on 2026-10-19 11:32
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0015_auto_20261019_1315'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='QueuedHarvest',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date_queued', models.DateTimeField(auto_now_add=True)),
+                ('harvester', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='queued_harvest', to='api.Harvester')),
+            ],
+            options={
+                'ordering': ['date_queued', 'id'],
+            },
+        ),
+    ]
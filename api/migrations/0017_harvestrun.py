@@ -0,0 +1,34 @@
+# Generated by Django 3.0.2 on 2026-10-19 11:34
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0016_queuedharvest'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='HarvestRun',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('queued', models.BigIntegerField(blank=True, null=True)),
+                ('started', models.BigIntegerField(blank=True, null=True)),
+                ('ended', models.BigIntegerField(blank=True, null=True)),
+                ('final_state', models.CharField(blank=True, max_length=255)),
+                ('documents', models.IntegerField(blank=True, null=True)),
+                ('duration', models.FloatField(blank=True, null=True)),
+                ('harvester', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='runs', to='api.Harvester')),
+            ],
+            options={
+                'ordering': ['id'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='harvestrun',
+            index=models.Index(fields=['harvester', 'ended'], name='harvestrun_harvester_end_idx'),
+        ),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 3.0.2 on 2026-10-19 12:05
+
+from django.db import migrations, models
+
+
+def delete_duplicate_runs(apps, schema_editor):
+    """Keep the first of the runs recorded twice by concurrent ingests."""
+    HarvestRun = apps.get_model('api', 'HarvestRun')
+    seen = set()
+    for run in HarvestRun.objects.order_by('id'):
+        keys = {(field, run.harvester_id, getattr(run, field))
+                for field in ('queued', 'started')
+                if getattr(run, field) is not None}
+        if keys & seen:
+            run.delete()
+        else:
+            seen |= keys
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0017_harvestrun'),
+    ]
+
+    operations = [
+        migrations.RunPython(delete_duplicate_runs, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='harvestrun',
+            constraint=models.UniqueConstraint(fields=('harvester', 'queued'), name='harvestrun_unique_queued'),
+        ),
+        migrations.AddConstraint(
+            model_name='harvestrun',
+            constraint=models.UniqueConstraint(fields=('harvester', 'started'), name='harvestrun_unique_started'),
+        ),
+    ]
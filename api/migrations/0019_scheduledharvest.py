@@ -0,0 +1,30 @@
+# Generated by Django 3.0.2 on 2026-10-19 12:13
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0018_harvestrun_unique'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ScheduledHarvest',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('date_started', models.DateTimeField(auto_now_add=True)),
+                ('harvester', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='scheduled_harvests', to='api.Harvester')),
+            ],
+            options={
+                'ordering': ['day', 'id'],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='scheduledharvest',
+            constraint=models.UniqueConstraint(fields=('harvester', 'day'), name='scheduledharvest_unique_day'),
+        ),
+    ]
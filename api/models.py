@@ -3,13 +3,17 @@ Model Module; holds harvester model
 """
 from __future__ import unicode_literals
 
+from urllib.parse import urlparse
+
 from django.contrib.auth.models import User
 from django.core.validators import RegexValidator
 from django.db import models
-from django.db.models.signals import post_save
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
 from rest_framework.authtoken.models import Token
 
+from api import authentication, harvester_cache
+
 __author__ = "Jan Frömberg"
 __copyright__ = "Copyright 2018, GeRDI Project"
 __credits__ = ["Jan Frömberg"]
@@ -37,6 +41,9 @@ class Harvester(models.Model):
                               related_name='harvester',
                               on_delete=models.CASCADE)
     url = models.URLField(max_length=255, blank=False, unique=True)
+    # host part of the url, kept to filter harvesters by host via index
+    url_host = models.CharField(max_length=255, blank=True, editable=False,
+                                db_index=True)
     date_created = models.DateTimeField(auto_now_add=True)
     date_modified = models.DateTimeField(auto_now=True)
 
@@ -47,6 +54,19 @@ class Harvester(models.Model):
 
     class Meta:
         ordering = ['name']
+        indexes = [
+            models.Index(fields=['enabled', 'name'],
+                         name='harvester_enabled_name_idx'),
+            models.Index(fields=['owner', 'name'],
+                         name='harvester_owner_name_idx'),
+            models.Index(fields=['owner', 'enabled'],
+                         name='harvester_owner_enabled_idx'),
+        ]
+
+    def save(self, *args, **kwargs):
+        """derive the url host before saving"""
+        self.url_host = urlparse(self.url).hostname or ''
+        super().save(*args, **kwargs)
 
     def enable(self):
         """enable harvester"""
@@ -63,8 +83,141 @@ class Harvester(models.Model):
         return "{}".format(self.name)
 
 
+class QueuedHarvest(models.Model):
+    """
+    This class represents a harvest start waiting for admission,
+    because the maximum of concurrent harvests is reached (see api.admission).
+    """
+    harvester = models.OneToOneField(Harvester,
+                                     related_name='queued_harvest',
+                                     on_delete=models.CASCADE)
+    date_queued = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['date_queued', 'id']
+
+    def __str__(self):
+        """Return a human readable representation of the model instance."""
+        return "{}".format(self.harvester.name)
+
+
+class AdmissionLock(models.Model):
+    """
+    This class represents the lock of the admission queue, a single row
+    which is updated to serialize admission decisions (see api.admission).
+    """
+    acquired = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        """Return a human readable representation of the model instance."""
+        return "admission lock ({})".format(self.acquired)
+
+
+class HarvestRun(models.Model):
+    """
+    This class represents a harvest run of a harvester. Runs are recorded
+    from the state history (/etls) of a harvester, see api.harvest_runs.
+    Timestamps are epoch milliseconds as reported by the harvester.
+    """
+    harvester = models.ForeignKey(Harvester,
+                                  related_name='runs',
+                                  on_delete=models.CASCADE)
+    queued = models.BigIntegerField(null=True, blank=True)
+    started = models.BigIntegerField(null=True, blank=True)
+    ended = models.BigIntegerField(null=True, blank=True)
+    # the state which ended the run, e.g. idle or aborting
+    final_state = models.CharField(max_length=255, blank=True)
+    documents = models.IntegerField(null=True, blank=True)
+    # seconds from start to end
+    duration = models.FloatField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['id']
+        indexes = [
+            models.Index(fields=['harvester', 'ended'],
+                         name='harvestrun_harvester_end_idx'),
+        ]
+        # a run is recorded once, even by concurrent ingests
+        constraints = [
+            models.UniqueConstraint(fields=['harvester', 'queued'],
+                                    name='harvestrun_unique_queued'),
+            models.UniqueConstraint(fields=['harvester', 'started'],
+                                    name='harvestrun_unique_started'),
+        ]
+
+    def __str__(self):
+        """Return a human readable representation of the model instance."""
+        return "{} ({})".format(self.harvester.name,
+                                self.started or self.queued)
+
+    @property
+    def throughput(self):
+        """Return the harvested documents per second or None."""
+        if self.documents is None or not self.duration:
+            return None
+        return self.documents / self.duration
+
+
+class ScheduledHarvest(models.Model):
+    """
+    This class represents a harvest started by the harvest scheduler of the
+    HCC on a day (see api.harvest_scheduler). The unique day claims the
+    start for one poller, even if several pollers run.
+    """
+    harvester = models.ForeignKey(Harvester,
+                                  related_name='scheduled_harvests',
+                                  on_delete=models.CASCADE)
+    day = models.DateField()
+    date_started = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['day', 'id']
+        constraints = [
+            models.UniqueConstraint(fields=['harvester', 'day'],
+                                    name='scheduledharvest_unique_day'),
+        ]
+
+    def __str__(self):
+        """Return a human readable representation of the model instance."""
+        return "{} ({})".format(self.harvester.name, self.day)
+
+
+@receiver(post_save, sender=Harvester)
+def invalidate_harvester_cache(sender, instance=None, **kwargs):
+    """ This receiver drops cached data of a harvester whenever it is saved."""
+    harvester_cache.invalidate(instance)
+    harvester_cache.invalidate_summary()
+
+
+@receiver(post_delete, sender=Harvester)
+def invalidate_harvester_summary(sender, instance=None, **kwargs):
+    """ This receiver drops the fleet summary whenever a harvester is deleted."""
+    harvester_cache.invalidate_summary()
+
+
 @receiver(post_save, sender=User)
 def create_auth_token(sender, instance=None, created=False, **kwargs):
     """ This receiver handles token creation immediately a new user is created."""
     if created:
         Token.objects.create(user=instance)
+
+
+@receiver(post_save, sender=User)
+def invalidate_user_tokens(sender, instance=None, created=False,
+                           update_fields=None, **kwargs):
+    """
+    This receiver drops the cached tokens of a changed user, e.g. a
+    deactivated one. Logins (which only update last_login) are left out.
+    """
+    if created or (update_fields and set(update_fields) == {'last_login'}):
+        return
+    keys = list(Token.objects.filter(user=instance).values_list(
+        'key', flat=True))
+    if keys:
+        authentication.invalidate(*keys)
+
+
+@receiver(post_delete, sender=Token)
+def invalidate_deleted_token(sender, instance=None, **kwargs):
+    """ This receiver drops a deleted token from the token cache."""
+    authentication.invalidate(instance.key)
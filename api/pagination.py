@@ -0,0 +1,35 @@
+"""
+Pagination Module
+"""
+from django.core.paginator import Paginator
+from rest_framework.pagination import CursorPagination
+
+__author__ = "Jan Frömberg"
+__copyright__ = "Copyright 2018, GeRDI Project"
+__credits__ = ["Jan Frömberg"]
+__license__ = "Apache 2.0"
+__maintainer__ = "Jan Frömberg"
+__email__ = "jan.froemberg@tu-dresden.de"
+
+
+class HarvesterCursorPagination(CursorPagination):
+    """
+    Cursor pagination for harvester lists. Every page costs the same,
+    no matter how far a client pages, because there is no COUNT(*) and
+    no OFFSET scan. The unique harvester name serves as cursor.
+    """
+    ordering = 'name'
+    page_size_query_param = 'page_size'
+    max_page_size = 1000
+
+
+class CountedPaginator(Paginator):
+    """
+    Paginator for the dashboard. The number of objects is known in advance
+    from the fleet summary (see api.summary), so paging costs no COUNT(*).
+    """
+
+    def __init__(self, object_list, per_page, count, **kwargs):
+        super().__init__(object_list, per_page, **kwargs)
+        # overrides the cached property
+        self.count = count
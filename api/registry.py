@@ -0,0 +1,253 @@
+"""
+This module holds the backup and restore of the harvester registry.
+Exports are streamed from a queryset iterator as JSON array or NDJSON
+(one harvester per line), imports are parsed incrementally and applied in
+batches. Both run in constant memory regardless of the number of harvesters.
+"""
+import codecs
+import collections.abc
+import json
+
+from api.forms import ValidateFileForm
+from api.models import Harvester
+from api.renderers import dumps
+
+__author__ = "Jan Frömberg"
+__copyright__ = "Copyright 2018, GeRDI Project"
+__credits__ = ["Jan Frömberg"]
+__license__ = "Apache 2.0"
+__maintainer__ = "Jan Frömberg"
+__email__ = "jan.froemberg@tu-dresden.de"
+
+FIELDS = ('name', 'notes', 'url', 'enabled')
+# harvesters per database round trip and per streamed chunk
+BATCH_SIZE = 500
+# bytes read from an upload at once and the largest record of a JSON array
+READ_SIZE = 64 * 1024
+MAX_RECORD_SIZE = 1024 * 1024
+
+JSON = 'json'
+NDJSON = 'ndjson'
+CONTENT_TYPES = {
+    JSON: 'application/json',
+    NDJSON: 'application/x-ndjson',
+}
+
+# a JSON value expected by parse_json
+RECORD = 'record'
+
+INVALID_JSON = (
+    'Upload failed. '
+    'File content was either wrong formatted or empty. '
+    'Must be a JSON array of objects with harvester data.'
+)
+
+
+class RegistryError(ValueError):
+    """An upload which cannot be imported, the message is shown to the user."""
+
+
+def batches(iterable, size):
+    """Yield lists of up to size items of an iterable."""
+    batch = []
+    for item in iterable:
+        batch.append(item)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def export_rows(queryset):
+    """Yield the exported fields of the harvesters without caching them."""
+    return queryset.order_by('id').values(*FIELDS).iterator(
+        chunk_size=BATCH_SIZE)
+
+
+def export_ndjson(queryset):
+    """Yield chunks of NDJSON, one harvester per line."""
+    for batch in batches(export_rows(queryset), BATCH_SIZE):
+        yield b''.join(dumps(row) + b'\n' for row in batch)
+
+
+def export_json(queryset):
+    """Yield chunks of a JSON array of harvesters."""
+    yield b'['
+    separator = b''
+    for batch in batches(export_rows(queryset), BATCH_SIZE):
+        yield separator + b','.join(dumps(row) for row in batch)
+        separator = b','
+    yield b']'
+
+
+def read_text(file):
+    """Yield the decoded text of an uploaded file in chunks."""
+    decoder = codecs.getincrementaldecoder('utf-8')()
+    for chunk in file.chunks(READ_SIZE):
+        if isinstance(chunk, str):
+            yield chunk
+        else:
+            yield decoder.decode(chunk)
+    yield decoder.decode(b'', final=True)
+
+
+def parse_ndjson(file):
+    """Yield the records of an NDJSON upload line by line."""
+    for number, line in enumerate(file, 1):
+        if isinstance(line, bytes):
+            line = line.decode('utf-8')
+        if not line.strip():
+            continue
+        try:
+            yield json.loads(line)
+        except json.JSONDecodeError:
+            raise RegistryError(
+                'Upload failed. Line {} is no valid JSON.'.format(number))
+
+
+def parse_json(file):
+    """
+    Yield the records of a JSON array upload one by one. Only the current
+    record (at most MAX_RECORD_SIZE characters) is kept in memory.
+    """
+    decoder = json.JSONDecoder()
+    chunks = read_text(file)
+    buffer, pos = '', 0
+    # '[' first, a record or ']' after '[', a record after ','
+    # and ',' or ']' after a record
+    expected = {'['}
+    while True:
+        while pos < len(buffer) and buffer[pos].isspace():
+            pos += 1
+        if pos == len(buffer):
+            buffer, pos = next(chunks, ''), 0
+            if not buffer:
+                raise RegistryError(INVALID_JSON)
+            continue
+        char = buffer[pos]
+        if char in expected and char in '[,':
+            expected = {RECORD} if char == ',' else {RECORD, ']'}
+            pos += 1
+        elif char in expected and char == ']':
+            return
+        elif RECORD in expected:
+            try:
+                record, end = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                # the record might continue in the next chunk
+                more = next(chunks, '')
+                if not more or len(buffer) - pos > MAX_RECORD_SIZE:
+                    raise RegistryError(INVALID_JSON)
+                buffer, pos = buffer[pos:] + more, 0
+                continue
+            yield record
+            buffer, pos = buffer[end:], 0
+            expected = {',', ']'}
+        else:
+            raise RegistryError(INVALID_JSON)
+
+
+def parse(file):
+    """
+    Yield the records of an uploaded JSON array or NDJSON file (detected by
+    the content type or the file extension .ndjson/.jsonl).
+    """
+    if file.content_type == CONTENT_TYPES[NDJSON] or file.name.endswith(
+            ('.ndjson', '.jsonl')):
+        return parse_ndjson(file)
+    if file.content_type == CONTENT_TYPES[JSON]:
+        return parse_json(file)
+    raise RegistryError(
+        'Upload failed. '
+        'File type could not been handled. '
+        'Must be a JSON or NDJSON file!')
+
+
+def import_batch(batch, user):
+    """
+    Add or update the harvesters of a batch of records with two queries
+    to find the existing ones. Existing harvesters keep their notes, a
+    harvester with a known name but a new url is added under a new name
+    ("_n" appended) and records with a known url are left out.
+
+    :return: the number of saved harvesters
+    """
+    by_name = {harvester.name: harvester for harvester in
+               Harvester.objects.filter(
+                   name__in=[record['name'] for record in batch])}
+    urls = {url for url, in Harvester.objects.filter(
+        url__in=[record['url'] for record in batch]).values_list('url')}
+    saved = 0
+    for record in batch:
+        data = record.copy()
+        harvester = by_name.get(record['name'])
+        if harvester is not None:
+            # Harvester already exists -> update harvester
+            data['notes'] = harvester.notes  # Notes should not be updated
+            if ((harvester.url == record['url']
+                 and harvester.enabled == record['enabled'])):
+                continue
+            elif not harvester.url == record['url']:
+                if record['url'] in urls:
+                    # The url should be unique. Leave the existing harvester
+                    # data and ignore the new one.
+                    continue
+                # Create new Harvester with new url
+                harvester = Harvester(owner=user)
+                counter = 1
+                while True:
+                    # Loop until the harvester name is not already used
+                    temp_name = '{}_{}'.format(record['name'], counter)
+                    if temp_name not in by_name and not \
+                            Harvester.objects.filter(name=temp_name).exists():
+                        data['name'] = temp_name
+                        break
+                    counter += 1
+        elif record['url'] in urls:
+            # The url should be unique. Leave the existing harvester data
+            # and ignore the new one
+            continue
+        else:
+            # Create a new harvester
+            harvester = Harvester(owner=user)
+
+        form = ValidateFileForm(data, instance=harvester)
+        if not form.is_valid():
+            raise RegistryError(
+                'Validation failed. '
+                'Content data could not been saved.')
+        harvester = form.save()
+        by_name[harvester.name] = harvester
+        urls.add(harvester.url)
+        saved += 1
+    return saved
+
+
+def validate(record):
+    """Check that a record is a dictionary with the exported fields."""
+    # the records should be dictionaries
+    if not isinstance(record, collections.abc.Mapping):
+        raise RegistryError(
+            'Validation failed. '
+            'File content could not been handled.'
+            'Should be a list of dictionaries!')
+    # The records should contain the required harvester data
+    if not all(key in record for key in FIELDS):
+        raise RegistryError(
+            'Validation failed. '
+            'Key missmatch! Required: name, notes, url, enabled')
+    return record
+
+
+def import_records(records, user, size=BATCH_SIZE):
+    """
+    Import harvester records batch by batch. Batches before an invalid
+    record are kept.
+
+    :param records: an iterable of harvester records (see parse)
+    :param user: the owner of new harvesters
+    :return: the number of saved harvesters
+    """
+    return sum(import_batch(batch, user) for batch in batches(
+        (validate(record) for record in records), size))
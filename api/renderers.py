@@ -0,0 +1,70 @@
+"""
+Renderer Module
+
+Fast JSON serialization for the large status, progress and export payloads.
+orjson is used if it is installed, the standard library json module otherwise.
+"""
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import HttpResponse
+from rest_framework.renderers import JSONRenderer
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+__author__ = "Jan Frömberg"
+__copyright__ = "Copyright 2018, GeRDI Project"
+__credits__ = ["Jan Frömberg"]
+__license__ = "Apache 2.0"
+__maintainer__ = "Jan Frömberg"
+__email__ = "jan.froemberg@tu-dresden.de"
+
+_ENCODER = DjangoJSONEncoder()
+
+
+def dumps(data):
+    """
+    Serialize data to compact UTF-8 encoded JSON bytes.
+    Types unknown to orjson (e.g. lazy translations or decimals)
+    are handled like the DjangoJSONEncoder does.
+    """
+    if orjson is not None:
+        return orjson.dumps(data, default=_ENCODER.default,
+                            option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(data, cls=DjangoJSONEncoder, ensure_ascii=False,
+                      separators=(',', ':')).encode('utf-8')
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    A JSONRenderer using the fast dumps() function.
+    Indented output (e.g. ?format=json with an indent media type parameter)
+    is still rendered by the DRF implementation.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        renderer_context = renderer_context or {}
+        if self.get_indent(accepted_media_type, renderer_context):
+            return super().render(data, accepted_media_type, renderer_context)
+        return dumps(data)
+
+
+class FastJsonResponse(HttpResponse):
+    """
+    A drop-in replacement for django.http.JsonResponse
+    using the fast dumps() function.
+    """
+
+    def __init__(self, data, safe=True, **kwargs):
+        if safe and not isinstance(data, dict):
+            raise TypeError(
+                'In order to allow non-dict objects to be serialized set the '
+                'safe parameter to False.'
+            )
+        kwargs.setdefault('content_type', 'application/json')
+        super().__init__(content=dumps(data), **kwargs)
@@ -1,5 +1,21 @@
-# import schedule
-# import time
+"""
+This module holds the adaptive status poller. It keeps the shared status
+snapshots of all enabled harvesters fresh, so views are served from the
+snapshot store instead of polling the harvesters on every request.
+Run it with: python manage.py poll_harvesters
+"""
+import datetime
+import logging
+import time
+
+from django.conf import settings
+from django.utils.dateparse import parse_datetime
+from rest_framework import status
+
+from api import admission, harvester_cache, summary
+from api.constants import HCCJSONConstants as HCCJC
+from api.harvester_api import call_harvester_apis
+from api.models import Harvester
 
 __author__ = "Jan Frömberg"
 __copyright__ = "Copyright 2018, GeRDI Project"
@@ -8,24 +24,178 @@ __license__ = "Apache"
 __maintainer__ = "Jan Frömberg"
 __email__ = "jan.froemberg@tu-dresden.de"
 
+# Get an instance of a logger
+LOGGER = logging.getLogger(__name__)
+
+
+def seconds_until(value, now):
+    """
+    Return the seconds from now (a timestamp) to a harvester date,
+    given in epoch milliseconds or ISO 8601, or None if it is unknown.
+    """
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return value / 1000 - now
+    if isinstance(value, str):
+        try:
+            date = parse_datetime(value)
+        except ValueError:
+            return None
+        if date is None:
+            return None
+        if date.tzinfo is None:
+            date = date.replace(tzinfo=datetime.timezone.utc)
+        return date.timestamp() - now
+    return None
 
-def job():
-    print("poll the harvester api...")
 
+def is_reachable(status_code):
+    """Return True if a status response came from a running harvester."""
+    return (status_code < status.HTTP_400_BAD_REQUEST
+            or status_code == status.HTTP_503_SERVICE_UNAVAILABLE)
 
-# schedule.every(10).minutes.do(job)
-# schedule.every().hour.do(job)
-# schedule.every().day.at("10:30").do(job)
-# schedule.every(5).to(10).minutes.do(job)
-# schedule.every().monday.do(job)
 
-# schedule.every().wednesday.at("13:15").do(job)
+def poll_interval(feedback, now, failures=0):
+    """
+    Return the seconds until a harvester should be polled again.
 
+    :param feedback: the status of the harvester (the snapshot data)
+    :param now: the current timestamp
+    :param failures: number of failed polls in a row (exponential backoff)
+    :return: interval in seconds
+    """
+    intervals = settings.POLL_INTERVALS
+    if failures:
+        return min(intervals['MAX'],
+                   intervals['UNREACHABLE'] * 2 ** (failures - 1))
+    if not isinstance(feedback, dict):
+        return intervals['IDLE']
 
-# while True:
-#     schedule.run_pending()
-#     time.sleep(1)
+    if harvester_cache.is_active(feedback):
+        remaining = feedback.get(HCCJC.REMAIN_HARVEST_TIME)
+        if isinstance(remaining, (int, float)) and not isinstance(remaining, bool):
+            # poll right when the harvest is expected to end
+            return max(intervals['TICK'],
+                       min(intervals['ACTIVE'], remaining / 1000))
+        return intervals['ACTIVE']
+
+    interval = intervals['IDLE']
+    until = seconds_until(feedback.get(HCCJC.NEXT_HARVEST_DATE), now)
+    if until is not None and 0 < until < interval:
+        # poll right after the next scheduled harvest started
+        interval = max(intervals['TICK'], until)
+    return interval
 
 
 class Scheduler:
-    """Custom Scheduler class to handle timed events."""
+    """
+    Custom Scheduler class to poll the harvesters adaptively.
+
+    The poll interval of each harvester depends on its last state:
+    harvesting/queued harvesters are polled fast, idle ones slowly
+    (or right after their next scheduled harvest) and unreachable ones
+    with an exponential backoff. Snapshots written by somebody else count
+    as a poll; harvesters pushing their state are only polled once their
+    pushed snapshot expired.
+    """
+
+    def __init__(self, harvest_scheduler=None):
+        # failed polls in a row by harvester name
+        self.failures = {}
+        # starts the scheduled harvests every tick (see api.harvest_scheduler)
+        self.harvest_scheduler = harvest_scheduler
+
+    def next_poll(self, harvester, snapshot, now):
+        """Return the timestamp of the next poll of a harvester."""
+        if snapshot is None:
+            return now
+        if snapshot.get(harvester_cache.PUSHED):
+            # harvesters pushing their state are polled as fallback only
+            return snapshot[harvester_cache.EXPIRES]
+        feedback = harvester_cache.snapshot_feedback(harvester, snapshot)
+        interval = poll_interval(feedback, now,
+                                 self.failures.get(harvester.name, 0))
+        return snapshot[harvester_cache.TIMESTAMP] + interval
+
+    def due(self, harvesters, snapshots, now):
+        """
+        Return the harvesters which need to be polled now.
+
+        :param snapshots: the snapshots of the harvesters by name
+            (see harvester_cache.get_snapshots)
+        """
+        return [harvester for harvester in harvesters
+                if self.next_poll(harvester, snapshots.get(harvester.name),
+                                  now) <= now]
+
+    def poll(self, now=None):
+        """
+        Poll all due enabled harvesters concurrently and store their
+        snapshots until their next poll.
+
+        :return: a list of (harvester, seconds until the next poll) tuples
+        """
+        now = now if now is not None else time.time()
+        harvesters = list(Harvester.objects.filter(enabled=True))
+        # one cache lookup per tick
+        previous = harvester_cache.get_snapshots(harvesters)
+        harvesters = self.due(harvesters, previous, now)
+        polled = []
+        finished = []
+        for harvester, response in call_harvester_apis(harvesters,
+                                                       'fetch_status'):
+            if is_reachable(response.status_code):
+                self.failures.pop(harvester.name, None)
+            else:
+                self.failures[harvester.name] = self.failures.get(
+                    harvester.name, 0) + 1
+            feedback = harvester_cache.get_feedback(harvester, response.data)
+            before = harvester_cache.snapshot_feedback(
+                harvester, previous.get(harvester.name))
+            if (harvester_cache.is_active(before)
+                    and not harvester_cache.is_active(feedback)):
+                finished.append(harvester)
+            interval = poll_interval(feedback, now,
+                                     self.failures.get(harvester.name, 0))
+            # keep the snapshot a little longer than the interval,
+            # so views never poll a harvester the scheduler takes care of
+            harvester_cache.set_snapshot(
+                harvester, response.data, response.status_code, now,
+                timeout=interval + settings.HCC_CACHE_TTL['SNAPSHOT'])
+            polled.append((harvester, interval))
+            LOGGER.debug("%s polled, next poll in %.0f seconds.",
+                         harvester.name, interval)
+        # record the runs of finished harvests from their state history
+        call_harvester_apis(finished, 'status_history')
+        if polled:
+            # precompute the summary of the dashboard with the new states
+            harvester_cache.set_summary(summary.compute_summary())
+        # start queued harvests if running ones finished, even if they
+        # were seen by a view or pushed their state
+        admission.release()
+        return polled
+
+    def run(self, ticks=None):
+        """Poll the harvesters every tick (forever by default)."""
+        tick = 0
+        while ticks is None or tick < ticks:
+            now = time.time()
+            try:
+                self.poll(now)
+                # all due harvesters are polled, even if none was due
+                last_poll = now
+            except Exception:
+                LOGGER.exception("Polling the harvesters failed.")
+                last_poll = None
+            try:
+                harvester_cache.set_heartbeat(now, last_poll)
+            except Exception:
+                LOGGER.exception("Storing the poller heartbeat failed.")
+            if self.harvest_scheduler is not None:
+                try:
+                    self.harvest_scheduler.run_due()
+                except Exception:
+                    LOGGER.exception("Starting the scheduled harvests failed.")
+            tick += 1
+            time.sleep(settings.POLL_INTERVALS['TICK'])
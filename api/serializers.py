@@ -37,3 +37,92 @@ class UserSerializer(serializers.ModelSerializer):
         """Map this serializer to the default django user model."""
         model = User
         fields = ('id', 'username', 'harvester')
+
+
+def crontab_field():
+    """Return a field of a crontab like '0 0 * * *'."""
+    return serializers.RegexField(
+        r'^\S+( \S+){4}$',
+        error_messages={'invalid': 'A crontab consists of five fields.'})
+
+
+HARVESTER_FILTERS = ('enabled', 'owner', 'name__startswith', 'url_host')
+
+
+def validate_filter(value):
+    """Check that a harvester filter only uses the supported keys."""
+    unknown = sorted(key for key in value if key not in HARVESTER_FILTERS)
+    if unknown:
+        raise serializers.ValidationError(
+            'Unknown filters: {}. Supported are {}.'.format(
+                ', '.join(unknown), ', '.join(HARVESTER_FILTERS)))
+
+
+def filter_field():
+    """Return a field of a non-empty harvester filter like {"owner": "name"}."""
+    return serializers.DictField(child=serializers.CharField(),
+                                 allow_empty=False, required=False,
+                                 validators=[validate_filter])
+
+
+class HarvesterStateSerializer(serializers.Serializer):
+    """
+    Serializer to validate the state document pushed by a harvester (the
+    body of its GET / response). Further keys, e.g. dates, are passed on.
+    """
+    health = serializers.CharField()
+    state = serializers.CharField()
+    harvestedCount = serializers.IntegerField()
+    repositoryName = serializers.CharField(allow_blank=True)
+    maxDocumentCount = serializers.IntegerField(required=False)
+
+
+class BulkScheduleSerializer(serializers.Serializer):
+    """
+    Serializer to validate a bulk schedule request. It either maps harvester
+    names to their desired crontabs (schedules) or sets the same crontabs
+    (crontabs) for all harvesters matching a filter, e.g. {"owner": "name"}.
+    """
+    schedules = serializers.DictField(
+        child=serializers.ListField(child=crontab_field()), required=False)
+    crontabs = serializers.ListField(child=crontab_field(), required=False)
+    filter = filter_field()
+
+    def validate(self, attrs):
+        """Check that either schedules or crontabs is given."""
+        if ('schedules' in attrs) == ('crontabs' in attrs):
+            raise serializers.ValidationError(
+                'Either schedules or crontabs is required.')
+        if ('filter' in attrs) != ('crontabs' in attrs):
+            raise serializers.ValidationError(
+                'Crontabs require a filter.')
+        return attrs
+
+
+class BulkConfigSerializer(serializers.Serializer):
+    """
+    Serializer to validate a bulk config request. It pushes the same
+    changes ('section.key': value) to the named harvesters (names) or to all
+    harvesters matching a filter, e.g. {"url_host": "example.org"}.
+    """
+    changes = serializers.DictField(
+        child=serializers.CharField(allow_blank=True), allow_empty=False)
+    names = serializers.ListField(child=serializers.CharField(),
+                                  required=False)
+    filter = filter_field()
+
+    def validate_changes(self, value):
+        """Check that the changes are 'section.key' parameters."""
+        invalid = [key for key in value if '.' not in key]
+        if invalid:
+            raise serializers.ValidationError(
+                'Parameters are named section.key: {}'.format(
+                    ', '.join(invalid)))
+        return value
+
+    def validate(self, attrs):
+        """Check that either names or a filter is given."""
+        if ('names' in attrs) == ('filter' in attrs):
+            raise serializers.ValidationError(
+                'Either names or filter is required.')
+        return attrs
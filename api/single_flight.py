@@ -0,0 +1,153 @@
+"""
+This module holds the single-flight layer of the outbound harvester client.
+Concurrent identical GET requests share one in-flight request and its result
+within a worker process and, if settings.SINGLE_FLIGHT['SHARED'] is set,
+across worker processes through the shared cache. All requests are logged
+with their url, status and latency (see api.structured_log).
+"""
+import hashlib
+import threading
+import time
+
+import requests
+from django.conf import settings
+from django.core.cache import cache
+
+from api.structured_log import log_upstream
+
+__author__ = "Jan Frömberg"
+__copyright__ = "Copyright 2018, GeRDI Project"
+__credits__ = ["Jan Frömberg"]
+__license__ = "Apache 2.0"
+__maintainer__ = "Jan Frömberg"
+__email__ = "jan.froemberg@tu-dresden.de"
+
+
+class _Call:
+    """An in-flight call, its result or error."""
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    Execute a function only once for concurrent callers with the same key.
+    All callers get the result (or the exception) of that one execution.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+
+    def do(self, key, func):
+        """Return func(), sharing an in-flight execution of the same key."""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+
+        if not leader:
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = func()
+        except Exception as err:
+            call.error = err
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.event.set()
+        return call.result
+
+
+def _published(result_key, error_key):
+    """Return the result published by another worker or raise its error."""
+    published = cache.get_many([result_key, error_key])
+    if error_key in published:
+        raise published[error_key]
+    return published.get(result_key)
+
+
+def shared_do(key, func):
+    """
+    Return func(), sharing the execution with other worker processes.
+    The first worker takes a lock in the shared cache and publishes its
+    result (or error) for a short time, the others wait for it. If the lock
+    is gone without a result or it does not show up in time, they execute
+    func() themselves.
+    """
+    conf = settings.SINGLE_FLIGHT
+    digest = hashlib.md5(key.encode('utf-8')).hexdigest()
+    result_key = "hcc:flight:result:{}".format(digest)
+    error_key = "hcc:flight:error:{}".format(digest)
+    lock_key = "hcc:flight:lock:{}".format(digest)
+
+    result = _published(result_key, error_key)
+    if result is not None:
+        return result
+
+    if cache.add(lock_key, True, conf['WAIT']):
+        try:
+            result = func()
+            cache.set(result_key, result, conf['RESULT_TTL'])
+            return result
+        except Exception as err:
+            try:
+                cache.set(error_key, err, conf['RESULT_TTL'])
+            except Exception:  # errors which cannot be pickled are not shared
+                pass
+            raise
+        finally:
+            cache.delete(lock_key)
+
+    deadline = time.monotonic() + conf['WAIT']
+    while time.monotonic() < deadline:
+        time.sleep(conf['POLL'])
+        result = _published(result_key, error_key)
+        if result is not None:
+            return result
+        if cache.get(lock_key) is None:
+            # the leader is done, but its result was not published
+            result = _published(result_key, error_key)
+            if result is not None:
+                return result
+            break
+    return func()
+
+
+FLIGHT = SingleFlight()
+
+
+def request(method, url, **kwargs):
+    """A requests.get(), put(), post() or delete() logged with its latency."""
+    started = time.monotonic()
+    try:
+        response = getattr(requests, method.lower())(url, **kwargs)
+    except requests.RequestException as err:
+        log_upstream(method, url, started, error=err)
+        raise
+    log_upstream(method, url, started, response)
+    return response
+
+
+def get(url, **kwargs):
+    """
+    A requests.get() sharing concurrent identical requests.
+    The returned response must be treated as read-only.
+    """
+    key = "GET {} {}".format(url, sorted(kwargs.items()))
+
+    def fetch():
+        return request('GET', url, **kwargs)
+
+    if settings.SINGLE_FLIGHT['SHARED']:
+        return FLIGHT.do(key, lambda: shared_do(key, fetch))
+    return FLIGHT.do(key, fetch)
@@ -32,7 +32,9 @@ $(function () {
     $('#loaderSpinnerLog').hide();
     $('#loaderSpinnerStat').hide();
 
-    if ($('#collapseChart').is(':visible')) {
+    // the page is rendered without harvester status,
+    // fill all views with the status of all harvesters at once
+    if ($('#collapseChart').length) {
         loadChart();
     }
 
@@ -76,10 +78,11 @@ $(function () {
             var data = JSON.stringify(result, undefined, 2);
             $('#message-modal-footer').show();
             $('#message-modal').modal('toggle');
-            $('#message-modal-body').html('<pre>' + data + '</pre>');
+            // the responses hold harvester and log texts, never render them as html
+            $('#message-modal-body').empty().append($('<pre>').text(data));
             for (let key in status) {
                 let obj = status[key];
-                $('#hv-status-' + key).html(obj.log);
+                $('#hv-status-' + key).text(obj.log);
             }
             $('#loaderSpinnerLog').hide();
 
@@ -87,7 +90,7 @@ $(function () {
             $('#loaderSpinnerLog').hide();
             $('#message-modal-footer').show();
             $('#message-modal').modal('toggle');
-            $('#message-modal-body').html(response.responseText);
+            $('#message-modal-body').text(response.responseText);
         });
     }
 
@@ -123,7 +126,7 @@ $(function () {
             var obj = status[key];
             if (obj != 'disabled') {
 
-                $('#hv-status-' + key).html(JSON.stringify(obj));
+                $('#hv-status-' + key).text(JSON.stringify(obj));
                 var btnhvstatus = document.getElementById('btn-harvester-status-' + key);
                 if (btnhvstatus) {
                     btnhvstatus.classList.toggle("btn-info", false);
@@ -132,8 +135,49 @@ $(function () {
                     btnhvstatus.classList.add("btn-" + obj.gui_status);
                 }
                 if (obj.status) {
-                    var lbl_status = document.getElementById('lbl-harvester-status-' + key);
-                    lbl_status.innerHTML = obj.status;
+                    $('.harvester-status-' + key).text(obj.status);
+                    var active = ['harvesting', 'queued', 'submitting'].includes(obj.status);
+                    var idle = ['idle', 'idling'].includes(obj.status);
+                    $('.harvester-stop-' + key).toggle(active);
+                    $('.harvester-start-' + key).toggle(idle);
+                    // see the progress bars in window.ready
+                    $(document).trigger('harvester-status', [key, obj.status]);
+                }
+                $('#list-item-' + key)
+                    .removeClass(function (index, className) {
+                        return (className.match(/\blist-group-item-(?!action)\S+/g) || []).join(' ');
+                    })
+                    .addClass('list-group-item-' + obj.gui_status)
+                    .attr('data-original-title', obj.health);
+                $('#table-info-button-' + key).attr('data-original-title', JSON.stringify(obj));
+                if (obj.progress_cur !== undefined) {
+                    $('#progresshv-' + key)
+                        .css('width', obj.progress_cur + '%')
+                        .attr('aria-valuenow', obj.progress_cur)
+                        .attr('aria-valuemax', obj.max_docs)
+                        .text(obj.progress_cur + (obj.max_docs != 'N/A' ? '%' : ''))
+                        .toggle(obj.gui_status != 'warning');
+                }
+                var cron = obj.cron;
+                var noCron = [undefined, 'no crontab defined yet', 'cron not supported. basic mode.'];
+                if (obj.nextHarvestDate || !noCron.includes(cron)) {
+                    $('#harvester-schedule-' + key)
+                        .attr('data-original-title', 'next harvest: ' + obj.nextHarvestDate + ' with crontab ' + cron)
+                        .show();
+                } else {
+                    $('#harvester-schedule-' + key).hide();
+                }
+                if (cron) {
+                    if (Array.isArray(cron)) {
+                        cron = cron.length > 0 ? cron[0] : '';
+                    }
+                    $('#cron-form-' + key).show();
+                    $('#cron-form-' + key + ' input[name$="-cronTab"]').attr('placeholder', cron);
+                }
+                if (obj.status_age) {
+                    $('#status-age-' + key).text(obj.status_age + 's ago');
+                } else {
+                    $('#status-age-' + key).text('');
                 }
                 if (obj.cached_docs) {
                     vlabels.push(key);
@@ -240,8 +284,52 @@ $(function () {
         return false;
     });
 
-    $('#btn-hcc-log').on('click', function (event) {
-        load_into_modal(this);
+    $(document).on('change', '#logger-date', function () {
+        // reload the harvester logs of the chosen day into the modal
+        let url = $(this).attr("data-form") + '?date=' + $(this).val();
+        $('#loaderSpinnerLog').show();
+        $("#form-modal").load(url, function () {
+            $('#loaderSpinnerLog').hide();
+        });
+    });
+
+    $('#btn-config-diff').on('click', function (ev) {
+        ev.preventDefault();
+        // compare the selected harvesters, all enabled ones if none is selected
+        let url = $(this).attr("title");
+        let names = $('.table-view-checkbox:checked').map(function () {
+            return this.id.replace(/-table-checkbox$/, '');
+        }).get();
+        if (names.length > 0) {
+            url += '?names=' + encodeURIComponent(names.join(','));
+        }
+        $('#loaderSpinnerLog').show();
+        $("#form-modal").load(url, function () {
+            $(this).modal('show');
+            $('#loaderSpinnerLog').hide();
+        });
+        return false;
+    });
+
+    $('#btn-hcc-log').on('click', function (ev) {
+        ev.preventDefault();
+        let url = $(this).attr("title");
+        $('#loaderSpinnerLog').show();
+        $("#form-modal").load(url, function () {
+            $(this).modal('show');
+            $('#loaderSpinnerLog').hide();
+        });
+        return false;
+    });
+
+    $(document).on('submit', '#hcc-log-form', function (ev) {
+        ev.preventDefault();
+        // reload the matching hcc log records into the modal
+        let url = $(this).attr("data-form") + '?' + $(this).serialize();
+        $('#loaderSpinnerLog').show();
+        $("#form-modal").load(url, function () {
+            $('#loaderSpinnerLog').hide();
+        });
     });
 
     $('[id^=btn-url]').on('click', function (event) {
@@ -377,25 +465,19 @@ $(window).ready(function () {
         }
     };
 
-    var lbl_status = document.querySelectorAll('*[id^="lbl-harvester-status-"]');
-    var lblarray = Array.from(lbl_status);
-    if (lblarray.length > 0) {
-        for (var key in lblarray) {
-
-            var obj = lblarray[key];
-            var objid = obj.id;
-            var me = objid.split('-')[3];
+    // follow the progress of running harvests once their status is loaded
+    var progressIds = {};
+    $(document).on('harvester-status', function (event, me, status) {
 
-            if (obj.innerText == 'harvesting' || obj.innerText == 'queued') {
+        if ((status == 'harvesting' || status == 'queued') && !(me in progressIds)) {
 
-                var is = $('#progresshv-' + me);
-                is.addClass("progress-bar-animated");
-                is.removeClass("progress-bar-grey");
-                var remember = is.attr("title");
-                var progressid = setInterval( getProgress, 1982, remember, me );
-            }
+            var is = $('#progresshv-' + me);
+            is.addClass("progress-bar-animated");
+            is.removeClass("progress-bar-grey");
+            var remember = is.attr("title");
+            progressIds[me] = setInterval( getProgress, 1982, remember, me );
         }
-    }
+    });
 
     function getProgress(_url, _harv) {
         
@@ -406,7 +488,7 @@ $(window).ready(function () {
         var width = parseInt(bar[0].innerText.replace('%', ''));
         var state = statuslabel[0].innerText;
         var perc = "%";
-        var remain, elapsed, activated;
+        var remain, elapsed, activated, rate;
         var time = 0;
         var time_string = "";
         var start, now;
@@ -435,9 +517,11 @@ $(window).ready(function () {
                     max = data[key].max_docs;
                     cache = data[key].progress;
                     state = data[key].state;
+                    rate = data[key].harvestRate;
 
                     $('#btn-harvester-status-' + key).attr('data-original-title',
-                        cache + ' of ' + max);
+                        cache + ' of ' + max +
+                        (rate ? ' (' + rate.toFixed(1) + ' docs/s)' : ''));
                     $('.harvester-status-' + _harv).html(state);
 
                     // referenced by context, this
@@ -480,7 +564,8 @@ $(window).ready(function () {
             btnhvstatus.classList.add( "btn-success" );
             timelabel.html( "" );
             statuslabel.html("finished");
-            clearInterval(progressid);
+            clearInterval(progressIds[_harv]);
+            delete progressIds[_harv];
             
         }
     }
@@ -0,0 +1,166 @@
+"""
+This module holds the structured logging of the control center. Every log
+record carries the id and user of the current request and the harvester
+being called (bound with log_context), the JSONFormatter writes them with
+the upstream url, status and latency of harvester calls as one JSON object
+per line. These lines are indexed for the log search (see api.log_index).
+"""
+import contextlib
+import contextvars
+import datetime
+import json
+import logging
+import time
+import uuid
+
+from django.conf import settings
+from django.utils.functional import SimpleLazyObject
+
+__author__ = "Jan Frömberg"
+__copyright__ = "Copyright 2018, GeRDI Project"
+__credits__ = ["Jan Frömberg"]
+__license__ = "Apache 2.0"
+__maintainer__ = "Jan Frömberg"
+__email__ = "jan.froemberg@tu-dresden.de"
+
+# Get an instance of a logger
+LOGGER = logging.getLogger(__name__)
+
+# the fields bound to the current context
+CONTEXT_FIELDS = ('request_id', 'user', 'harvester')
+_CONTEXT = {field: contextvars.ContextVar(field, default=None)
+            for field in CONTEXT_FIELDS}
+# further fields of a record, given via extra={...}
+EXTRA_FIELDS = ('url', 'method', 'status', 'latency')
+
+REQUEST_ID_HEADER = 'X-Request-ID'
+
+
+@contextlib.contextmanager
+def log_context(**fields):
+    """Bind fields (see CONTEXT_FIELDS) to the records logged within."""
+    tokens = [(_CONTEXT[field], _CONTEXT[field].set(value))
+              for field, value in fields.items()]
+    try:
+        yield
+    finally:
+        for var, token in reversed(tokens):
+            var.reset(token)
+
+
+def copy_context():
+    """
+    Return a function running a callable in a copy of the current context,
+    e.g. to keep the request id in the threads of an executor.
+    """
+    context = contextvars.copy_context()
+
+    def run(func, *args):
+        return context.copy().run(func, *args)
+    return run
+
+
+_FACTORY = logging.getLogRecordFactory()
+
+
+def record_factory(*args, **kwargs):
+    """Create a log record with the fields of the current context."""
+    record = _FACTORY(*args, **kwargs)
+    for field, var in _CONTEXT.items():
+        value = var.get()
+        # e.g. the user, which is looked up when it is logged
+        setattr(record, field, value() if callable(value) else value)
+    return record
+
+
+def install():
+    """
+    Add the context to all log records. Records are created in the logging
+    thread, so the context is kept if they are written by another thread
+    (see api.log_queue).
+    """
+    logging.setLogRecordFactory(record_factory)
+
+
+class JSONFormatter(logging.Formatter):
+    """Format a log record as one line of JSON, empty fields are left out."""
+
+    def format(self, record):
+        entry = {
+            'time': datetime.datetime.fromtimestamp(
+                record.created, datetime.timezone.utc).isoformat(),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+        }
+        for field in CONTEXT_FIELDS + EXTRA_FIELDS:
+            value = getattr(record, field, None)
+            if value is not None:
+                entry[field] = value
+        if record.exc_info:
+            entry['exc'] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry['exc'] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+def log_upstream(method, url, started, response=None, error=None):
+    """
+    Log a call of a harvester with its url, status and latency. Failed
+    and slow calls (settings.STRUCTURED_LOG['SLOW'] seconds) are warnings,
+    all others are debug records.
+    """
+    latency = round(time.monotonic() - started, 3)
+    extra = {'method': method, 'url': url, 'latency': latency,
+             'status': getattr(response, 'status_code', None)}
+    if error is not None:
+        LOGGER.warning("%s %s failed after %.3fs: %s", method, url, latency,
+                       error, extra=extra)
+    elif latency >= settings.STRUCTURED_LOG['SLOW']:
+        LOGGER.warning("%s %s took %.3fs", method, url, latency, extra=extra)
+    else:
+        LOGGER.debug("%s %s took %.3fs", method, url, latency, extra=extra)
+
+
+def request_user(request):
+    """
+    Return the name of the user of a request if it has been authenticated
+    already, the user is not looked up for the log.
+    """
+    user = request.__dict__.get('user')
+    if isinstance(user, SimpleLazyObject):
+        # the session user of the AuthenticationMiddleware
+        user = getattr(request, '_cached_user', None)
+    if user is None or not user.is_authenticated:
+        return None
+    return user.get_username()
+
+
+class RequestLogMiddleware:
+    """
+    Bind a request id (the X-Request-ID header or a new one) and the user
+    to the records logged while handling a request, and return the request
+    id in the response. Slow requests and server errors are logged.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        request_id = request.META.get(
+            'HTTP_' + REQUEST_ID_HEADER.upper().replace('-', '_'))
+        request_id = (request_id or uuid.uuid4().hex)[:64]
+        started = time.monotonic()
+        with log_context(request_id=request_id,
+                         user=lambda: request_user(request)):
+            response = self.get_response(request)
+            latency = round(time.monotonic() - started, 3)
+            extra = {'method': request.method, 'url': request.path,
+                     'status': response.status_code, 'latency': latency}
+            if response.status_code >= 500 or \
+                    latency >= settings.STRUCTURED_LOG['SLOW']:
+                LOGGER.warning("%s %s answered %s after %.3fs",
+                               request.method, request.path,
+                               response.status_code, latency, extra=extra)
+        response[REQUEST_ID_HEADER] = request_id
+        return response
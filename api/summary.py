@@ -0,0 +1,74 @@
+"""
+This module holds the precomputed fleet summary. The dashboard shows
+harvester counts, states and document totals of the whole fleet, but
+renders only one page of harvesters. The summary is computed from two
+cheap queries and the shared status snapshots (no harvester is called)
+and cached for a short time (settings.HCC_CACHE_TTL['SUMMARY']).
+"""
+from django.db.models import Count, Q
+
+from api import harvester_cache
+from api.constants import HCCJSONConstants as HCCJC
+from api.models import Harvester
+
+__author__ = "Jan Frömberg"
+__copyright__ = "Copyright 2018, GeRDI Project"
+__credits__ = ["Jan Frömberg"]
+__license__ = "Apache 2.0"
+__maintainer__ = "Jan Frömberg"
+__email__ = "jan.froemberg@tu-dresden.de"
+
+UNKNOWN = "unknown"
+
+
+def to_int(value):
+    """Return a document count as int, 0 if it is not available."""
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return 0
+
+
+def compute_summary():
+    """
+    Compute the fleet summary.
+
+    :return: a dictionary with the number of (enabled/disabled) harvesters,
+        the number of enabled harvesters by state and the sum of harvested
+        and of maximum documents
+    """
+    summary = Harvester.objects.aggregate(
+        num_harvesters=Count('id'),
+        num_enabled_harvesters=Count('id', filter=Q(enabled=True)))
+    summary['num_disabled_harvesters'] = (
+        summary['num_harvesters'] - summary['num_enabled_harvesters'])
+
+    harvesters = Harvester.objects.filter(enabled=True).only('name')
+    snapshots = harvester_cache.get_snapshots(harvesters)
+    states = {}
+    sum_harvested = 0
+    sum_max_docs = 0
+    for harvester in harvesters:
+        snapshot = snapshots.get(harvester.name)
+        feedback = harvester_cache.snapshot_feedback(harvester, snapshot)
+        if not isinstance(feedback, dict):
+            states[UNKNOWN] = states.get(UNKNOWN, 0) + 1
+            continue
+        state = str(feedback.get(HCCJC.STATUS, UNKNOWN)).lower()
+        states[state] = states.get(state, 0) + 1
+        sum_harvested += to_int(feedback.get(HCCJC.CACHED_DOCS))
+        sum_max_docs += to_int(feedback.get(HCCJC.MAX_DOCUMENTS))
+
+    summary['states'] = states
+    summary['sum_harvested'] = sum_harvested
+    summary['sum_maxdocs'] = sum_max_docs
+    return summary
+
+
+def get_summary():
+    """Return the cached fleet summary, compute it if there is none."""
+    summary = harvester_cache.get_summary()
+    if summary is None:
+        summary = compute_summary()
+        harvester_cache.set_summary(summary)
+    return summary
@@ -0,0 +1,86 @@
+"""
+Shared test doubles of the harvester api for the api test modules.
+"""
+from rest_framework import status
+from rest_framework.response import Response
+
+from api.constants import HCCJSONConstants as HCCJC
+
+__author__ = "Jan Frömberg"
+__copyright__ = "Copyright 2018, GeRDI Project"
+__credits__ = ["Jan Frömberg"]
+__license__ = "Apache 2.0"
+__maintainer__ = "Jan Frömberg"
+__email__ = "jan.froemberg@tu-dresden.de"
+
+
+class FakeHarvesterApi:
+    """
+    A harvester api stub answering every call without network access.
+    Its crontabs are kept in memory and schedule updates are recorded.
+    """
+
+    def __init__(self, harvester, crontabs=None):
+        self.harvester = harvester
+        self.crontabs = list(crontabs or [])
+        self.calls = []
+        # raised by update_schedules, e.g. of an unreachable harvester
+        self.error = None
+
+    def _response(self, data):
+        return Response({self.harvester.name: data}, status=status.HTTP_200_OK)
+
+    def harvester_status(self):
+        return self._response({HCCJC.STATUS: HCCJC.IDLE, HCCJC.HEALTH: HCCJC.OK,
+                               HCCJC.CACHED_DOCS: 1, HCCJC.MAX_DOCUMENTS: 2,
+                               HCCJC.CRONTAB: HCCJC.NO_CRONTAB})
+
+    def start_harvest(self):
+        return self._response({HCCJC.HEALTH: 'started'})
+
+    def stop_harvest(self):
+        return self._response({HCCJC.HEALTH: 'stopped'})
+
+    def reset_harvest(self):
+        return self._response({HCCJC.HEALTH: 'resetted'})
+
+    def harvester_log(self, date=None):
+        return self._response({HCCJC.LOGS: 'log'})
+
+    def harvester_progress(self):
+        return self._response({HCCJC.PROGRESS: 1})
+
+    def status_history(self):
+        return Response('history', status=status.HTTP_200_OK)
+
+    def api_infotext(self):
+        return self._response('info')
+
+    def add_schedule(self, crontab):
+        return self._response({HCCJC.HEALTH: {'message': 'ok'}})
+
+    def delete_schedule(self, crontab):
+        return self._response({HCCJC.HEALTH: 'deleted'})
+
+    def schedules(self):
+        return self._response({HCCJC.CRONTAB: list(self.crontabs)})
+
+    def update_schedules(self, add, delete):
+        self.calls.append((add, delete))
+        if self.error is not None:
+            raise self.error
+        return self._response({HCCJC.HEALTH: [], 'added': add,
+                               'deleted': delete})
+
+    def get_harvester_config_data(self):
+        return self._response({HCCJC.HEALTH: {}})
+
+
+class InitStub:
+    """An InitHarvester returning a given harvester api."""
+
+    def __init__(self, api):
+        self.api = api
+
+    def get_harvester_api(self):
+        return self.api
@@ -0,0 +1,126 @@
+"""
+Testing Module for admission.py
+"""
+import time
+from unittest.mock import patch
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from rest_framework import status
+from rest_framework.response import Response
+
+from api import admission, harvester_cache
+from api.models import AdmissionLock, Harvester, QueuedHarvest
+
+__author__ = "Jan Frömberg"
+__copyright__ = "Copyright 2018, GeRDI Project"
+__credits__ = ["Jan Frömberg"]
+__license__ = "Apache 2.0"
+__maintainer__ = "Jan Frömberg"
+__email__ = "jan.froemberg@tu-dresden.de"
+
+CONCURRENCY = {'MAX': 2, 'MAX_PER_OWNER': 0, 'START_GRACE': 120}
+
+
+@override_settings(HARVEST_CONCURRENCY=CONCURRENCY, HARVESTER_API_WORKERS=1)
+@patch('api.harvester_api.InitHarvester.__init__', return_value=None)
+@patch('api.harvester_api.InitHarvester.get_harvester_api')
+class AdmissionTestCase(TestCase):
+    """This class defines the test suite for the harvest admission queue."""
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create(username="AnyUser")
+        self.other = User.objects.create(username="OtherUser")
+        self.harvesters = [
+            Harvester.objects.create(
+                name='Harvester{}'.format(i), owner=self.user,
+                url='http://somewhere.url/v{}'.format(i), enabled=True)
+            for i in range(3)]
+        for harvester in self.harvesters:
+            self.set_state(harvester, 'idle', time.time() - 1)
+
+    @staticmethod
+    def set_state(harvester, state, now=None):
+        harvester_cache.set_snapshot(
+            harvester, {harvester.name: {'status': state}}, 200, now)
+
+    def start(self, get_api, harvesters):
+        get_api.return_value.start_harvest.return_value = Response(
+            {}, status=status.HTTP_200_OK)
+        return [response.status_code for _harvester, response
+                in admission.start_harvests(harvesters)]
+
+    @override_settings(HARVEST_CONCURRENCY=dict(CONCURRENCY, MAX=0))
+    def test_no_cap(self, get_api, _init):
+        self.assertEqual(self.start(get_api, self.harvesters), [200] * 3)
+        self.assertFalse(QueuedHarvest.objects.exists())
+
+    def test_starts_beyond_the_cap_are_queued(self, get_api, _init):
+        self.assertEqual(self.start(get_api, self.harvesters),
+                         [200, 200, 202])
+        self.assertEqual(get_api.return_value.start_harvest.call_count, 2)
+        self.assertEqual(
+            [entry.harvester for entry in QueuedHarvest.objects.all()],
+            [self.harvesters[2]])
+        # another start request is queued behind it
+        harvester = Harvester.objects.create(
+            name='Harvester3', owner=self.user, url='http://somewhere.url/v3',
+            enabled=True)
+        _harvester, response = admission.start_harvests([harvester])[0]
+        self.assertIn('position 2', response.data['Harvester3']['health'])
+
+    def test_queued_starts_are_released(self, get_api, _init):
+        self.start(get_api, self.harvesters)
+        # the started harvests are still running
+        self.assertEqual(admission.release(), [])
+        # one of them finished
+        self.set_state(self.harvesters[0], 'idle', time.time() + 1)
+        self.assertEqual([harvester for harvester, _response
+                          in admission.release()], [self.harvesters[2]])
+        self.assertFalse(QueuedHarvest.objects.exists())
+
+    def test_running_harvesters_count(self, get_api, _init):
+        self.set_state(self.harvesters[0], 'harvesting')
+        self.assertEqual(self.start(get_api, self.harvesters[1:]), [200, 202])
+
+    def test_unknown_states_count(self, get_api, _init):
+        harvester_cache.invalidate(self.harvesters[0], harvester_cache.SNAPSHOT)
+        self.assertEqual(self.start(get_api, self.harvesters[1:]), [200, 202])
+
+    def test_restarts_are_queued_until_the_state_is_known(self, get_api, _init):
+        self.assertEqual(self.start(get_api, self.harvesters[:1]), [200])
+        # a stop drops the snapshot
+        admission.dequeue(self.harvesters[:1])
+        harvester_cache.invalidate(self.harvesters[0], harvester_cache.SNAPSHOT)
+        self.assertEqual(self.start(get_api, self.harvesters[:1]), [202])
+        self.assertEqual(admission.release(), [])
+        # the poller saw it stopped
+        self.set_state(self.harvesters[0], 'idle')
+        self.assertEqual([harvester for harvester, _response
+                          in admission.release()], self.harvesters[:1])
+
+    @override_settings(HARVEST_CONCURRENCY=dict(CONCURRENCY, MAX=0,
+                                                MAX_PER_OWNER=1))
+    def test_cap_per_owner(self, get_api, _init):
+        harvester = Harvester.objects.create(
+            name='Other', owner=self.other, url='http://somewhere.url/other',
+            enabled=True)
+        self.set_state(harvester, 'idle', time.time() - 1)
+        self.assertEqual(self.start(get_api, self.harvesters[:2] + [harvester]),
+                         [200, 202, 200])
+
+    def test_admissions_lock_a_database_row(self, _get_api, _init):
+        for _ in range(2):
+            with admission.admission_lock():
+                pass
+        lock = AdmissionLock.objects.get()
+        self.assertIsNotNone(lock.acquired)
+
+    def test_stopped_harvests_are_dequeued(self, get_api, _init):
+        self.start(get_api, self.harvesters)
+        admission.dequeue(self.harvesters)
+        self.assertFalse(QueuedHarvest.objects.exists())
+        # the stopped harvests no longer occupy their slots
+        self.assertEqual(admission.running_harvesters(), ({}, {}))
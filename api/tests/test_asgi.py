@@ -0,0 +1,64 @@
+"""
+Testing Module for hcc_py/asgi.py
+"""
+import asyncio
+import threading
+
+from asgiref.testing import ApplicationCommunicator
+from django.http import HttpResponse
+from django.test import SimpleTestCase, override_settings
+from django.urls import path
+
+from hcc_py.asgi import application
+
+__author__ = "Jan Frömberg"
+__copyright__ = "Copyright 2018, GeRDI Project"
+__credits__ = ["Jan Frömberg"]
+__license__ = "Apache 2.0"
+__maintainer__ = "Jan Frömberg"
+__email__ = "jan.froemberg@tu-dresden.de"
+
+CONCURRENT_REQUESTS = 2
+BARRIER = threading.Barrier(CONCURRENT_REQUESTS, timeout=5)
+
+
+def meeting_view(request):
+    """Answer once all concurrent requests are inside a view."""
+    BARRIER.wait()
+    return HttpResponse('met')
+
+
+urlpatterns = [
+    path('meet/', meeting_view),
+]
+
+
+async def get(url):
+    """Send a GET request to the ASGI application and return its status."""
+    communicator = ApplicationCommunicator(application, {
+        'type': 'http', 'method': 'GET', 'path': url, 'root_path': '',
+        'query_string': b'', 'headers': [(b'host', b'localhost')]})
+    await communicator.send_input({'type': 'http.request'})
+    start = await communicator.receive_output(10)
+    await communicator.receive_output(10)
+    await communicator.wait()
+    return start['status']
+
+
+async def get_concurrently(url, count):
+    """Send count GET requests at once and return their statuses."""
+    return await asyncio.gather(*[get(url) for _ in range(count)])
+
+
+@override_settings(ROOT_URLCONF='api.tests.test_asgi')
+class AsgiApplicationTestCase(SimpleTestCase):
+    """This class defines the test suite for the ASGI application."""
+
+    def setUp(self):
+        BARRIER.reset()
+
+    def test_sync_views_run_concurrently(self):
+        # a single thread for all sync views (asgiref>=3.3 with Django 3.0)
+        # breaks the barrier and answers 500
+        statuses = asyncio.run(get_concurrently('/meet/', CONCURRENT_REQUESTS))
+        self.assertEqual(statuses, [200] * CONCURRENT_REQUESTS)
@@ -0,0 +1,98 @@
+"""
+Testing Module for authentication.py
+"""
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.urls import include, path, reverse
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework.test import APITestCase, URLPatternsTestCase
+
+from api import authentication
+from api.authentication import CachedTokenAuthentication, LocalTokenCache
+
+__author__ = "Jan Frömberg"
+__copyright__ = "Copyright 2018, GeRDI Project"
+__credits__ = ["Jan Frömberg"]
+__license__ = "Apache 2.0"
+__maintainer__ = "Jan Frömberg"
+__email__ = "jan.froemberg@tu-dresden.de"
+
+
+class LocalTokenCacheTestCase(APITestCase):
+    """This class defines the test suite for the in-process token LRU."""
+
+    def test_least_recently_used_tokens_are_evicted(self):
+        local = LocalTokenCache(max_size=2, ttl=60)
+        local.set('a', 1)
+        local.set('b', 2)
+        local.get('a')
+        local.set('c', 3)
+        self.assertEqual((local.get('a'), local.get('b'), local.get('c')),
+                         (1, None, 3))
+
+    def test_entries_expire(self):
+        local = LocalTokenCache(max_size=2, ttl=0)
+        local.set('a', 1)
+        self.assertIsNone(local.get('a'))
+        self.assertEqual(len(local), 0)
+
+
+class CachedTokenAuthenticationTestCase(APITestCase, URLPatternsTestCase):
+    """This class defines the test suite for the cached token authentication."""
+    urlpatterns = [
+        path('', include('hcc_py.urls')),
+    ]
+
+    def setUp(self):
+        cache.clear()
+        authentication.LOCAL_CACHE.clear()
+        self.user = User.objects.create(username="Prometheus")
+        self.token = Token.objects.get(user=self.user)
+        self.auth = CachedTokenAuthentication()
+
+    def test_users_are_looked_up_once(self):
+        with self.assertNumQueries(1):
+            user, token = self.auth.authenticate_credentials(self.token.key)
+        self.assertEqual((user, token), (self.user, self.token))
+        with self.assertNumQueries(0):
+            self.auth.authenticate_credentials(self.token.key)
+        # another process only has the user id in the shared cache
+        authentication.LOCAL_CACHE.clear()
+        with self.assertNumQueries(1):
+            user, token = self.auth.authenticate_credentials(self.token.key)
+        self.assertEqual((user, token), (self.user, self.token))
+
+    def test_no_secrets_are_shared(self):
+        self.auth.authenticate_credentials(self.token.key)
+        shared = cache.get(authentication.cache_key(self.token.key))
+        self.assertEqual(shared, (self.user.pk, True))
+
+    def test_unknown_tokens_fail(self):
+        with self.assertRaises(AuthenticationFailed):
+            self.auth.authenticate_credentials('unknown')
+        self.assertEqual(len(authentication.LOCAL_CACHE), 0)
+
+    def test_deleted_tokens_are_dropped(self):
+        key = self.token.key
+        self.auth.authenticate_credentials(key)
+        self.token.delete()
+        with self.assertRaises(AuthenticationFailed):
+            self.auth.authenticate_credentials(key)
+
+    def test_deactivated_users_are_dropped(self):
+        self.auth.authenticate_credentials(self.token.key)
+        self.user.is_active = False
+        self.user.save()
+        with self.assertRaises(AuthenticationFailed):
+            self.auth.authenticate_credentials(self.token.key)
+
+    def test_api_calls_are_authenticated(self):
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + self.token.key)
+        url = reverse('v1:create')
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_200_OK)
+        with self.assertNumQueries(1):
+            # the harvesters, no token lookup
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
@@ -0,0 +1,130 @@
+"""
+Testing Module for bulk_config.py
+"""
+from unittest.mock import MagicMock, patch
+
+import requests
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import SimpleTestCase, override_settings
+from django.urls import include, path, reverse
+from rest_framework import status
+from rest_framework.response import Response
+from rest_framework.test import APIClient, APITestCase, URLPatternsTestCase
+
+from api import harvester_cache
+from api.bulk_config import SOME_ISSUES, config_status
+from api.models import Harvester
+from api.tests.helpers import InitStub
+
+__author__ = "Jan Frömberg"
+__copyright__ = "Copyright 2018, GeRDI Project"
+__credits__ = ["Jan Frömberg"]
+__license__ = "Apache 2.0"
+__maintainer__ = "Jan Frömberg"
+__email__ = "jan.froemberg@tu-dresden.de"
+
+PARTIAL = ("Set parameter 'harvester.batchSize' to '100'. "
+           "Cannot change value of 'harvester.url' while harvesting.")
+CONFIG = {'harvester': {'parameters': [
+    {'type': 'IntegerParameter', 'key': 'batchSize', 'value': 10},
+    {'type': 'StringParameter', 'key': 'url', 'value': 'http://a.org'},
+]}}
+
+
+class ConfigStatusTestCase(SimpleTestCase):
+    """This class defines the test suite for config push outcomes."""
+
+    def test_outcomes(self):
+        self.assertEqual(config_status({'status': 'OK', 'message': 'done'}),
+                         ('OK', 'done'))
+        self.assertEqual(config_status({'status': 'OK', 'message': PARTIAL}),
+                         (SOME_ISSUES, PARTIAL))
+        self.assertEqual(config_status('unable do set configuration data'),
+                         ('failed', 'unable do set configuration data'))
+
+
+@override_settings(HARVESTER_API_WORKERS=1)
+class BulkConfigViewTestCase(APITestCase, URLPatternsTestCase):
+    """This class defines the test suite for the bulk config api."""
+    urlpatterns = [
+        path('', include('hcc_py.urls')),
+    ]
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create(username="ChuckNorris")
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+        self.apis = {}
+        for name, version, message in (('Harvester1', 7, 'done'),
+                                       ('Harvester2', 7, PARTIAL),
+                                       ('Harvester3', 'not supported', '')):
+            harvester = Harvester.objects.create(
+                name=name, owner=self.user, enabled=True,
+                url='http://somewhere.url/{}'.format(name))
+            harvester_cache.set_version(harvester, version)
+            api = MagicMock()
+            api.get_harvester_config_data.return_value = Response(
+                {name: {'health': CONFIG}}, status=status.HTTP_200_OK)
+            api.save_harvester_config_data.return_value = Response(
+                {name: {'health': {'status': 'OK', 'message': message}}},
+                status=status.HTTP_200_OK)
+            self.apis[name] = api
+        init = patch('api.harvester_api.InitHarvester',
+                     side_effect=lambda harvester: InitStub(
+                         self.apis[harvester.name]))
+        init.start()
+        self.addCleanup(init.stop)
+
+    def post(self, data):
+        return self.client.post(reverse('v1:bulk-config'), data, format='json')
+
+    def test_push_by_filter(self):
+        response = self.post({
+            'changes': {'harvester.batchSize': '100', 'harvester.other': '1'},
+            'filter': {'name__startswith': 'Harvester'}})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['Harvester1']['status'], 'OK')
+        self.assertEqual(response.data['Harvester1']['unknown'],
+                         ['harvester.other'])
+        self.assertEqual(response.data['Harvester2']['status'], SOME_ISSUES)
+        self.assertEqual(response.data['Harvester3']['status'], 'incompatible')
+        self.apis['Harvester1'].save_harvester_config_data.assert_called_once_with(
+            {'harvester.batchSize': '100'})
+        self.apis['Harvester3'].save_harvester_config_data.assert_not_called()
+
+    def test_push_by_name(self):
+        response = self.post({'changes': {'harvester.other': '1'},
+                              'names': ['Harvester1', 'Unknown']})
+        self.assertEqual(sorted(response.data), ['Harvester1', 'Unknown'])
+        self.assertEqual(response.data['Harvester1']['status'], 'unchanged')
+        self.assertEqual(response.data['Unknown']['status'], 'failed')
+
+    def test_unreachable_harvesters_fail_alone(self):
+        self.apis['Harvester1'].get_harvester_config_data.side_effect = \
+            requests.ConnectionError('unreachable')
+        self.apis['Harvester2'].save_harvester_config_data.side_effect = \
+            ValueError('no JSON')
+        response = self.post({'changes': {'harvester.batchSize': '100'},
+                              'names': ['Harvester1', 'Harvester2']})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['Harvester1'],
+                         {'status': 'failed', 'error': 'unreachable'})
+        self.assertEqual(response.data['Harvester2'],
+                         {'status': 'failed', 'error': 'no JSON'})
+
+    def test_unknown_filters_are_rejected(self):
+        response = self.post({'changes': {'harvester.batchSize': '100'},
+                              'filter': {'url': 'somewhere.url'}})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        for api in self.apis.values():
+            api.save_harvester_config_data.assert_not_called()
+
+    def test_invalid_requests(self):
+        self.assertEqual(self.post({'changes': {'batchSize': '1'},
+                                    'names': ['Harvester1']}).status_code,
+                         status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.post({'changes': {'harvester.batchSize': '1'}}
+                                   ).status_code,
+                         status.HTTP_400_BAD_REQUEST)
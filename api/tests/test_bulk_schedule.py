@@ -0,0 +1,133 @@
+"""
+Testing Module for bulk_schedule.py
+"""
+from unittest.mock import MagicMock, patch
+
+import requests
+from django.contrib.auth.models import User
+from django.test import SimpleTestCase, override_settings
+from django.urls import include, path, reverse
+from rest_framework import status
+from rest_framework.response import Response
+from rest_framework.test import APIClient, APITestCase, URLPatternsTestCase
+
+from api.bulk_schedule import schedule_diff
+from api.harvester_api_strategy import HarvesterApiStrategy
+from api.models import Harvester
+from api.tests.helpers import FakeHarvesterApi, InitStub
+
+__author__ = "Jan Frömberg"
+__copyright__ = "Copyright 2018, GeRDI Project"
+__credits__ = ["Jan Frömberg"]
+__license__ = "Apache 2.0"
+__maintainer__ = "Jan Frömberg"
+__email__ = "jan.froemberg@tu-dresden.de"
+
+MIDNIGHT = '0 0 * * *'
+NOON = '0 12 * * *'
+EVENING = '0 18 * * *'
+
+
+class ScheduleDiffTestCase(SimpleTestCase):
+    """This class defines the test suite for the schedule diff."""
+
+    def test_minimal_diff(self):
+        self.assertEqual(schedule_diff([MIDNIGHT, NOON], [NOON, EVENING, EVENING]),
+                         ([EVENING], [MIDNIGHT]))
+        self.assertEqual(schedule_diff([NOON], [NOON]), ([], []))
+        self.assertEqual(schedule_diff([MIDNIGHT], []), ([], [MIDNIGHT]))
+
+
+class UpdateSchedulesTestCase(SimpleTestCase):
+    """This class defines the test suite for updating several crontabs."""
+
+    def test_partial_failures_are_reported(self):
+        harvester = Harvester(name='Harvester1', url='http://somewhere.url/v1')
+        strategy = MagicMock()
+        strategy.post_delete_harvester_schedule.return_value = Response(
+            {'Harvester1': {'health': 'deleted'}}, status=status.HTTP_200_OK)
+        strategy.post_add_harvester_schedule.return_value = Response(
+            {'Harvester1': {'health': 'invalid'}},
+            status=status.HTTP_400_BAD_REQUEST)
+        with patch('api.harvester_api_strategy.harvester_cache.invalidate'):
+            response = HarvesterApiStrategy(harvester, strategy).update_schedules(
+                [NOON], [MIDNIGHT])
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data['Harvester1'], {
+            'health': ['deleted', 'invalid'], 'added': [],
+            'deleted': [MIDNIGHT]})
+
+
+@override_settings(HARVESTER_API_WORKERS=1)
+class BulkScheduleViewTestCase(APITestCase, URLPatternsTestCase):
+    """This class defines the test suite for the bulk schedule api."""
+    urlpatterns = [
+        path('', include('hcc_py.urls')),
+    ]
+
+    def setUp(self):
+        self.user = User.objects.create(username="ChuckNorris")
+        other = User.objects.create(username="Other")
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+        self.apis = {}
+        for i in range(3):
+            harvester = Harvester.objects.create(
+                name='Harvester{}'.format(i), owner=self.user,
+                url='http://somewhere.url/v{}'.format(i), enabled=True)
+            self.apis[harvester.name] = FakeHarvesterApi(harvester, [MIDNIGHT])
+        Harvester.objects.create(name='Foreign', owner=other,
+                                 url='http://somewhere.url/foreign', enabled=True)
+        init = patch('api.harvester_api.InitHarvester',
+                     side_effect=lambda harvester: InitStub(self.apis[harvester.name]))
+        init.start()
+        self.addCleanup(init.stop)
+
+    def post(self, data):
+        return self.client.post(reverse('v1:bulk-schedule'), data, format='json')
+
+    def test_schedules_by_name(self):
+        response = self.post({'schedules': {
+            'Harvester0': [MIDNIGHT, NOON], 'Harvester1': [MIDNIGHT],
+            'Foreign': [NOON]}})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['Harvester0']['status'], 'updated')
+        self.assertEqual(self.apis['Harvester0'].calls, [([NOON], [])])
+        self.assertEqual(response.data['Harvester1']['status'], 'unchanged')
+        self.assertEqual(self.apis['Harvester1'].calls, [])
+        self.assertEqual(response.data['Foreign']['status'], 'failed')
+        self.assertNotIn('Harvester2', response.data)
+
+    def test_crontabs_by_filter(self):
+        response = self.post({'crontabs': [NOON],
+                              'filter': {'name__startswith': 'Harvester'}})
+        self.assertEqual(sorted(response.data), ['Harvester0', 'Harvester1',
+                                                 'Harvester2'])
+        for api in self.apis.values():
+            self.assertEqual(api.calls, [([NOON], [MIDNIGHT])])
+
+    def test_unreachable_harvesters_fail_alone(self):
+        self.apis['Harvester1'].error = requests.ConnectionError('unreachable')
+        response = self.post({'crontabs': [NOON],
+                              'filter': {'name__startswith': 'Harvester'}})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['Harvester1'],
+                         {'status': 'failed', 'error': 'unreachable'})
+        self.assertEqual(response.data['Harvester0']['status'], 'updated')
+        self.assertEqual(response.data['Harvester2']['status'], 'updated')
+
+    def test_invalid_requests(self):
+        self.assertEqual(self.post({}).status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.post({'crontabs': ['every day']}).status_code,
+                         status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.post({'schedules': {}, 'crontabs': []}).status_code,
+                         status.HTTP_400_BAD_REQUEST)
+
+    def test_crontabs_require_a_known_filter(self):
+        for data in ({'crontabs': [NOON]},
+                     {'crontabs': [NOON], 'filter': {}},
+                     {'crontabs': [NOON], 'filter': {'name': 'Harvester0'}}):
+            response = self.post(data)
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        for api in self.apis.values():
+            self.assertEqual(api.calls, [])
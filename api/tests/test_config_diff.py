@@ -0,0 +1,133 @@
+"""
+Testing Module for config_diff.py
+"""
+from unittest.mock import patch
+
+import requests
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import SimpleTestCase, override_settings
+from django.urls import include, path, reverse
+from rest_framework import status
+from rest_framework.response import Response
+from rest_framework.test import APIClient, APITestCase, URLPatternsTestCase
+
+from api import harvester_cache
+from api.config_diff import differences, flatten
+from api.models import Harvester
+
+__author__ = "Jan Frömberg"
+__copyright__ = "Copyright 2018, GeRDI Project"
+__credits__ = ["Jan Frömberg"]
+__license__ = "Apache 2.0"
+__maintainer__ = "Jan Frömberg"
+__email__ = "jan.froemberg@tu-dresden.de"
+
+
+def config_data(rate, password='secret', extra=None):
+    """Return configuration data as served by a harvester."""
+    parameters = [
+        {'type': 'IntegerParameter', 'key': 'rate', 'value': rate},
+        {'type': 'StringParameter', 'key': 'url', 'value': 'http://a.org'},
+        {'type': 'PasswordParameter', 'key': 'password', 'value': password},
+    ]
+    data = {'harvester': {'parameters': parameters}}
+    if extra:
+        data['extra'] = {'parameters': [
+            {'type': 'BooleanParameter', 'key': extra}]}
+    return data
+
+
+class FlattenTestCase(SimpleTestCase):
+    """This class defines the test suite for flattening configs."""
+
+    def test_section_keys_and_masked_passwords(self):
+        config = flatten(config_data(10, extra='dry'))
+        self.assertEqual(config['harvester.rate'], 10)
+        self.assertEqual(config['extra.dry'], False)
+        self.assertTrue(config['harvester.password'].startswith('secret:'))
+        self.assertNotIn('secret', config['harvester.password'][7:])
+        self.assertEqual(config['harvester.password'],
+                         flatten(config_data(5))['harvester.password'])
+
+    def test_only_differing_parameters(self):
+        matrix = differences({
+            'Harvester1': flatten(config_data(10)),
+            'Harvester2': flatten(config_data(20, password='other',
+                                              extra='dry')),
+            'Harvester3': flatten(config_data(10)),
+        })
+        self.assertEqual(list(matrix), ['extra.dry', 'harvester.password',
+                                        'harvester.rate'])
+        self.assertEqual(matrix['harvester.rate'],
+                         {'Harvester1': 10, 'Harvester2': 20, 'Harvester3': 10})
+        self.assertIsNone(matrix['extra.dry']['Harvester1'])
+
+
+@override_settings(HARVESTER_API_WORKERS=1)
+@patch('api.harvester_api.InitHarvester.__init__', return_value=None)
+@patch('api.harvester_api.InitHarvester.get_harvester_api')
+class ConfigDiffViewTestCase(APITestCase, URLPatternsTestCase):
+    """This class defines the test suite for the config diff views."""
+    urlpatterns = [
+        path('', include('hcc_py.urls')),
+    ]
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create(username="ChuckNorris")
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+        self.harvester1 = Harvester.objects.create(
+            name='Harvester1', owner=self.user, url='http://somewhere.url/v1',
+            enabled=True)
+        self.harvester2 = Harvester.objects.create(
+            name='Harvester2', owner=self.user, url='http://somewhere.url/v2',
+            enabled=True)
+
+    def test_api_fetches_and_caches_configs(self, get_api, _init):
+        harvester_cache.set_flat_config(self.harvester1,
+                                        flatten(config_data(10)))
+        get_api.return_value.get_harvester_config_data.return_value = Response(
+            {'Harvester2': {'health': config_data(20)}},
+            status=status.HTTP_200_OK)
+        response = self.client.get(reverse('v1:config-diff'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['harvesters'],
+                         ['Harvester1', 'Harvester2'])
+        self.assertEqual(list(response.data['differences']), ['harvester.rate'])
+        get_api.return_value.get_harvester_config_data.assert_called_once_with(
+            cached=False)
+        self.assertIn('Harvester2',
+                      harvester_cache.get_flat_configs([self.harvester2]))
+
+    def test_failed_harvesters_are_reported(self, get_api, _init):
+        get_api.return_value.get_harvester_config_data.return_value = Response(
+            {'Harvester1': {'health': 'unable to get configuration data'}},
+            status=status.HTTP_404_NOT_FOUND)
+        response = self.client.get(reverse('v1:config-diff'),
+                                   {'names': 'Harvester1'})
+        self.assertEqual(response.data['harvesters'], [])
+        self.assertEqual(response.data['errors'],
+                         {'Harvester1': 'unable to get configuration data'})
+
+    def test_unreachable_harvesters_are_reported(self, get_api, _init):
+        get_api.return_value.get_harvester_config_data.side_effect = [
+            Response({'Harvester1': {'health': config_data(10)}},
+                     status=status.HTTP_200_OK),
+            requests.ConnectionError('unreachable')]
+        response = self.client.get(reverse('v1:config-diff'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['harvesters'], ['Harvester1'])
+        self.assertEqual(response.data['errors'], {'Harvester2': 'unreachable'})
+
+    def test_page(self, get_api, _init):
+        for harvester, rate in ((self.harvester1, 10), (self.harvester2, 20)):
+            harvester_cache.set_flat_config(harvester,
+                                            flatten(config_data(rate)))
+        self.client.force_login(self.user)
+        response = self.client.get(reverse('config-diff'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertContains(response, 'harvester.rate')
+        self.assertNotContains(response, 'harvester.url')
+        get_api.assert_not_called()
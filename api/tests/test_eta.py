@@ -0,0 +1,115 @@
+"""
+Testing Module for eta.py
+"""
+import json
+from unittest.mock import Mock, patch
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from rest_framework import status
+
+from api import eta
+from api.harvester_api_strategy import VersionBased7Strategy
+from api.models import Harvester, HarvestRun
+
+__author__ = "Jan Frömberg"
+__copyright__ = "Copyright 2018, GeRDI Project"
+__credits__ = ["Jan Frömberg"]
+__license__ = "Apache 2.0"
+__maintainer__ = "Jan Frömberg"
+__email__ = "jan.froemberg@tu-dresden.de"
+
+CONF = {'ALPHA': 0.5, 'MIN_INTERVAL': 2, 'TTL': 60}
+NOW = 1566907200
+
+
+@override_settings(HARVEST_ETA=CONF)
+class EtaTestCase(TestCase):
+    """This class defines the test suite for the harvest ETA estimator."""
+
+    def setUp(self):
+        cache.clear()
+        user = User.objects.create(username="AnyUser")
+        self.harvester = Harvester.objects.create(
+            name="Harvester1", owner=user, url='http://somewhere.url/v1',
+            enabled=True)
+
+    def test_rate_is_smoothed(self):
+        result = eta.estimate(self.harvester, 'harvesting', 0, 1000, NOW)
+        self.assertEqual(result[eta.STARTED], NOW)
+        self.assertIsNone(result[eta.ETA])
+        # 10 docs/s
+        result = eta.estimate(self.harvester, 'harvesting', 100, 1000, NOW + 10)
+        self.assertEqual(result[eta.RATE], 10)
+        self.assertEqual(result[eta.ETA], 90)
+        # 30 docs/s, smoothed
+        result = eta.estimate(self.harvester, 'harvesting', 400, 1000, NOW + 20)
+        self.assertEqual(result[eta.RATE], 20)
+        self.assertEqual(result[eta.ETA], 30)
+        # too close to the last sample
+        result = eta.estimate(self.harvester, 'harvesting', 500, 1000, NOW + 21)
+        self.assertEqual(result[eta.RATE], 20)
+        self.assertEqual(result[eta.ETA], 25)
+
+    def test_past_runs_are_the_prior(self):
+        HarvestRun.objects.create(harvester=self.harvester, started=0,
+                                  ended=100000, duration=100, documents=500)
+        result = eta.estimate(self.harvester, 'harvesting', 0, 1000, NOW)
+        self.assertEqual(result[eta.RATE], 5)
+        self.assertEqual(result[eta.ETA], 200)
+
+    def test_queued_harvest(self):
+        result = eta.estimate(self.harvester, 'queued', 0, None, NOW)
+        self.assertEqual((result[eta.QUEUED], result[eta.STARTED]), (NOW, None))
+        result = eta.estimate(self.harvester, 'harvesting', 0, None, NOW + 5)
+        self.assertEqual((result[eta.QUEUED], result[eta.STARTED]),
+                         (NOW, NOW + 5))
+
+    def test_a_new_harvest_resets_the_samples(self):
+        eta.estimate(self.harvester, 'harvesting', 0, 1000, NOW)
+        eta.estimate(self.harvester, 'harvesting', 500, 1000, NOW + 10)
+        result = eta.estimate(self.harvester, 'harvesting', 10, 1000, NOW + 20)
+        self.assertEqual(result[eta.STARTED], NOW + 20)
+        self.assertIsNone(result[eta.RATE])
+
+    def test_a_finished_harvest_resets_the_samples(self):
+        eta.estimate(self.harvester, 'harvesting', 0, 1000, NOW)
+        eta.estimate(self.harvester, 'harvesting', 500, 1000, NOW + 10)
+        result = eta.estimate(self.harvester, 'idle', 1000, 1000, NOW + 20)
+        self.assertEqual((result[eta.STARTED], result[eta.ETA]), (None, 0))
+        # the next harvest got further than the last one, before it was seen
+        result = eta.estimate(self.harvester, 'harvesting', 600, 1000, NOW + 30)
+        self.assertEqual(result[eta.STARTED], NOW + 30)
+
+    def test_the_start_is_taken_from_the_current_run(self):
+        run = HarvestRun(harvester=self.harvester, queued=(NOW - 60) * 1000,
+                         started=(NOW - 30) * 1000)
+        current_run = Mock(return_value=run)
+        result = eta.estimate(self.harvester, 'harvesting', 300, 1000, NOW,
+                              current_run=current_run)
+        self.assertEqual(result[eta.STARTED], NOW - 30)
+        eta.estimate(self.harvester, 'harvesting', 400, 1000, NOW + 10,
+                     current_run=current_run)
+        # once per harvest
+        current_run.assert_called_once_with()
+
+    @patch('api.single_flight.requests.get')
+    def test_progress_asks_the_state_history_once(self, get):
+        progress = Mock(status_code=status.HTTP_200_OK, text=json.dumps({
+            'state': 'HARVESTING', 'harvestedCount': 10,
+            'maxDocumentCount': 100}))
+        etls = Mock(status_code=status.HTTP_200_OK, text=json.dumps({
+            'overallInfo': {'stateHistory': [
+                {'timestamp': (NOW - 30) * 1000, 'value': 'HARVESTING'}]}}))
+        get.side_effect = [progress, etls, progress]
+        strategy = VersionBased7Strategy()
+        response = strategy.get_harvester_progress(self.harvester)
+        feedback = response.data[self.harvester.name]
+        self.assertEqual(feedback['lastHarvestDate'], (NOW - 30) * 1000)
+        self.assertIsNone(feedback['harvestRate'])
+        strategy.get_harvester_progress(self.harvester)
+        self.assertEqual([call[0][0] for call in get.call_args_list],
+                         [self.harvester.url + '/',
+                          self.harvester.url + '/etls',
+                          self.harvester.url + '/'])
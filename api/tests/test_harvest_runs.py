@@ -0,0 +1,91 @@
+"""
+Testing Module for harvest_runs.py
+"""
+import json
+from unittest.mock import MagicMock, patch
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+from rest_framework import status
+
+from api.harvest_runs import ingest, throughput
+from api.harvester_api_strategy import VersionBased7Strategy
+from api.models import Harvester, HarvestRun
+
+__author__ = "Jan Frömberg"
+__copyright__ = "Copyright 2018, GeRDI Project"
+__credits__ = ["Jan Frömberg"]
+__license__ = "Apache 2.0"
+__maintainer__ = "Jan Frömberg"
+__email__ = "jan.froemberg@tu-dresden.de"
+
+
+def etls(history, harvested_count=None):
+    """Return a /etls response with a state history of (timestamp, state)."""
+    info = {"stateHistory": [{"timestamp": timestamp, "value": value}
+                             for timestamp, value in history]}
+    if harvested_count is not None:
+        info["harvestedCount"] = harvested_count
+    return {"overallInfo": info}
+
+
+HISTORY = [(1000, "IDLE"), (2000, "QUEUED"), (3000, "HARVESTING"),
+           (13000, "IDLE"), (20000, "HARVESTING")]
+
+
+class HarvestRunTestCase(TestCase):
+    """This class defines the test suite for the harvest run history."""
+
+    def setUp(self):
+        user = User.objects.create(username="AnyUser")
+        self.harvester = Harvester.objects.create(
+            name="Harvester1", owner=user, url='http://somewhere.url/v1',
+            enabled=True)
+
+    def test_runs_from_state_history(self):
+        ingest(self.harvester, etls(HISTORY, 50))
+        first, current = HarvestRun.objects.filter(harvester=self.harvester)
+        self.assertEqual((first.queued, first.started, first.ended),
+                         (2000, 3000, 13000))
+        self.assertEqual(first.final_state, "idle")
+        self.assertEqual(first.duration, 10)
+        self.assertIsNone(first.documents)
+        self.assertEqual((current.started, current.ended), (20000, None))
+        self.assertEqual(current.documents, 50)
+
+    def test_only_new_transitions_are_ingested(self):
+        ingest(self.harvester, etls(HISTORY))
+        self.assertEqual(ingest(self.harvester, etls(HISTORY)), [])
+        changed = ingest(self.harvester, etls(
+            HISTORY + [(30000, "IDLE"), (31000, "QUEUED")], 100))
+        self.assertEqual(len(changed), 2)
+        self.assertEqual(HarvestRun.objects.count(), 3)
+        finished = HarvestRun.objects.get(started=20000)
+        self.assertEqual((finished.ended, finished.duration), (30000, 10))
+        # the harvested count belongs to the latest run
+        self.assertIsNone(finished.documents)
+        self.assertEqual(HarvestRun.objects.get(queued=31000).documents, 100)
+
+    def test_concurrently_recorded_runs_are_not_duplicated(self):
+        ingest(self.harvester, etls(HISTORY))
+        # another ingest read the history before the runs were recorded
+        with patch('api.harvest_runs.HarvestRun.objects.filter') as runs:
+            runs.return_value.order_by.return_value.first.return_value = None
+            self.assertEqual(ingest(self.harvester, etls(HISTORY)), [])
+        self.assertEqual(HarvestRun.objects.count(), 2)
+
+    @patch('api.harvest_runs.ingest', side_effect=KeyError('timestamp'))
+    @patch('api.harvester_api_strategy.single_flight.get')
+    def test_failed_ingests_keep_the_history(self, get, _ingest):
+        get.return_value = MagicMock(status_code=status.HTTP_200_OK,
+                                     text=json.dumps(etls(HISTORY)))
+        response = VersionBased7Strategy().get_status_history(self.harvester)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn('harvesting', response.data)
+
+    def test_throughput(self):
+        self.assertIsNone(throughput(self.harvester))
+        ingest(self.harvester, etls(HISTORY[:4], 50))
+        ingest(self.harvester, etls(HISTORY + [(25000, "IDLE")], 100))
+        self.assertEqual(throughput(self.harvester), 12.5)
+        self.assertEqual(HarvestRun.objects.last().throughput, 20)
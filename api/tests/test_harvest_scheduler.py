@@ -0,0 +1,137 @@
+"""
+Testing Module for harvest_scheduler.py
+"""
+import datetime
+from unittest.mock import patch
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.response import Response
+
+from api import harvester_cache
+from api.constants import HCCJSONConstants as HCCJC
+from api.harvest_scheduler import HarvestScheduler, start_times, window_start
+from api.models import Harvester, ScheduledHarvest
+
+__author__ = "Jan Frömberg"
+__copyright__ = "Copyright 2018, GeRDI Project"
+__credits__ = ["Jan Frömberg"]
+__license__ = "Apache 2.0"
+__maintainer__ = "Jan Frömberg"
+__email__ = "jan.froemberg@tu-dresden.de"
+
+SCHEDULE = {'ENABLED': True, 'START': '22:00', 'WINDOW': 4 * 60 * 60,
+            'JITTER': 60}
+DAY = datetime.date(2019, 8, 27)
+
+
+@override_settings(HARVEST_SCHEDULE=SCHEDULE)
+class StartTimesTestCase(SimpleTestCase):
+    """This class defines the test suite for the staggered start times."""
+
+    def test_starts_are_within_the_window(self):
+        names = ['Harvester{}'.format(i) for i in range(8)]
+        start = window_start(DAY)
+        for start_time in start_times(names, DAY).values():
+            offset = (start_time - start).total_seconds()
+            self.assertGreaterEqual(offset, 0)
+            self.assertLess(offset, SCHEDULE['WINDOW'])
+
+    def test_other_harvesters_do_not_move_a_start(self):
+        times = start_times(['Harvester1', 'Harvester2'], DAY)
+        self.assertEqual(start_times(['Harvester1'], DAY)['Harvester1'],
+                         times['Harvester1'])
+
+    def test_start_times_are_stable(self):
+        names = ['Harvester1', 'Harvester2']
+        self.assertEqual(start_times(names, DAY), start_times(names, DAY))
+        self.assertNotEqual(start_times(names, DAY)['Harvester1'],
+                            start_times(names, DAY + datetime.timedelta(1))[
+                                'Harvester1'])
+
+
+@override_settings(HARVEST_SCHEDULE=SCHEDULE, HARVESTER_API_WORKERS=1)
+@patch('api.harvester_api.InitHarvester.__init__', return_value=None)
+@patch('api.harvester_api.InitHarvester.get_harvester_api')
+class HarvestSchedulerTestCase(TestCase):
+    """This class defines the test suite for the central harvest scheduler."""
+
+    def setUp(self):
+        cache.clear()
+        user = User.objects.create(username="AnyUser")
+        for i in range(2):
+            Harvester.objects.create(
+                name='Harvester{}'.format(i), owner=user,
+                url='http://somewhere.url/v{}'.format(i), enabled=True)
+        Harvester.objects.create(name='Disabled', owner=user,
+                                 url='http://somewhere.url/disabled')
+        self.harvesters = list(Harvester.objects.filter(enabled=True))
+        for harvester in self.harvesters:
+            self.set_crontab(harvester, HCCJC.NO_CRONTAB)
+        self.times = start_times(['Harvester0', 'Harvester1'], DAY)
+        # the names in the order of their start times
+        self.order = sorted(self.times, key=self.times.get)
+
+    @staticmethod
+    def set_crontab(harvester, crontab):
+        harvester_cache.set_snapshot(
+            harvester, {harvester.name: {HCCJC.STATUS: 'idle',
+                                         HCCJC.CRONTAB: crontab}},
+            status.HTTP_200_OK)
+
+    def started(self, get_api, now):
+        get_api.return_value.start_harvest.return_value = Response(
+            {}, status=status.HTTP_200_OK)
+        return [harvester.name for harvester, _response
+                in HarvestScheduler().run_due(now)]
+
+    def test_harvests_are_started_once_at_their_time(self, get_api, _init):
+        first, second = self.order
+        before = self.times[first] - datetime.timedelta(seconds=1)
+        self.assertEqual(self.started(get_api, before), [])
+        self.assertEqual(self.started(get_api, self.times[first]), [first])
+        self.assertEqual(self.started(get_api, self.times[second]), [second])
+        self.assertEqual(self.started(get_api, self.times[second]), [])
+        self.assertEqual(get_api.return_value.start_harvest.call_count, 2)
+        self.assertEqual(ScheduledHarvest.objects.count(), 2)
+
+    def test_harvesters_with_a_crontab_are_skipped(self, get_api, _init):
+        self.set_crontab(self.harvesters[0], ['0 0 * * *'])
+        # the schedules of Harvester1 are unknown
+        harvester_cache.invalidate(self.harvesters[1], harvester_cache.SNAPSHOT)
+        late = max(self.times.values())
+        self.assertEqual(self.started(get_api, late), [])
+        self.set_crontab(self.harvesters[1], HCCJC.NO_CRONTAB)
+        self.assertEqual(self.started(get_api, late), ['Harvester1'])
+
+    def test_harvesters_without_known_schedules_are_skipped(self, get_api,
+                                                            _init):
+        # a pushed state carries no schedules
+        harvester_cache.set_snapshot(
+            self.harvesters[0], {'Harvester0': {HCCJC.STATUS: 'idle'}},
+            status.HTTP_200_OK, pushed=True)
+        # a failed poll neither
+        harvester_cache.set_snapshot(
+            self.harvesters[1], {'Harvester1': {HCCJC.STATUS: 'no status'}},
+            status.HTTP_408_REQUEST_TIMEOUT)
+        self.assertEqual(self.started(get_api, max(self.times.values())), [])
+
+    def test_claimed_starts_are_skipped(self, get_api, _init):
+        # another poller started the harvest
+        self.assertTrue(HarvestScheduler.claim(self.harvesters[0], DAY))
+        self.assertFalse(HarvestScheduler.claim(self.harvesters[0], DAY))
+        late = max(self.times.values())
+        self.assertEqual(self.started(get_api, late), ['Harvester1'])
+
+    def test_window_across_midnight(self, get_api, _init):
+        # the window of the day before is still open after midnight
+        next_day = timezone.make_aware(datetime.datetime(2019, 8, 28, 1))
+        self.assertEqual(self.started(get_api, next_day),
+                         ['Harvester0', 'Harvester1'])
+
+    def test_missed_starts_are_skipped(self, get_api, _init):
+        late = max(self.times.values()) + datetime.timedelta(hours=5)
+        self.assertEqual(self.started(get_api, late), [])
@@ -0,0 +1,174 @@
+"""
+Testing Module for harvester_api.py
+"""
+import threading
+import time
+from unittest.mock import patch
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from rest_framework import status
+from rest_framework.response import Response
+
+from api import harvester_cache
+from api.harvester_api import InitHarvester, call_harvester_apis
+from api.harvester_api_strategy import (REFRESHING, HarvesterApiStrategy,
+                                        push_harvester_state)
+from api.models import Harvester
+
+__author__ = "Jan Frömberg"
+__copyright__ = "Copyright 2018, GeRDI Project"
+__credits__ = ["Jan Frömberg"]
+__license__ = "Apache 2.0"
+__maintainer__ = "Jan Frömberg"
+__email__ = "jan.froemberg@tu-dresden.de"
+
+
+class CallHarvesterApisTestCase(TestCase):
+    """This class defines the test suite for concurrent harvester calls."""
+
+    def setUp(self):
+        user = User.objects.create(username="AnyUser")
+        self.harvesters = [
+            Harvester.objects.create(name="Harvester{}".format(i), owner=user,
+                                     url='http://somewhere.url/v{}'.format(i))
+            for i in range(4)]
+
+    @patch('api.harvester_api.InitHarvester.__init__', return_value=None)
+    @patch('api.harvester_api.InitHarvester.get_harvester_api')
+    def test_calls_are_made_concurrently(self, get_api, _init):
+        barrier = threading.Barrier(len(self.harvesters), timeout=5)
+
+        def start_harvest():
+            # every call waits until all calls are in flight
+            barrier.wait()
+            return Response({}, status=status.HTTP_200_OK)
+
+        get_api.return_value.start_harvest.side_effect = start_harvest
+        with override_settings(HARVESTER_API_WORKERS=len(self.harvesters)):
+            results = call_harvester_apis(self.harvesters, 'start_harvest')
+        self.assertEqual([harvester for harvester, _r in results],
+                         self.harvesters)
+        self.assertEqual(get_api.return_value.start_harvest.call_count, 4)
+
+    @patch('api.harvester_api.InitHarvester.__init__', return_value=None)
+    @patch('api.harvester_api.InitHarvester.get_harvester_api')
+    def test_arguments_are_passed(self, get_api, _init):
+        call_harvester_apis(self.harvesters[:1], 'harvester_log', 'a date')
+        get_api.return_value.harvester_log.assert_called_with('a date')
+
+
+class HarvesterCacheTestCase(TestCase):
+    """This class defines the test suite for the shared harvester cache."""
+
+    def setUp(self):
+        cache.clear()
+        user = User.objects.create(username="AnyUser")
+        self.harvester = Harvester.objects.create(
+            name="Harvester1", owner=user, url='http://somewhere.url/v1',
+            enabled=True)
+
+    @patch('api.single_flight.requests.get')
+    def test_version_is_detected_once(self, get):
+        get.return_value.status_code = status.HTTP_200_OK
+        get.return_value.text = '{"value": ["x", "HarvesterBaseLibrary-x-7.4.2"]}'
+        for _ in range(2):
+            self.assertEqual(InitHarvester(self.harvester).get_version(), 7)
+        self.assertEqual(get.call_count, 1)
+
+    def test_status_snapshot_is_shared(self):
+        strategy = StubStrategy()
+        for _ in range(2):
+            response = HarvesterApiStrategy(
+                self.harvester, strategy).harvester_status()
+            self.assertEqual(response.data['Harvester1']['status'], 'idle')
+        self.assertEqual(strategy.calls, 1)
+
+    def test_stale_snapshot_is_served_and_refreshed(self):
+        harvester_cache.set_snapshot(
+            self.harvester, {'Harvester1': {'status': 'harvesting'}}, 200,
+            timestamp=time.time() - 400, timeout=300)
+        strategy = StubStrategy()
+        with patch('api.harvester_api_strategy.REFRESH_EXECUTOR.submit',
+                   side_effect=lambda refresh: refresh()):
+            response = HarvesterApiStrategy(
+                self.harvester, strategy).harvester_status()
+        self.assertEqual(response.data['Harvester1']['status'], 'harvesting')
+        self.assertEqual(response.data['Harvester1']['status_age'], 400)
+        self.assertEqual(strategy.calls, 1)
+        snapshot = harvester_cache.get_snapshot(self.harvester)
+        self.assertTrue(harvester_cache.is_fresh(snapshot))
+        self.assertEqual(snapshot[harvester_cache.DATA],
+                         {'Harvester1': {'status': 'idle'}})
+        # the lifetime the poller chose is kept
+        self.assertEqual(harvester_cache.lifetime(snapshot), 300)
+
+    def test_refreshes_are_not_repeated(self):
+        harvester_cache.set_snapshot(
+            self.harvester, {'Harvester1': {'status': 'idle'}}, 200,
+            timestamp=time.time() - 20, timeout=10)
+        with patch('api.harvester_api_strategy.REFRESH_EXECUTOR.submit') as submit:
+            api = HarvesterApiStrategy(self.harvester, StubStrategy())
+            api.harvester_status()
+            api.harvester_status()
+        self.assertEqual(submit.call_count, 1)
+        # run the pending refresh, after that a new one can be started
+        submit.call_args[0][0]()
+        self.assertNotIn('Harvester1', REFRESHING)
+
+    def test_actions_invalidate_the_snapshot(self):
+        strategy = StubStrategy()
+        api = HarvesterApiStrategy(self.harvester, strategy)
+        api.harvester_status()
+        api.start_harvest()
+        self.assertIsNone(harvester_cache.get_snapshot(self.harvester))
+
+    def test_saving_a_harvester_invalidates_its_entries(self):
+        harvester_cache.set_version(self.harvester, 7)
+        harvester_cache.set_snapshot(self.harvester, {}, 200)
+        self.harvester.disable()
+        self.assertIsNone(harvester_cache.get_version(self.harvester))
+        self.assertIsNone(harvester_cache.get_snapshot(self.harvester))
+
+    def test_pushed_state_keeps_the_schedules(self):
+        harvester_cache.set_snapshot(
+            self.harvester, {'Harvester1': {'cron': ['0 0 * * *']}}, 200)
+        snapshot = push_harvester_state(self.harvester, {
+            'health': 'OK', 'state': 'IDLE', 'harvestedCount': 1,
+            'repositoryName': 'Repository'})
+        self.assertEqual(snapshot, harvester_cache.get_snapshot(self.harvester))
+        data = snapshot[harvester_cache.DATA]['Harvester1']
+        self.assertEqual(data['cron'], ['0 0 * * *'])
+        self.assertEqual(data['status'], 'idle')
+
+    def test_pushed_state_must_be_an_object(self):
+        with self.assertRaises(ValueError):
+            push_harvester_state(self.harvester, ['a list'])
+
+    def test_pushed_state_values_need_their_types(self):
+        state = {'health': 'OK', 'state': 'IDLE', 'harvestedCount': 1,
+                 'repositoryName': 'Repository'}
+        with self.assertRaisesMessage(ValueError, 'maxDocumentCount'):
+            push_harvester_state(self.harvester,
+                                 dict(state, maxDocumentCount=None))
+        with self.assertRaisesMessage(ValueError, 'harvestedCount'):
+            push_harvester_state(self.harvester,
+                                 dict(state, harvestedCount='many'))
+        self.assertIsNone(harvester_cache.get_snapshot(self.harvester))
+
+
+class StubStrategy:
+    """A strategy stub counting the status requests."""
+
+    def __init__(self):
+        self.calls = 0
+
+    def get_harvester_status(self, harvester):
+        self.calls += 1
+        return Response({harvester.name: {'status': 'idle'}},
+                        status=status.HTTP_200_OK)
+
+    def post_start_harvest(self, harvester):
+        return Response({harvester.name: 'started'},
+                        status=status.HTTP_200_OK)
@@ -66,6 +66,13 @@ class ModelTestCase(TestCase):
         self.harvester.save()
         self.assertFalse(self.harvester.enabled)
 
+    def test_harvester_url_host_is_derived_from_url(self):
+        """Test if the url host is kept in sync with the url"""
+        self.assertEqual(self.harvester.url_host, "somewhere.url")
+        self.harvester.url = "https://Elsewhere.url:8080/v1"
+        self.harvester.save()
+        self.assertEqual(self.harvester.url_host, "elsewhere.url")
+
     def test_harvester_enable_and_disable_function(self):
         """Test if the enable() and disable() functions work correctly"""
         self.harvester.enable()
@@ -0,0 +1,102 @@
+"""
+Testing Module for health.py
+"""
+from unittest.mock import patch
+
+from django.core.cache import cache
+from django.db import DatabaseError
+from django.test import TestCase, override_settings
+from django.urls import include, path, reverse
+from rest_framework import status
+from rest_framework.test import APITestCase, URLPatternsTestCase
+
+from api import harvester_cache, health
+
+__author__ = "Jan Frömberg"
+__copyright__ = "Copyright 2018, GeRDI Project"
+__credits__ = ["Jan Frömberg"]
+__license__ = "Apache 2.0"
+__maintainer__ = "Jan Frömberg"
+__email__ = "jan.froemberg@tu-dresden.de"
+
+HEALTH = {'POLLER': True, 'HEARTBEAT_MAX_AGE': 60, 'SNAPSHOT_MAX_AGE': 600}
+NOW = 1566907200
+
+
+@override_settings(HEALTH=HEALTH)
+class ReadinessTestCase(TestCase):
+    """This class defines the test suite for the readiness checks."""
+
+    def setUp(self):
+        cache.clear()
+
+    def test_ready(self):
+        harvester_cache.set_heartbeat(NOW - 5, NOW - 100)
+        ready, report = health.readiness(NOW)
+        self.assertTrue(ready)
+        self.assertEqual(report['checks']['poller'], {'status': 'ok', 'age': 5})
+        self.assertEqual(report['checks']['snapshots'],
+                         {'status': 'ok', 'age': 100})
+
+    def test_without_a_poller_heartbeat(self):
+        ready, report = health.readiness(NOW)
+        self.assertFalse(ready)
+        self.assertEqual(report['checks']['poller']['status'], 'fail')
+        self.assertNotIn('snapshots', report['checks'])
+
+    def test_old_snapshots(self):
+        harvester_cache.set_heartbeat(NOW - 5, NOW - 601)
+        # a failed tick keeps the time of the last complete poll
+        harvester_cache.set_heartbeat(NOW - 1)
+        ready, report = health.readiness(NOW)
+        self.assertFalse(ready)
+        self.assertEqual(report['checks']['snapshots'],
+                         {'status': 'fail', 'age': 601})
+
+    @override_settings(HEALTH=dict(HEALTH, POLLER=False))
+    def test_poller_disabled(self):
+        self.assertEqual(health.readiness(NOW),
+                         (True, {'status': 'ok',
+                                 'checks': {'database': {'status': 'ok'}}}))
+
+    def test_cache_unavailable(self):
+        with patch('api.health.harvester_cache.get_heartbeat',
+                   side_effect=OSError('gone')):
+            ready, report = health.readiness(NOW)
+        self.assertFalse(ready)
+        self.assertEqual(report['checks']['cache'],
+                         {'status': 'fail', 'error': 'gone'})
+
+    def test_database_unavailable(self):
+        with patch('api.health.connection.cursor',
+                   side_effect=DatabaseError('gone')):
+            self.assertEqual(health.check_database(),
+                             {'status': 'fail', 'error': 'gone'})
+
+
+@override_settings(HEALTH=HEALTH)
+class HealthViewsTestCase(APITestCase, URLPatternsTestCase):
+    """This class defines the test suite for the health check views."""
+    urlpatterns = [
+        path('', include('hcc_py.urls')),
+    ]
+
+    def setUp(self):
+        cache.clear()
+
+    def test_liveness(self):
+        with self.assertNumQueries(0):
+            response = self.client.get(reverse('health-live'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json(), {'status': 'ok'})
+
+    @patch('api.views_v2.call_harvester_apis')
+    def test_readiness(self, call_harvester_apis):
+        response = self.client.get(reverse('health-ready'))
+        self.assertEqual(response.status_code,
+                         status.HTTP_503_SERVICE_UNAVAILABLE)
+        harvester_cache.set_heartbeat(health.time.time())
+        with self.assertNumQueries(1):
+            response = self.client.get(reverse('health-ready'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        call_harvester_apis.assert_not_called()
@@ -0,0 +1,116 @@
+"""
+Testing Module for the harvester log cache
+"""
+import datetime
+import os
+import shutil
+import tempfile
+import time
+from unittest.mock import patch
+
+from django.contrib.auth.models import User
+from django.test import TestCase, override_settings
+from rest_framework import status
+from rest_framework.response import Response
+
+from api.constants import HCCJSONConstants as HCCJC
+from api.harvester_api_strategy import VersionBased7Strategy
+from api.log_cache import HarvesterLogCache, end_of_day
+from api.models import Harvester
+
+__author__ = "Jan Frömberg"
+__copyright__ = "Copyright 2018, GeRDI Project"
+__credits__ = ["Jan Frömberg"]
+__license__ = "Apache 2.0"
+__maintainer__ = "Jan Frömberg"
+__email__ = "jan.froemberg@tu-dresden.de"
+
+
+class LogCacheTestCase(TestCase):
+    """This class defines the test suite for the harvester log cache."""
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.cache = HarvesterLogCache(self.directory, 1024 * 1024, 60)
+        self.today = datetime.date.today()
+        self.yesterday = self.today - datetime.timedelta(days=1)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_cache_miss_returns_none(self):
+        self.assertIsNone(self.cache.get('Harvester1', self.yesterday))
+
+    def test_cache_returns_stored_log(self):
+        self.cache.set('Harvester1', self.yesterday, 'some log text')
+        self.assertEqual(self.cache.get('Harvester1', self.yesterday),
+                         'some log text')
+
+    def test_past_day_never_expires(self):
+        day = self.today - datetime.timedelta(days=31)
+        self.cache.set('Harvester1', day, 'old log')
+        path = self.cache._path('Harvester1', day)
+        old = time.time() - 60 * 60 * 24 * 30
+        os.utime(path, (old, old))
+        self.assertEqual(self.cache.get('Harvester1', day), 'old log')
+
+    def test_partial_log_of_a_past_day_expires(self):
+        self.cache.set('Harvester1', self.yesterday, 'partial log')
+        path = self.cache._path('Harvester1', self.yesterday)
+        # cached five minutes before midnight
+        before_midnight = end_of_day(self.yesterday) - 5 * 60
+        os.utime(path, (before_midnight, before_midnight))
+        self.assertIsNone(self.cache.get('Harvester1', self.yesterday))
+
+    def test_today_expires_after_ttl(self):
+        self.cache.set('Harvester1', self.today, 'todays log')
+        self.assertEqual(self.cache.get('Harvester1', self.today),
+                         'todays log')
+        path = self.cache._path('Harvester1', self.today)
+        old = time.time() - 61
+        os.utime(path, (old, old))
+        self.assertIsNone(self.cache.get('Harvester1', self.today))
+
+    def test_least_recently_used_entries_are_evicted(self):
+        cache = HarvesterLogCache(self.directory, 0, 60)
+        cache.set('Harvester1', self.yesterday, 'some log text')
+        self.assertIsNone(cache.get('Harvester1', self.yesterday))
+        self.assertEqual(cache.size(), 0)
+
+    def test_cache_is_not_scanned_on_every_write(self):
+        self.cache.set('Harvester1', self.yesterday, 'some log text')
+        with patch('api.log_cache.os.walk', wraps=os.walk) as walk:
+            for day in range(1, 4):
+                self.cache.set('Harvester1', self.today - datetime.timedelta(
+                    days=day), 'some log text')
+        walk.assert_not_called()
+
+
+class LogCacheStrategyTestCase(TestCase):
+    """This class tests the usage of the log cache in the v7 strategy."""
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        user = User.objects.create(username="AnyUser")
+        self.harvester = Harvester.objects.create(
+            name="Harvester1", owner=user, url='http://somewhere.url/v1')
+        self.yesterday = datetime.date.today() - datetime.timedelta(days=1)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_past_log_is_fetched_only_once(self):
+        with override_settings(HARVESTER_LOG_CACHE={
+                'DIR': self.directory, 'MAX_SIZE': 1024 * 1024,
+                'TODAY_TTL': 60}), \
+                patch('api.harvester_api_strategy.a_response',
+                      return_value=(Response({}, status.HTTP_200_OK),
+                                    'some log text')) as apicall:
+            strategy = VersionBased7Strategy()
+            for _ in range(2):
+                response = strategy.get_harvester_log(self.harvester,
+                                                      self.yesterday)
+                self.assertEqual(
+                    response.data[self.harvester.name][HCCJC.LOGS],
+                    'some log text')
+        self.assertEqual(apicall.call_count, 1)
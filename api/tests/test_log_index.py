@@ -0,0 +1,142 @@
+"""
+Testing Module for log_index.py
+"""
+import copy
+import datetime
+import json
+import os
+import shutil
+import tempfile
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from api import log_index
+
+__author__ = "Jan Frömberg"
+__copyright__ = "Copyright 2018, GeRDI Project"
+__credits__ = ["Jan Frömberg"]
+__license__ = "Apache 2.0"
+__maintainer__ = "Jan Frömberg"
+__email__ = "jan.froemberg@tu-dresden.de"
+
+NOW = datetime.datetime.now(datetime.timezone.utc)
+
+
+def entry(message, minutes=0, **fields):
+    """Return a structured log line."""
+    fields.update(message=message, level=fields.get('level', 'INFO'),
+                  time=(NOW + datetime.timedelta(minutes=minutes)).isoformat())
+    return json.dumps(fields) + '\n'
+
+
+class LogDirMixin:
+    """Log files and index in a temporary directory."""
+
+    def setUp(self):
+        super().setUp()
+        self.dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.dir)
+        self.filename = os.path.join(self.dir, 'hcc.jsonl')
+        logging_settings = copy.deepcopy(settings.LOGGING)
+        logging_settings['handlers']['filejson']['filename'] = self.filename
+        conf = override_settings(
+            LOGGING=logging_settings,
+            LOG_INDEX={'PATH': os.path.join(self.dir, 'index.sqlite3'),
+                       'MAX_AGE': 1, 'MAX_RESULTS': 3})
+        conf.enable()
+        self.addCleanup(conf.disable)
+
+    def write(self, *lines, filename=None):
+        with open(filename or self.filename, 'a') as file:
+            file.write(''.join(lines))
+
+
+class LogIndexTestCase(LogDirMixin, SimpleTestCase):
+    """This class defines the test suite for the log index."""
+
+    def test_search(self):
+        self.write(
+            entry('GET http://somewhere.url/v1/ failed: read timeout', 1,
+                  level='WARNING', harvester='Harvester1', status=None),
+            entry('Harvester1 harvest started', 2, harvester='Harvester1'),
+            entry('POST http://somewhere.url/v2/ took 3s', 3, level='WARNING',
+                  harvester='Harvester2', status=200),
+            'no json line\n')
+        results = log_index.search(query='timeout')
+        self.assertEqual([result['harvester'] for result in results],
+                         ['Harvester1'])
+        results = log_index.search(level='warning')
+        self.assertEqual([result['harvester'] for result in results],
+                         ['Harvester2', 'Harvester1'])
+        self.assertEqual(len(log_index.search(status='200')), 1)
+        self.assertEqual(len(log_index.search(harvester='Harvester1',
+                                              limit=1)), 1)
+        since = (NOW + datetime.timedelta(minutes=2)).isoformat()
+        self.assertEqual(len(log_index.search(since=since)), 2)
+
+    def test_lines_are_indexed_once(self):
+        second = entry('second', 2)
+        self.write(entry('first', 1), second[:10])
+        self.assertEqual(len(log_index.search()), 1)
+        self.write(second[10:])
+        # the log file is rotated
+        os.rename(self.filename, self.filename + '.1')
+        self.write(entry('third', 3))
+        self.assertEqual([result['message'] for result in log_index.search()],
+                         ['third', 'second', 'first'])
+
+    def test_old_lines_are_dropped(self):
+        self.write(entry('old', -2 * 24 * 60), entry('new'))
+        self.assertEqual([result['message'] for result in log_index.search()],
+                         ['new'])
+
+    def test_invalid_queries(self):
+        with self.assertRaises(ValueError):
+            log_index.search(query='"unbalanced')
+        with self.assertRaises(ValueError):
+            log_index.search(status='ok')
+
+
+class LogSearchViewTestCase(LogDirMixin, TestCase):
+    """This class defines the test suite for the log search views."""
+
+    def setUp(self):
+        super().setUp()
+        self.user = User.objects.create(username="ChuckNorris")
+        self.write(entry('read timeout', harvester='Harvester1'),
+                   entry('harvest started', harvester='Harvester2'))
+
+    def test_hcc_log(self):
+        self.client.force_login(self.user)
+        response = self.client.get(reverse('hcc-log'), {'q': 'timeout'})
+        self.assertEqual(json.loads(response.content)['count'], 1)
+        response = self.client.get(reverse('hcc-log'), {'q': '"'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_hcc_log_search(self):
+        self.write(entry('<script>alert(1)</script>', harvester='Harvester1',
+                         level='ERROR'))
+        self.client.force_login(self.user)
+        response = self.client.get(reverse('hcc-log-search'),
+                                   {'harvester': 'Harvester1', 'level': 'error'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.context['count'], 1)
+        # log messages are escaped
+        self.assertContains(response, '&lt;script&gt;alert(1)&lt;/script&gt;')
+        self.assertNotContains(response, '<script>alert(1)')
+        response = self.client.get(reverse('hcc-log-search'), {'q': '"'})
+        self.assertIn('Invalid query', response.context['error'])
+
+    def test_api(self):
+        client = APIClient()
+        client.force_authenticate(user=self.user)
+        response = client.get(reverse('v1:log-search'),
+                              {'harvester': 'Harvester2'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['results'][0]['message'],
+                         'harvest started')
@@ -0,0 +1,97 @@
+"""
+Testing Module for log_queue.py
+"""
+import json
+import logging
+import queue
+import sys
+
+from django.test import SimpleTestCase
+
+from api import log_queue
+from api.log_queue import DroppingQueueHandler, RoutingQueueListener
+from api.structured_log import JSONFormatter
+
+__author__ = "Jan Frömberg"
+__copyright__ = "Copyright 2018, GeRDI Project"
+__credits__ = ["Jan Frömberg"]
+__license__ = "Apache 2.0"
+__maintainer__ = "Jan Frömberg"
+__email__ = "jan.froemberg@tu-dresden.de"
+
+
+class ListHandler(logging.Handler):
+    """A handler collecting the messages of its records."""
+
+    def __init__(self, level=logging.NOTSET):
+        super().__init__(level)
+        self.messages = []
+
+    def emit(self, record):
+        self.messages.append(record.getMessage())
+
+
+def record(msg, level=logging.INFO):
+    """Return a log record of the test logger."""
+    return logging.makeLogRecord({'name': 'test', 'msg': msg, 'levelno': level,
+                                  'levelname': logging.getLevelName(level)})
+
+
+class LogQueueTestCase(SimpleTestCase):
+    """This class defines the test suite for the queued logging."""
+
+    def test_records_are_dropped_and_counted(self):
+        log_queue = queue.Queue(2)
+        handler = DroppingQueueHandler(log_queue, 'api')
+        for i in range(4):
+            handler.handle(record('message {}'.format(i)))
+        self.assertEqual(handler.dropped, 2)
+        self.assertEqual(log_queue.qsize(), 2)
+        # the drops are reported as soon as there is room again
+        log_queue.get_nowait()
+        log_queue.get_nowait()
+        handler.handle(record('message 4'))
+        messages = [log_queue.get_nowait().getMessage() for _ in range(2)]
+        self.assertEqual(messages, [
+            'message 4', '2 log records dropped, the log queue was full.'])
+        self.assertEqual(handler.unreported, 0)
+
+    def test_tracebacks_are_kept_apart_from_the_message(self):
+        log_queue = queue.Queue()
+        handler = DroppingQueueHandler(log_queue, 'api')
+        try:
+            raise ValueError('broken')
+        except ValueError:
+            entry = record('failed %s', logging.ERROR)
+            entry.args = ('Harvester1',)
+            entry.exc_info = sys.exc_info()
+        handler.handle(entry)
+        queued = log_queue.get_nowait()
+        json_entry = json.loads(JSONFormatter().format(queued))
+        self.assertEqual(json_entry['message'], 'failed Harvester1')
+        self.assertIn('ValueError: broken', json_entry['exc'])
+        # text logs still show the traceback
+        self.assertIn('ValueError: broken', logging.Formatter().format(queued))
+
+    def test_records_are_routed_to_the_handlers_of_their_logger(self):
+        log_queue = queue.Queue()
+        api, root = ListHandler(logging.WARNING), ListHandler()
+        listener = RoutingQueueListener(log_queue, {'api': [api], 'root': [root]},
+                                        [])
+        api_handler = DroppingQueueHandler(log_queue, 'api')
+        api_handler.handle(record('info'))
+        api_handler.handle(record('warning', logging.WARNING))
+        DroppingQueueHandler(log_queue, 'root').handle(record('root'))
+        listener.start()
+        listener.stop()
+        self.assertEqual(api.messages, ['warning'])
+        self.assertEqual(root.messages, ['root'])
+
+    def test_installed_handlers(self):
+        # the test settings keep the queue enabled
+        self.assertIsNotNone(log_queue.LISTENER)
+        handlers = logging.getLogger('api').handlers
+        self.assertEqual(len(handlers), 1)
+        self.assertIsInstance(handlers[0], DroppingQueueHandler)
+        self.assertIn('api', log_queue.LISTENER.routes)
+        self.assertEqual(log_queue.dropped(), 0)
@@ -0,0 +1,279 @@
+"""
+Testing Module for the database query budgets of the views.
+Each view gets a fixed number of queries no matter how many harvesters are
+registered, so N+1 regressions fail here instead of reaching production.
+"""
+import json
+from unittest.mock import MagicMock, patch
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import override_settings
+from django.urls import include, path, reverse
+from rest_framework import status
+from rest_framework.test import APIClient, APITestCase, URLPatternsTestCase
+
+from api import harvester_cache
+from api.constants import HCCJSONConstants as HCCJC
+from api.harvester_api import InitHarvester
+from api.models import Harvester
+from api.tests.helpers import FakeHarvesterApi
+
+__author__ = "Jan Frömberg"
+__copyright__ = "Copyright 2018, GeRDI Project"
+__credits__ = ["Jan Frömberg"]
+__license__ = "Apache 2.0"
+__maintainer__ = "Jan Frömberg"
+__email__ = "jan.froemberg@tu-dresden.de"
+
+NUM_HARVESTERS = 5
+
+
+def init_harvester(self, harvester):
+    self.harvester = harvester
+
+
+def get_harvester_api(self):
+    return FakeHarvesterApi(self.harvester)
+
+
+@override_settings(HARVESTER_API_WORKERS=1)
+@patch.object(InitHarvester, '__init__', init_harvester)
+@patch.object(InitHarvester, 'get_harvester_api', get_harvester_api)
+class QueryBudgetTests(APITestCase, URLPatternsTestCase):
+    """Test suite for the number of database queries per view."""
+    urlpatterns = [
+        path('', include('hcc_py.urls')),
+    ]
+
+    def setUp(self):
+        super(QueryBudgetTests, self).setUp()
+        self.user = User.objects.create(username="ChuckNorris")
+        self.client = APIClient()
+        self.client.force_login(user=self.user)
+        self.harvesters = [
+            Harvester.objects.create(
+                name='Harvester{}'.format(i), owner=self.user,
+                url='http://somewhere{}.url/v1'.format(i), enabled=True)
+            for i in range(NUM_HARVESTERS)]
+        self.name = self.harvesters[0].name
+        self.names = '-'.join(harvester.name for harvester in self.harvesters)
+
+    def assertQueries(self, num, method, url, *args, **kwargs):
+        """Assert a request to the url is answered with num queries."""
+        with self.assertNumQueries(num):
+            response = getattr(self.client, method)(url, *args, **kwargs)
+        self.assertLess(response.status_code, 400, response.content)
+        return response
+
+    # GUI views
+
+    def test_index(self):
+        self.assertQueries(0, 'get', reverse('home'))
+
+    def test_home(self):
+        # session, user, summary (counts and names), page of harvesters
+        self.assertQueries(5, 'get', reverse('hcc_gui'))
+        # the summary is cached
+        self.assertQueries(3, 'get', reverse('hcc_gui'))
+
+    def test_update_session(self):
+        # session, user and saving the session
+        self.assertQueries(5, 'post', reverse('update-session'),
+                           {'theme': 'dark'},
+                           HTTP_X_REQUESTED_WITH='XMLHttpRequest')
+
+    def test_toggle_harvester(self):
+        self.assertQueries(
+            4, 'get', reverse('toggle-harvester', kwargs={'name': self.name}))
+
+    def test_start_harvester(self):
+        self.assertQueries(
+            3, 'get', reverse('start-harvester', kwargs={'name': self.name}))
+
+    def test_stop_harvester(self):
+        self.assertQueries(
+            3, 'get', reverse('stop-harvester', kwargs={'name': self.name}))
+
+    def test_reset_harvester(self):
+        self.assertQueries(
+            3, 'get', reverse('reset-harvester', kwargs={'name': self.name}))
+
+    def test_start_selected_harvesters(self):
+        # session, user and the selected harvesters
+        self.assertQueries(
+            3, 'get',
+            reverse('start-selected-harvesters', kwargs={'hnames': self.names}))
+
+    def test_start_selected_unknown_harvesters(self):
+        response = self.client.get(reverse(
+            'start-selected-harvesters',
+            kwargs={'hnames': self.names + '-Unknown'}))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_start_all_harvesters(self):
+        self.assertQueries(3, 'get', reverse('start-harvesters'))
+
+    def test_abort_all_harvesters(self):
+        self.assertQueries(3, 'get', reverse('abort-harvesters'))
+
+    def test_harvester_logs(self):
+        self.assertQueries(3, 'get', reverse('harvesters-log'))
+
+    def test_harvester_progress(self):
+        self.assertQueries(
+            3, 'get', reverse('harvester-progress', kwargs={'name': self.name}))
+
+    def test_harvester_status_history(self):
+        self.assertQueries(3, 'get', reverse('etls', kwargs={'name': self.name}))
+
+    def test_harvester_to_file(self):
+        # session, user and the streamed harvesters
+        with self.assertNumQueries(3):
+            response = self.client.get(reverse('harvester-to-file'))
+            b''.join(response.streaming_content)
+
+    def test_harvester_file_form(self):
+        self.assertQueries(2, 'get', reverse('harvester-file-form'))
+
+    def test_edit_harvester_form(self):
+        self.assertQueries(
+            3, 'get', reverse('edit-harvester', kwargs={'name': self.name}))
+
+    def test_config_harvester_form(self):
+        self.assertQueries(
+            3, 'get', reverse('config-harvester', kwargs={'name': self.name}))
+
+    # v1 API
+
+    def test_api_harvester_list(self):
+        self.client.force_authenticate(user=self.user)
+        self.assertQueries(1, 'get', reverse('v1:create'))
+
+    def test_api_harvester_detail(self):
+        self.client.force_authenticate(user=self.user)
+        self.assertQueries(
+            1, 'get', reverse('v1:harvester-detail', kwargs={'name': self.name}))
+
+    def test_api_users(self):
+        other = User.objects.create(username="BruceLee")
+        Harvester.objects.create(name='OtherHarvester', owner=other,
+                                 url='http://somewhere.else/v1')
+        self.client.force_authenticate(user=self.user)
+        # count, users and their harvesters
+        self.assertQueries(3, 'get', reverse('v1:users'))
+
+    def test_api_user_details(self):
+        self.client.force_authenticate(user=self.user)
+        self.assertQueries(
+            2, 'get', reverse('v1:user-details', kwargs={'pk': self.user.pk}))
+
+    def test_api_start_harvest(self):
+        self.assertQueries(
+            3, 'post', reverse('v1:start-harvest', kwargs={'name': self.name}))
+
+    def test_api_stop_harvest(self):
+        self.assertQueries(
+            3, 'post', reverse('v1:stop-harvest', kwargs={'name': self.name}))
+
+    def test_api_start_harvesters(self):
+        self.assertQueries(3, 'post', reverse('v1:run-harvesters'))
+
+    def test_api_stop_harvesters(self):
+        self.assertQueries(3, 'post', reverse('v1:stop-harvesters'))
+
+    def test_api_harvester_state(self):
+        self.assertQueries(
+            3, 'get', reverse('v1:harvester-status', kwargs={'name': self.name}))
+
+    def test_api_harvester_states(self):
+        self.assertQueries(3, 'get', reverse('v1:all-harvester-status'))
+
+    def test_api_harvester_log(self):
+        self.assertQueries(
+            3, 'get', reverse('v1:harvester-log', kwargs={'name': self.name}))
+
+    def test_api_harvester_api_info(self):
+        self.assertQueries(
+            3, 'get',
+            reverse('v1:harvester-api-info', kwargs={'name': self.name}))
+
+    def test_api_harvester_schedule(self):
+        self.assertQueries(
+            1, 'post', reverse('v1:harvester-cron', kwargs={'name': self.name}),
+            {self.name + '-' + HCCJC.POSTCRONTAB: '0 0 * * *'})
+
+    def test_api_harvester_schedule_delete(self):
+        self.assertQueries(
+            1, 'delete',
+            reverse('v1:harvester-cron', kwargs={'name': self.name}),
+            json.dumps({HCCJC.POSTCRONTAB: '0 0 * * *'}),
+            content_type='application/json')
+
+
+def harvester_response(data):
+    """Return a requests response of a v7 harvester."""
+    return MagicMock(status_code=status.HTTP_200_OK, text=json.dumps(data))
+
+
+STATE = {HCCJC.HEALTH: HCCJC.OK, HCCJC.STATE: 'IDLE',
+         HCCJC.HARVESTED_COUNT: 1, HCCJC.REPO_NAME: 'Repository'}
+HISTORY = {'overallInfo': {'stateHistory': [
+    {'timestamp': 1000, 'value': 'QUEUED'},
+    {'timestamp': 2000, 'value': 'HARVESTING'},
+    {'timestamp': 3000, 'value': 'IDLE'}], HCCJC.HARVESTED_COUNT: 1}}
+
+
+@override_settings(HARVESTER_API_WORKERS=1)
+@patch('api.single_flight.requests.post',
+       return_value=harvester_response({HCCJC.STATUS: 'started'}))
+class StrategyQueryBudgetTests(APITestCase, URLPatternsTestCase):
+    """
+    Test suite for the number of database queries of views including the
+    harvester api strategies, only the harvester requests are replaced.
+    """
+    urlpatterns = [
+        path('', include('hcc_py.urls')),
+    ]
+
+    def setUp(self):
+        super(StrategyQueryBudgetTests, self).setUp()
+        cache.clear()
+        self.user = User.objects.create(username="ChuckNorris")
+        self.client = APIClient()
+        self.client.force_login(user=self.user)
+        self.harvesters = [
+            Harvester.objects.create(
+                name='Harvester{}'.format(i), owner=self.user,
+                url='http://somewhere{}.url/v1'.format(i), enabled=True)
+            for i in range(NUM_HARVESTERS)]
+        for harvester in self.harvesters:
+            harvester_cache.set_version(harvester, 7)
+        self.name = self.harvesters[0].name
+
+    def assertQueries(self, num, method, url, *args, **kwargs):
+        """Assert a request to the url is answered with num queries."""
+        with self.assertNumQueries(num):
+            response = getattr(self.client, method)(url, *args, **kwargs)
+        self.assertLess(response.status_code, 400, response.content)
+        return response
+
+    @patch('api.single_flight.requests.get',
+           return_value=harvester_response(STATE))
+    def test_harvester_states(self, _get, _post):
+        self.assertQueries(3, 'get', reverse('v1:all-harvester-status'))
+
+    def test_start_all_harvesters(self, _post):
+        self.assertQueries(3, 'get', reverse('start-harvesters'))
+
+    @patch('api.single_flight.requests.get',
+           return_value=harvester_response(HISTORY))
+    def test_harvester_status_history(self, _get, _post):
+        # session, user, harvester and recording the runs:
+        # locking the harvester, the last run, the new run and a savepoint
+        # (two queries) for its transaction
+        self.assertQueries(8, 'get',
+                           reverse('etls', kwargs={'name': self.name}))
+        # nothing new to record
+        self.assertQueries(7, 'get',
+                           reverse('etls', kwargs={'name': self.name}))
@@ -0,0 +1,122 @@
+"""
+Testing Module for registry.py
+"""
+import json
+from unittest.mock import patch
+
+from django.contrib.auth.models import User
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import SimpleTestCase, TestCase
+from django.urls import reverse
+
+from api import registry
+from api.models import Harvester
+from api.registry import RegistryError
+
+__author__ = "Jan Frömberg"
+__copyright__ = "Copyright 2018, GeRDI Project"
+__credits__ = ["Jan Frömberg"]
+__license__ = "Apache 2.0"
+__maintainer__ = "Jan Frömberg"
+__email__ = "jan.froemberg@tu-dresden.de"
+
+
+def upload(content, name='harvesters.json',
+           content_type='application/json'):
+    """Return an uploaded file with the given text content."""
+    return SimpleUploadedFile(name, content.encode('utf-8'), content_type)
+
+
+def records(count):
+    """Return harvester records as exported."""
+    return [{'name': 'Harvester{}'.format(i), 'notes': 'Ä {}'.format(i),
+             'url': 'http://somewhere{}.url/v1'.format(i), 'enabled': i % 2 == 0}
+            for i in range(count)]
+
+
+class ParseTestCase(SimpleTestCase):
+    """This class defines the test suite for parsing uploads."""
+
+    @patch('api.registry.READ_SIZE', 7)
+    def test_json_array_across_chunks(self):
+        data = records(5)
+        self.assertEqual(list(registry.parse(upload(json.dumps(data)))), data)
+        self.assertEqual(list(registry.parse(upload(' [ ] '))), [])
+
+    def test_invalid_json_arrays(self):
+        for content in ('', '{"name": "Harvester1"}', '[{"name": 1}',
+                        '[{"name": 1},]', '[{"name": 1} {"name": 2}]'):
+            with self.assertRaises(RegistryError):
+                list(registry.parse(upload(content)))
+
+    def test_ndjson(self):
+        data = records(3)
+        content = '\n'.join(json.dumps(record) for record in data) + '\n\n'
+        self.assertEqual(list(registry.parse(upload(
+            content, 'harvesters.ndjson', 'application/octet-stream'))), data)
+        with self.assertRaisesMessage(RegistryError, 'Line 2'):
+            list(registry.parse(upload('{}\n{', content_type=registry.CONTENT_TYPES[
+                registry.NDJSON])))
+
+    def test_other_files_are_refused(self):
+        with self.assertRaises(RegistryError):
+            registry.parse(upload('text', 'harvesters.txt', 'text/plain'))
+
+
+class RegistryTestCase(TestCase):
+    """This class defines the test suite for export and import."""
+
+    def setUp(self):
+        self.user = User.objects.create(username="ChuckNorris")
+        for record in records(3):
+            Harvester.objects.create(owner=self.user, **record)
+
+    def test_exports(self):
+        queryset = Harvester.objects.all()
+        with patch('api.registry.BATCH_SIZE', 2):
+            chunks = list(registry.export_json(queryset))
+            lines = b''.join(registry.export_ndjson(queryset)).splitlines()
+        self.assertEqual(len(chunks), 4)
+        self.assertEqual(json.loads(b''.join(chunks)), records(3))
+        self.assertEqual([json.loads(line) for line in lines], records(3))
+        self.assertEqual(list(registry.export_json(queryset.none())),
+                         [b'[', b']'])
+
+    def test_import_in_batches(self):
+        data = records(5)
+        data[0]['enabled'] = False
+        data[1]['url'] = 'http://somewhereelse.url/v1'
+        data[2]['notes'] = 'new notes'
+        # a known url under a new name is left out
+        data.append(dict(data[3], name='Other'))
+        saved = registry.import_records(data, self.user, size=2)
+        self.assertEqual(saved, 4)
+        self.assertFalse(Harvester.objects.get(name='Harvester0').enabled)
+        self.assertEqual(Harvester.objects.get(name='Harvester1_1').url,
+                         'http://somewhereelse.url/v1')
+        self.assertEqual(Harvester.objects.get(name='Harvester2').notes, 'Ä 2')
+        self.assertFalse(Harvester.objects.filter(name='Other').exists())
+        self.assertEqual(Harvester.objects.count(), 6)
+
+    def test_invalid_records_stop_the_import(self):
+        with self.assertRaises(RegistryError):
+            registry.import_records(records(5)[3:] + [{'name': 'Other'}],
+                                    self.user, size=2)
+        self.assertEqual(Harvester.objects.count(), 5)
+
+    def test_upload_ndjson(self):
+        self.client.force_login(self.user)
+        content = '\n'.join(json.dumps(record) for record in records(4))
+        response = self.client.post(reverse('harvester-from-file'), {
+            'upload_file': upload(content, 'harvesters.ndjson')}, follow=True)
+        message = list(response.context.get('messages'))[0]
+        self.assertEqual(message.tags, "alert-success")
+        self.assertEqual(Harvester.objects.count(), 4)
+
+    def test_download_ndjson(self):
+        self.client.force_login(self.user)
+        response = self.client.get(reverse('harvester-to-file'),
+                                   {'format': 'ndjson'})
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        lines = b''.join(response.streaming_content).splitlines()
+        self.assertEqual([json.loads(line) for line in lines], records(3))
@@ -0,0 +1,109 @@
+"""
+Testing Module for renderers.py and middleware.py
+"""
+import datetime
+import gzip
+import json
+from unittest.mock import patch
+
+from django.contrib.auth.models import User
+from django.test import SimpleTestCase, override_settings
+from django.urls import include, path, reverse
+from rest_framework import status
+from rest_framework.response import Response
+from rest_framework.test import APIClient, APITestCase, URLPatternsTestCase
+
+from api import renderers
+from api.models import Harvester
+from api.renderers import FastJSONRenderer, FastJsonResponse, dumps
+
+__author__ = "Jan Frömberg"
+__copyright__ = "Copyright 2018, GeRDI Project"
+__credits__ = ["Jan Frömberg"]
+__license__ = "Apache 2.0"
+__maintainer__ = "Jan Frömberg"
+__email__ = "jan.froemberg@tu-dresden.de"
+
+DATA = {
+    'Harvester1': {'status': 'idle', 'cachedDocuments': 42, 'ratio': 0.5},
+    'Harvester2': {'status': 'harvesting', 'crontab': ['0 0 * * *'],
+                   'date': datetime.date(2019, 8, 27)},
+    'Ümlaut': None,
+}
+
+
+class RendererTestCase(SimpleTestCase):
+    """This class defines the test suite for the fast JSON renderers."""
+
+    def test_dumps_matches_the_stdlib(self):
+        expected = json.loads(json.dumps(DATA, default=str))
+        self.assertEqual(json.loads(dumps(DATA)), expected)
+
+    def test_dumps_without_orjson(self):
+        with patch.object(renderers, 'orjson', None):
+            self.assertEqual(json.loads(dumps(DATA)),
+                             json.loads(json.dumps(DATA, default=str)))
+
+    def test_renderer(self):
+        renderer = FastJSONRenderer()
+        self.assertEqual(renderer.render(None), b'')
+        self.assertEqual(json.loads(renderer.render(DATA)),
+                         json.loads(dumps(DATA)))
+
+    def test_renderer_indent(self):
+        rendered = FastJSONRenderer().render(
+            DATA, 'application/json; indent=2')
+        self.assertIn(b'\n  "Harvester1"', rendered)
+
+    def test_json_response(self):
+        response = FastJsonResponse(DATA, status=status.HTTP_201_CREATED)
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response['Content-Type'], 'application/json')
+        self.assertEqual(json.loads(response.content),
+                         json.loads(dumps(DATA)))
+
+    def test_json_response_is_safe(self):
+        with self.assertRaises(TypeError):
+            FastJsonResponse(['a list'])
+        self.assertEqual(FastJsonResponse(['a list'], safe=False).content,
+                         b'["a list"]')
+
+
+@override_settings(HARVESTER_API_WORKERS=1)
+class GZipTestCase(APITestCase, URLPatternsTestCase):
+    """This class defines the test suite for the gzip negotiation."""
+    urlpatterns = [
+        path('', include('hcc_py.urls')),
+    ]
+
+    def setUp(self):
+        self.user = User.objects.create(username="ChuckNorris")
+        self.client = APIClient()
+        self.client.force_login(user=self.user)
+        for i in range(20):
+            Harvester.objects.create(
+                name='Harvester{}'.format(i), owner=self.user,
+                url='http://somewhere{}.url/v1'.format(i))
+
+    @patch('api.views_v2.call_harvester_apis')
+    def test_json_is_compressed(self, call_harvester_apis):
+        call_harvester_apis.return_value = [
+            (harvester, Response({harvester.name: DATA['Harvester1']}))
+            for harvester in Harvester.objects.all()]
+        response = self.client.get(reverse('v1:all-harvester-status'),
+                                   HTTP_ACCEPT_ENCODING='gzip')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        data = json.loads(gzip.decompress(response.content))
+        self.assertEqual(len(data), 20)
+
+    def test_json_is_not_compressed_without_accept_encoding(self):
+        response = self.client.get(reverse('harvester-to-file'))
+        self.assertFalse(response.has_header('Content-Encoding'))
+        self.assertEqual(
+            len(json.loads(b''.join(response.streaming_content))), 20)
+
+    @patch('api.views_v2.call_harvester_apis', return_value=[])
+    def test_html_is_not_compressed(self, _call_harvester_apis):
+        response = self.client.get(reverse('hcc_gui'),
+                                   HTTP_ACCEPT_ENCODING='gzip')
+        self.assertFalse(response.has_header('Content-Encoding'))
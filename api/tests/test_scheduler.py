@@ -0,0 +1,170 @@
+"""
+Testing Module for scheduler.py
+"""
+from unittest.mock import patch
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase, override_settings
+from rest_framework import status
+from rest_framework.response import Response
+
+from api import harvester_cache
+from api.models import Harvester
+from api.scheduler import Scheduler, poll_interval, seconds_until
+
+__author__ = "Jan Frömberg"
+__copyright__ = "Copyright 2018, GeRDI Project"
+__credits__ = ["Jan Frömberg"]
+__license__ = "Apache 2.0"
+__maintainer__ = "Jan Frömberg"
+__email__ = "jan.froemberg@tu-dresden.de"
+
+INTERVALS = {'ACTIVE': 5, 'IDLE': 300, 'UNREACHABLE': 10, 'MAX': 60,
+             'TICK': 1}
+# 2019-08-27T12:00:00Z
+NOW = 1566907200
+
+
+@override_settings(POLL_INTERVALS=INTERVALS)
+class PollIntervalTestCase(SimpleTestCase):
+    """This class defines the test suite for the poll intervals."""
+
+    def test_active_harvesters_are_polled_fast(self):
+        for state in ('harvesting', 'queued', 'initialization'):
+            self.assertEqual(poll_interval({'status': state}, NOW), 5)
+
+    def test_active_harvesters_are_polled_when_they_end(self):
+        feedback = {'status': 'harvesting', 'remainingHarvestTime': 2000}
+        self.assertEqual(poll_interval(feedback, NOW), 2)
+
+    def test_idle_harvesters_are_polled_slowly(self):
+        self.assertEqual(poll_interval({'status': 'idle'}, NOW), 300)
+        self.assertEqual(poll_interval('disabled', NOW), 300)
+
+    def test_idle_harvesters_are_polled_at_the_next_harvest(self):
+        feedback = {'status': 'idle',
+                    'nextHarvestDate': '2019-08-27T12:01:00Z'}
+        self.assertEqual(poll_interval(feedback, NOW), 60)
+        feedback['nextHarvestDate'] = (NOW + 30) * 1000
+        self.assertEqual(poll_interval(feedback, NOW), 30)
+        # a far-off or a past harvest date does not matter
+        feedback['nextHarvestDate'] = '2019-08-28T12:00:00Z'
+        self.assertEqual(poll_interval(feedback, NOW), 300)
+        feedback['nextHarvestDate'] = '2019-08-26T12:00:00Z'
+        self.assertEqual(poll_interval(feedback, NOW), 300)
+
+    def test_unreachable_harvesters_back_off(self):
+        intervals = [poll_interval({}, NOW, failures) for failures in range(1, 6)]
+        self.assertEqual(intervals, [10, 20, 40, 60, 60])
+
+    def test_seconds_until(self):
+        self.assertEqual(seconds_until('2019-08-27T12:00:10', NOW), 10)
+        self.assertIsNone(seconds_until('tomorrow', NOW))
+        self.assertIsNone(seconds_until(None, NOW))
+
+
+@override_settings(POLL_INTERVALS=INTERVALS, HARVESTER_API_WORKERS=1)
+@patch('api.harvester_api.InitHarvester.__init__', return_value=None)
+@patch('api.harvester_api.InitHarvester.get_harvester_api')
+class SchedulerTestCase(TestCase):
+    """This class defines the test suite for the adaptive poller."""
+
+    def setUp(self):
+        cache.clear()
+        user = User.objects.create(username="AnyUser")
+        self.harvester = Harvester.objects.create(
+            name="Harvester1", owner=user, url='http://somewhere.url/v1',
+            enabled=True)
+        Harvester.objects.create(
+            name="Harvester2", owner=user, url='http://somewhere.url/v2',
+            enabled=False)
+
+    def test_harvesters_are_polled_by_state(self, get_api, _init):
+        get_api.return_value.fetch_status.return_value = Response(
+            {'Harvester1': {'status': 'harvesting'}}, status=status.HTTP_200_OK)
+        scheduler = Scheduler()
+        self.assertEqual(scheduler.poll(NOW), [(self.harvester, 5)])
+        snapshot = harvester_cache.get_snapshot(self.harvester)
+        self.assertEqual(snapshot[harvester_cache.TIMESTAMP], NOW)
+        # not due before the interval passed
+        self.assertEqual(scheduler.poll(NOW + 4), [])
+        self.assertEqual(scheduler.poll(NOW + 5), [(self.harvester, 5)])
+        self.assertEqual(get_api.return_value.fetch_status.call_count, 2)
+
+    @patch('api.harvester_cache.get_snapshot')
+    def test_snapshots_are_read_at_once(self, get_snapshot, get_api, _init):
+        get_api.return_value.fetch_status.return_value = Response(
+            {'Harvester1': {'status': 'idle'}}, status=status.HTTP_200_OK)
+        Scheduler().poll(NOW)
+        get_snapshot.assert_not_called()
+
+    def test_unreachable_harvesters_back_off(self, get_api, _init):
+        get_api.return_value.fetch_status.return_value = Response(
+            {'Harvester1': {'status': 'no status'}},
+            status=status.HTTP_408_REQUEST_TIMEOUT)
+        scheduler = Scheduler()
+        self.assertEqual(scheduler.poll(NOW), [(self.harvester, 10)])
+        self.assertEqual(scheduler.poll(NOW + 10), [(self.harvester, 20)])
+        self.assertEqual(scheduler.poll(NOW + 20), [])
+        get_api.return_value.fetch_status.return_value = Response(
+            {'Harvester1': {'status': 'idle'}}, status=status.HTTP_200_OK)
+        self.assertEqual(scheduler.poll(NOW + 30), [(self.harvester, 300)])
+
+    @override_settings(HCC_CACHE_TTL=dict(settings.HCC_CACHE_TTL, PUSHED=300))
+    def test_pushing_harvesters_are_polled_as_fallback(self, get_api, _init):
+        harvester_cache.set_snapshot(
+            self.harvester, {'Harvester1': {'status': 'harvesting'}},
+            status.HTTP_200_OK, NOW, pushed=True)
+        scheduler = Scheduler()
+        self.assertEqual(scheduler.poll(NOW + 60), [])
+        get_api.return_value.fetch_status.assert_not_called()
+        get_api.return_value.fetch_status.return_value = Response(
+            {'Harvester1': {'status': 'harvesting'}}, status=status.HTTP_200_OK)
+        self.assertEqual(len(scheduler.poll(NOW + 300)), 1)
+
+    def test_pushed_snapshots_count_as_poll(self, get_api, _init):
+        harvester_cache.set_snapshot(
+            self.harvester, {'Harvester1': {'status': 'idle'}},
+            status.HTTP_200_OK, NOW, pushed=True)
+        self.assertEqual(Scheduler().poll(NOW + 10), [])
+        get_api.return_value.fetch_status.assert_not_called()
+
+    @patch('api.scheduler.admission.release')
+    def test_queued_harvests_are_released_every_tick(self, release, get_api,
+                                                     _init):
+        harvester_cache.set_snapshot(
+            self.harvester, {'Harvester1': {'status': 'idle'}},
+            status.HTTP_200_OK, NOW, pushed=True)
+        # nothing is due, the state may have been pushed
+        self.assertEqual(Scheduler().poll(NOW + 10), [])
+        release.assert_called_once_with()
+
+    def test_finished_harvests_are_recorded(self, get_api, _init):
+        harvester_cache.set_snapshot(
+            self.harvester, {'Harvester1': {'status': 'harvesting'}},
+            status.HTTP_200_OK, NOW - 10, timeout=5)
+        get_api.return_value.fetch_status.return_value = Response(
+            {'Harvester1': {'status': 'idle'}}, status=status.HTTP_200_OK)
+        Scheduler().poll(NOW)
+        get_api.return_value.status_history.assert_called_once_with()
+
+    @patch('api.scheduler.time.sleep')
+    def test_every_tick_is_a_heartbeat(self, _sleep, get_api, _init):
+        get_api.return_value.fetch_status.return_value = Response(
+            {'Harvester1': {'status': 'idle'}}, status=status.HTTP_200_OK)
+        Scheduler().run(ticks=2)
+        heartbeat = harvester_cache.get_heartbeat()
+        # the second tick polled nothing, but no harvester was due
+        self.assertEqual(get_api.return_value.fetch_status.call_count, 1)
+        self.assertEqual(heartbeat[harvester_cache.LAST_POLL],
+                         heartbeat[harvester_cache.TIMESTAMP])
+
+    @patch('api.scheduler.time.sleep')
+    def test_failed_ticks_keep_the_last_poll(self, _sleep, get_api, _init):
+        get_api.return_value.fetch_status.side_effect = RuntimeError('broken')
+        Scheduler().run(ticks=1)
+        heartbeat = harvester_cache.get_heartbeat()
+        self.assertIsNone(heartbeat[harvester_cache.LAST_POLL])
+        self.assertIsNotNone(heartbeat[harvester_cache.TIMESTAMP])
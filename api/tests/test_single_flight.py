@@ -0,0 +1,154 @@
+"""
+Testing Module for single_flight.py
+"""
+import hashlib
+import threading
+import time
+from unittest.mock import patch
+
+import requests
+from django.core.cache import cache
+from django.test import SimpleTestCase, override_settings
+
+from api import single_flight
+from api.single_flight import SingleFlight, shared_do
+
+__author__ = "Jan Frömberg"
+__copyright__ = "Copyright 2018, GeRDI Project"
+__credits__ = ["Jan Frömberg"]
+__license__ = "Apache 2.0"
+__maintainer__ = "Jan Frömberg"
+__email__ = "jan.froemberg@tu-dresden.de"
+
+SHARED = {'SHARED': True, 'WAIT': 2, 'RESULT_TTL': 1, 'POLL': 0.01}
+LOCK_KEY = 'hcc:flight:lock:{}'.format(hashlib.md5(b'key').hexdigest())
+
+
+class SingleFlightTestCase(SimpleTestCase):
+    """This class defines the test suite for the in-process single flight."""
+
+    def run_concurrently(self, flight, key, func, callers=4):
+        """Call flight.do(key, func) from several threads at once."""
+        results, errors = [], []
+
+        def call():
+            try:
+                results.append(flight.do(key, func))
+            except ValueError as err:
+                errors.append(err)
+
+        threads = [threading.Thread(target=call) for _ in range(callers)]
+        for thread in threads:
+            thread.start()
+        return threads, results, errors
+
+    def test_concurrent_calls_share_one_execution(self):
+        flight = SingleFlight()
+        started, release = threading.Event(), threading.Event()
+        calls = []
+
+        def func():
+            calls.append(1)
+            started.set()
+            release.wait(5)
+            return 'response'
+
+        leader = threading.Thread(target=flight.do, args=('key', func))
+        leader.start()
+        started.wait(5)
+        threads, results, _errors = self.run_concurrently(flight, 'key', func)
+        # give the callers time to join the flight
+        time.sleep(0.2)
+        release.set()
+        for thread in threads + [leader]:
+            thread.join(5)
+        self.assertEqual(calls, [1])
+        self.assertEqual(results, ['response'] * 4)
+
+    def test_errors_are_shared(self):
+        flight = SingleFlight()
+        started, release = threading.Event(), threading.Event()
+
+        def func():
+            started.set()
+            release.wait(5)
+            raise ValueError('unreachable')
+
+        leader_errors = []
+
+        def lead():
+            try:
+                flight.do('key', func)
+            except ValueError as err:
+                leader_errors.append(err)
+
+        leader = threading.Thread(target=lead)
+        leader.start()
+        started.wait(5)
+        threads, _results, errors = self.run_concurrently(flight, 'key', func)
+        # give the callers time to join the flight
+        time.sleep(0.2)
+        release.set()
+        for thread in threads + [leader]:
+            thread.join(5)
+        self.assertEqual(len(errors), 4)
+        self.assertEqual(len(leader_errors), 1)
+
+    def test_sequential_calls_are_executed(self):
+        flight = SingleFlight()
+        self.assertEqual(flight.do('key', lambda: 1), 1)
+        self.assertEqual(flight.do('key', lambda: 2), 2)
+
+    @patch('api.single_flight.requests.get', return_value='response')
+    def test_get(self, get):
+        self.assertEqual(single_flight.get('http://somewhere.url/v1',
+                                           timeout=5), 'response')
+        get.assert_called_once_with('http://somewhere.url/v1', timeout=5)
+
+
+@override_settings(SINGLE_FLIGHT=SHARED)
+class SharedFlightTestCase(SimpleTestCase):
+    """This class defines the test suite for the cross worker single flight."""
+
+    def setUp(self):
+        cache.clear()
+
+    def test_result_is_published(self):
+        self.assertEqual(shared_do('key', lambda: 'response'), 'response')
+        self.assertEqual(shared_do('key', lambda: 'other'), 'response')
+
+    def test_waiting_for_another_worker(self):
+        result_key = 'hcc:flight:result:{}'.format(
+            hashlib.md5(b'key').hexdigest())
+        # another worker holds the lock and publishes its result later
+        cache.set(LOCK_KEY, True)
+        timer = threading.Timer(0.05, cache.set,
+                                args=(result_key, 'response', 1))
+        timer.start()
+        result = shared_do('key', lambda: 'own request')
+        timer.join()
+        self.assertEqual(result, 'response')
+
+    @override_settings(SINGLE_FLIGHT=dict(SHARED, WAIT=0.05))
+    def test_own_request_if_no_result_shows_up(self):
+        cache.set(LOCK_KEY, True)
+        self.assertEqual(shared_do('key', lambda: 'own request'),
+                         'own request')
+
+    def test_own_request_if_the_leader_is_gone(self):
+        cache.set(LOCK_KEY, True)
+        threading.Timer(0.05, cache.delete, args=(LOCK_KEY,)).start()
+        started = time.monotonic()
+        self.assertEqual(shared_do('key', lambda: 'own request'),
+                         'own request')
+        self.assertLess(time.monotonic() - started, SHARED['WAIT'])
+
+    def test_errors_are_published(self):
+        def fail():
+            raise requests.ConnectionError('unreachable')
+
+        with self.assertRaises(requests.ConnectionError):
+            shared_do('key', fail)
+        # other workers get the error without a request of their own
+        with self.assertRaisesMessage(requests.ConnectionError, 'unreachable'):
+            shared_do('key', lambda: 'own request')
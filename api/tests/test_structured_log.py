@@ -0,0 +1,97 @@
+"""
+Testing Module for structured_log.py
+"""
+import json
+import logging
+from unittest.mock import patch
+
+import requests
+from django.contrib.auth.models import User
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+
+from api import single_flight
+from api.structured_log import JSONFormatter, log_context
+
+__author__ = "Jan Frömberg"
+__copyright__ = "Copyright 2018, GeRDI Project"
+__credits__ = ["Jan Frömberg"]
+__license__ = "Apache 2.0"
+__maintainer__ = "Jan Frömberg"
+__email__ = "jan.froemberg@tu-dresden.de"
+
+LOGGER = logging.getLogger('api.tests')
+
+
+class EnableLoggingMixin:
+    """Enable logging, the test settings (settings_local) disable it."""
+
+    def setUp(self):
+        super().setUp()
+        self.addCleanup(logging.disable, logging.root.manager.disable)
+        logging.disable(logging.NOTSET)
+
+
+class StructuredLogTestCase(EnableLoggingMixin, SimpleTestCase):
+    """This class defines the test suite for the structured log records."""
+
+    def test_records_carry_the_context(self):
+        with log_context(request_id='abc', user='ChuckNorris'):
+            with log_context(harvester='Harvester1'):
+                with self.assertLogs('api.tests') as logs:
+                    LOGGER.info("started %s", 'Harvester1',
+                                extra={'url': 'http://somewhere.url/v1'})
+            with self.assertLogs('api.tests') as outer:
+                LOGGER.info("done")
+        entry = json.loads(JSONFormatter().format(logs.records[0]))
+        self.assertEqual(entry['message'], 'started Harvester1')
+        self.assertEqual(entry['level'], 'INFO')
+        self.assertEqual(entry['request_id'], 'abc')
+        self.assertEqual(entry['user'], 'ChuckNorris')
+        self.assertEqual(entry['harvester'], 'Harvester1')
+        self.assertEqual(entry['url'], 'http://somewhere.url/v1')
+        entry = json.loads(JSONFormatter().format(outer.records[0]))
+        self.assertNotIn('harvester', entry)
+        self.assertEqual(entry['request_id'], 'abc')
+
+    @patch('api.single_flight.requests.put',
+           side_effect=requests.ConnectTimeout('timed out'))
+    def test_failed_upstream_calls_are_warnings(self, _put):
+        with self.assertLogs('api.structured_log', 'WARNING') as logs:
+            with self.assertRaises(requests.ConnectTimeout):
+                single_flight.request('PUT', 'http://somewhere.url/v1/')
+        record = logs.records[0]
+        self.assertEqual(record.url, 'http://somewhere.url/v1/')
+        self.assertEqual(record.method, 'PUT')
+        self.assertIsNotNone(record.latency)
+
+    @override_settings(STRUCTURED_LOG={'SLOW': 0})
+    @patch('api.single_flight.requests.get')
+    def test_slow_upstream_calls_are_warnings(self, get):
+        get.return_value.status_code = 200
+        with self.assertLogs('api.structured_log', 'WARNING') as logs:
+            single_flight.request('GET', 'http://somewhere.url/v1/')
+        self.assertEqual(logs.records[0].status, 200)
+
+
+class RequestLogMiddlewareTestCase(EnableLoggingMixin, TestCase):
+    """This class defines the test suite for the request ids."""
+
+    def test_request_ids(self):
+        response = self.client.get(reverse('health-live'))
+        self.assertEqual(len(response['X-Request-ID']), 32)
+        response = self.client.get(reverse('health-live'),
+                                   HTTP_X_REQUEST_ID='my-request')
+        self.assertEqual(response['X-Request-ID'], 'my-request')
+
+    @override_settings(STRUCTURED_LOG={'SLOW': 0})
+    def test_slow_requests_are_logged_with_user(self):
+        self.client.force_login(User.objects.create(username='ChuckNorris'))
+        with self.assertLogs('api.structured_log', 'WARNING') as logs:
+            self.client.get(reverse('hcc_gui'), HTTP_X_REQUEST_ID='abc')
+            # the user is not looked up for the log only
+            self.client.get(reverse('health-live'))
+        record = logs.records[0]
+        self.assertEqual((record.request_id, record.user, record.status),
+                         ('abc', 'ChuckNorris', 200))
+        self.assertIsNone(logs.records[1].user)
@@ -0,0 +1,65 @@
+"""
+Testing Module for summary.py
+"""
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase
+
+from api import harvester_cache
+from api.models import Harvester
+from api.summary import UNKNOWN, compute_summary, get_summary
+
+__author__ = "Jan Frömberg"
+__copyright__ = "Copyright 2018, GeRDI Project"
+__credits__ = ["Jan Frömberg"]
+__license__ = "Apache 2.0"
+__maintainer__ = "Jan Frömberg"
+__email__ = "jan.froemberg@tu-dresden.de"
+
+
+class SummaryTestCase(TestCase):
+    """This class defines the test suite for the fleet summary."""
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create(username="AnyUser")
+        self.harvesters = [
+            Harvester.objects.create(
+                name='Harvester{}'.format(i), owner=self.user,
+                url='http://somewhere.url/v{}'.format(i), enabled=True)
+            for i in range(3)]
+        Harvester.objects.create(name='Disabled', owner=self.user,
+                                 url='http://somewhere.url/disabled')
+
+    def test_summary_from_snapshots(self):
+        harvester_cache.set_snapshot(
+            self.harvesters[0],
+            {'Harvester0': {'status': 'Idle', 'cached_docs': 10, 'max_docs': 20}},
+            200)
+        harvester_cache.set_snapshot(
+            self.harvesters[1],
+            {'Harvester1': {'status': 'harvesting', 'cached_docs': 5,
+                            'max_docs': 'N/A'}},
+            200)
+        with self.assertNumQueries(2):
+            summary = compute_summary()
+        self.assertEqual(summary['num_harvesters'], 4)
+        self.assertEqual(summary['num_enabled_harvesters'], 3)
+        self.assertEqual(summary['num_disabled_harvesters'], 1)
+        self.assertEqual(summary['states'],
+                         {'idle': 1, 'harvesting': 1, UNKNOWN: 1})
+        self.assertEqual(summary['sum_harvested'], 15)
+        self.assertEqual(summary['sum_maxdocs'], 20)
+
+    def test_summary_is_cached(self):
+        self.assertEqual(get_summary()['num_harvesters'], 4)
+        with self.assertNumQueries(0):
+            self.assertEqual(get_summary()['num_harvesters'], 4)
+
+    def test_summary_is_invalidated(self):
+        get_summary()
+        Harvester.objects.create(name='Harvester9', owner=self.user,
+                                 url='http://somewhere.url/v9')
+        self.assertEqual(get_summary()['num_harvesters'], 5)
+        self.harvesters[0].delete()
+        self.assertEqual(get_summary()['num_enabled_harvesters'], 2)
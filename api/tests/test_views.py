@@ -1,19 +1,23 @@
 """
 Testing Module for views_v2.py
 """
+import datetime
 import json
 import os
 import urllib
 from unittest.mock import MagicMock, patch
 
 from django.contrib.auth.models import User
+from django.core.cache import cache
 from django.core.files import File
+from django.test import override_settings
 from django.urls import include, path, reverse
 from rest_framework import status
 from rest_framework.authtoken.models import Token
 from rest_framework.response import Response
 from rest_framework.test import APIClient, APITestCase, URLPatternsTestCase
 
+from api import harvester_cache
 from api.constants import HCCJSONConstants as HCCJC
 from api.models import Harvester
 
@@ -25,6 +29,9 @@ __maintainer__ = "Jan Frömberg"
 __email__ = "jan.froemberg@tu-dresden.de"
 
 
+# mocked api calls return their responses in call order,
+# so call the harvesters one after another
+@override_settings(HARVESTER_API_WORKERS=1)
 class ApiViewsTests(APITestCase, URLPatternsTestCase):
     """Test suite for the api views."""
     urlpatterns = [
@@ -81,6 +88,48 @@ class ApiViewsTests(APITestCase, URLPatternsTestCase):
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertContains(response, self.harvester)
 
+    def test_api_can_filter_harvesters(self):
+        """Test the api filters the harvester list."""
+        other = User.objects.create(username="BruceLee")
+        Harvester.objects.create(name='OtherHarvester', owner=other,
+                                 url='http://elsewhere.url/v1')
+        url = reverse('api:create')
+        filters = [
+            ({'enabled': 'true'}, ['Harvester1']),
+            ({'enabled': '0'}, ['OtherHarvester']),
+            ({'owner': 'BruceLee'}, ['OtherHarvester']),
+            ({'name__startswith': 'Harv'}, ['Harvester1']),
+            ({'url_host': 'ELSEWHERE.url'}, ['OtherHarvester']),
+        ]
+        for params, names in filters:
+            response = self.client.get(url, params, format="json")
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertEqual(
+                [harvester['name'] for harvester in response.data['results']],
+                names)
+
+    def test_api_rejects_invalid_enabled_filter(self):
+        """Test the api rejects an invalid enabled filter."""
+        response = self.client.get(reverse('api:create'),
+                                   {'enabled': 'maybe'}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_api_paginates_harvesters_by_cursor(self):
+        """Test the api pages through the harvester list with a cursor."""
+        for i in range(2, 5):
+            Harvester.objects.create(name='Harvester{}'.format(i),
+                                     owner=self.user,
+                                     url='http://somewhere{}.url/v1'.format(i))
+        response = self.client.get(reverse('api:create'), {'page_size': 3},
+                                   format="json")
+        names = [harvester['name'] for harvester in response.data['results']]
+        self.assertEqual(names, ['Harvester1', 'Harvester2', 'Harvester3'])
+        self.assertNotIn('count', response.data)
+        response = self.client.get(response.data['next'], format="json")
+        names = [harvester['name'] for harvester in response.data['results']]
+        self.assertEqual(names, ['Harvester4'])
+        self.assertIsNone(response.data['next'])
+
     def test_api_can_update_harvester(self):
         """Test the api can update a given harvester."""
         change_harvester = {
@@ -225,6 +274,38 @@ class ApiViewsTests(APITestCase, URLPatternsTestCase):
         self.assertEqual(response.data, expected_output)
         self.assertEqual(apicall.call_count, 2)
 
+    @patch('api.harvester_api_strategy.HarvesterApiStrategy.harvester_status',
+           return_value=Response({'Harvester2': "dummy message"},
+                                 status.HTTP_200_OK))
+    def test_harvester_states_view_filters_names(self, apicall):
+        """Only the states of the harvesters of a dashboard page are requested."""
+        for name in ("Harvester2", "Harvester3"):
+            Harvester.objects.create(name=name, owner=self.user,
+                                     url='http://somewhere.url/' + name)
+        url = reverse('api:all-harvester-status')
+        response = self.client.get(url, {'names': 'Harvester2,NoHarvester'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data, {"Harvester2": "dummy message"})
+        self.assertEqual(apicall.call_count, 1)
+
+    @patch('api.harvester_api_strategy.HarvesterApiStrategy.harvester_log',
+           return_value=Response({'Harvester1': {HCCJC.LOGS: "dummy log"}},
+                                 status.HTTP_200_OK))
+    def test_harvester_log_view_passes_date(self, apicall):
+        """Test the API command harvester-log with a date parameter."""
+        url = reverse('api:harvester-log',
+                      kwargs={'name': self.harvester.name})
+        response = self.client.get(url, {'date': '2019-01-31'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        apicall.assert_called_with(datetime.date(2019, 1, 31))
+
+    def test_harvester_log_view_rejects_invalid_date(self):
+        """Test the API command harvester-log with an invalid date."""
+        url = reverse('api:harvester-log',
+                      kwargs={'name': self.harvester.name})
+        response = self.client.get(url, {'date': '31.01.2019'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
     @patch('api.harvester_api_strategy.HarvesterApiStrategy.add_schedule',
            return_value=Response({'Harvester1': {HCCJC.HEALTH: {"message": "dummy message"}}},
                                  status.HTTP_200_OK))
@@ -288,7 +369,76 @@ class ApiViewsTests(APITestCase, URLPatternsTestCase):
                            content_type='application/json')
         apicall.assert_called()
 
-
+    @patch('api.views_v2.release')
+    @patch('api.single_flight.requests.get')
+    def test_pushed_state_is_served_without_polling(self, get, release):
+        """Test a pushed harvester state is the status of the harvester."""
+        cache.clear()
+        harvester_cache.set_version(self.harvester, 7)
+        state = {HCCJC.HEALTH: HCCJC.OK, HCCJC.STATE: 'HARVESTING',
+                 HCCJC.HARVESTED_COUNT: 42, HCCJC.REPO_NAME: 'Repository',
+                 HCCJC.MAX_DOCUMENT_COUNT: 84}
+        response = self.client.post(
+            reverse('api:harvester-state-push',
+                    kwargs={'name': self.harvester.name}),
+            state, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        response = self.client.get(
+            reverse('api:harvester-status',
+                    kwargs={'name': self.harvester.name}))
+        self.assertEqual(response.data[self.harvester.name][HCCJC.STATUS],
+                         'harvesting')
+        self.assertEqual(
+            response.data[self.harvester.name][HCCJC.PROGRESS_CURRENT], 50)
+        get.assert_not_called()
+        # a pushed state may free a slot of the admission queue
+        release.assert_called_once_with()
+
+    def test_pushed_state_needs_the_state_keys(self):
+        """Test an incomplete harvester state is rejected."""
+        response = self.client.post(
+            reverse('api:harvester-state-push',
+                    kwargs={'name': self.harvester.name}),
+            {HCCJC.HEALTH: HCCJC.OK}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn(HCCJC.HARVESTED_COUNT,
+                      response.data[self.harvester.name])
+
+    def test_pushed_state_needs_valid_values(self):
+        """Test a harvester state with invalid values is rejected."""
+        response = self.client.post(
+            reverse('api:harvester-state-push',
+                    kwargs={'name': self.harvester.name}),
+            {HCCJC.HEALTH: HCCJC.OK, HCCJC.STATE: [1],
+             HCCJC.HARVESTED_COUNT: 1, HCCJC.REPO_NAME: 'Repository'},
+            format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn(HCCJC.STATE, response.data[self.harvester.name])
+
+    def test_pushed_state_of_a_disabled_harvester(self):
+        """Test disabled harvesters can not push their state."""
+        self.harvester.disable()
+        response = self.client.post(
+            reverse('api:harvester-state-push',
+                    kwargs={'name': self.harvester.name}),
+            {}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_423_LOCKED)
+
+    def test_pushed_state_needs_the_owner(self):
+        """Test only the owner can push the state of a harvester."""
+        other = User.objects.create(username="BruceLee")
+        client = APIClient()
+        client.force_authenticate(user=other)
+        response = client.post(
+            reverse('api:harvester-state-push',
+                    kwargs={'name': self.harvester.name}),
+            {}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+
+# mocked api calls return their responses in call order,
+# so call the harvesters one after another
+@override_settings(HARVESTER_API_WORKERS=1)
 class ViewsTests(APITestCase, URLPatternsTestCase):
     """Test suite for the hcc views."""
     urlpatterns = [
@@ -710,7 +860,8 @@ class ViewsTests(APITestCase, URLPatternsTestCase):
                 "enabled": self.harvester.enabled
             }
         ]
-        self.assertEqual(json.loads(response.content), data)
+        self.assertEqual(json.loads(b''.join(response.streaming_content)),
+                         data)
 
     def test_harvester_file_form_view_response(self):
         url = reverse("harvester-file-form")
@@ -918,7 +1069,30 @@ class ViewsTests(APITestCase, URLPatternsTestCase):
     @patch('api.harvester_api_strategy.HarvesterApiStrategy.harvester_status',
            return_value=Response({'Harvester1': {HCCJC.CRONTAB: HCCJC.NO_CRONTAB}},
                                  status.HTTP_200_OK))
-    def test_hcc_gui_view_calls_api(self, apicall):
+    def test_hcc_gui_view_does_not_call_api(self, apicall):
+        """The status of the harvesters is loaded by the client."""
         url = reverse("hcc_gui")
-        self.client.get(url)
-        apicall.assert_called()
+        response = self.client.get(url)
+        apicall.assert_not_called()
+        self.assertEqual(response.context['status']['Harvester1'][HCCJC.STATUS],
+                         HCCJC.LOADING)
+
+    @override_settings(DASHBOARD_PAGE_SIZE=2)
+    def test_hcc_gui_view_is_paginated(self):
+        """Only one page of harvesters is rendered, counts are fleet-wide."""
+        for i in range(2, 6):
+            Harvester.objects.create(
+                name='Harvester{}'.format(i), owner=self.user,
+                url='http://somewhere.url/v{}'.format(i), enabled=True)
+        Harvester.objects.create(name='Disabled', owner=self.user,
+                                 url='http://somewhere.url/disabled')
+        url = reverse("hcc_gui")
+        response = self.client.get(url, {'page': 2})
+        self.assertEqual([harvester.name for harvester in response.context['harvesters']],
+                         ['Harvester3', 'Harvester4', 'Disabled'])
+        self.assertEqual(response.context['page_names'], 'Harvester3,Harvester4')
+        self.assertEqual(response.context['enabled_page'].paginator.num_pages, 3)
+        self.assertEqual(response.context['status']['num_enabled_harvesters'], 5)
+        self.assertEqual(response.context['status']['num_disabled_harvesters'], 1)
+        self.assertNotIn('Harvester1', response.context['forms'])
+        self.assertContains(response, '?names=Harvester3%2CHarvester4')
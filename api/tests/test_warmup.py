@@ -0,0 +1,104 @@
+"""
+Testing Module for warmup.py
+"""
+from unittest.mock import patch
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase, override_settings
+from rest_framework import status
+from rest_framework.response import Response
+
+from api import harvester_cache, warmup
+from api.models import Harvester
+
+__author__ = "Jan Frömberg"
+__copyright__ = "Copyright 2018, GeRDI Project"
+__credits__ = ["Jan Frömberg"]
+__license__ = "Apache 2.0"
+__maintainer__ = "Jan Frömberg"
+__email__ = "jan.froemberg@tu-dresden.de"
+
+
+@override_settings(HARVESTER_API_WORKERS=1)
+@patch('api.harvester_api.InitHarvester.__init__', return_value=None)
+@patch('api.harvester_api.InitHarvester.get_harvester_api')
+class WarmUpTestCase(TestCase):
+    """This class defines the test suite for the worker warm-up."""
+
+    def setUp(self):
+        cache.clear()
+        user = User.objects.create(username="AnyUser")
+        self.harvesters = [
+            Harvester.objects.create(
+                name='Harvester{}'.format(i), owner=user,
+                url='http://somewhere.url/v{}'.format(i), enabled=True)
+            for i in range(2)]
+        Harvester.objects.create(name='Disabled', owner=user,
+                                 url='http://somewhere.url/disabled')
+
+    def test_warm_up(self, get_api, init):
+        harvester_cache.set_snapshot(
+            self.harvesters[0], {'Harvester0': {'status': 'idle'}}, 200)
+        get_api.return_value.harvester_status.return_value = Response(
+            {'Harvester1': {'status': 'idle'}}, status=status.HTTP_200_OK)
+        self.assertEqual(warmup.warm_up(), 2)
+        # the versions of the enabled harvesters are probed,
+        # Harvester1 is initialized again to fetch its status
+        self.assertEqual(
+            sorted(call[0][0].name for call in init.call_args_list),
+            ['Harvester0', 'Harvester1', 'Harvester1'])
+        # the status is fetched for harvesters without a snapshot only
+        get_api.return_value.harvester_status.assert_called_once_with()
+        self.assertIsNotNone(harvester_cache.get_summary())
+
+    def test_one_worker_warms_the_cache(self, get_api, init):
+        get_api.return_value.harvester_status.return_value = Response(
+            {}, status=status.HTTP_200_OK)
+        self.assertEqual(warmup.warm_up(), 2)
+        init.reset_mock()
+        # the next worker finds the lock of the first one
+        self.assertIsNone(warmup.warm_up())
+        init.assert_not_called()
+
+
+class StartTestCase(SimpleTestCase):
+    """This class defines the test suite for starting the warm-up."""
+
+    @patch('api.warmup.connection')
+    @patch('api.warmup.time.sleep')
+    @patch('api.warmup.warm_up', side_effect=ValueError('boom'))
+    def test_errors_are_logged(self, _warm_up, sleep, connection):
+        with patch.object(warmup.LOGGER, 'exception') as log:
+            warmup.run()
+        log.assert_called_once_with("Warm-up failed.")
+        connection.close.assert_called_once_with()
+        # the workers of a fleet start their warm-up at random
+        delay = sleep.call_args[0][0]
+        self.assertTrue(0 <= delay <= warmup.JITTER)
+
+    @patch('api.warmup.threading.Thread')
+    def test_not_started_by_management_commands(self, thread):
+        with patch('api.warmup.sys.argv', ['manage.py', 'migrate']):
+            self.assertIsNone(warmup.start())
+        thread.assert_not_called()
+
+    @patch('api.warmup.threading.Thread')
+    def test_not_started_by_scripts(self, thread):
+        for argv in (['pytest', 'api'], ['python', 'script.py'], ['']):
+            with patch('api.warmup.sys.argv', argv):
+                self.assertIsNone(warmup.start())
+        thread.assert_not_called()
+
+    @patch('api.warmup.threading.Thread')
+    def test_started_by_the_server(self, thread):
+        with patch('api.warmup.sys.argv', ['gunicorn', 'hcc_py.wsgi']):
+            self.assertEqual(warmup.start(), thread.return_value)
+        thread.return_value.start.assert_called_once_with()
+
+    @override_settings(WARM_UP=False)
+    @patch('api.warmup.threading.Thread')
+    def test_can_be_disabled(self, thread):
+        with patch('api.warmup.sys.argv', ['gunicorn', 'hcc_py.wsgi']):
+            self.assertIsNone(warmup.start())
+        thread.assert_not_called()
@@ -18,7 +18,8 @@ from rest_framework.authtoken.views import obtain_auth_token
 from rest_framework.urlpatterns import format_suffix_patterns
 
 from . import views_v2 as views
-from .views_v2 import (HarvesterCreateView, HarvesterDetailsView,
+from .views_v2 import (BulkConfigView, BulkScheduleView, HarvesterCreateView,
+                       HarvesterDetailsView, HarvesterStateView,
                        ScheduleHarvesterView, UserDetailsView, UserView)
 
 __author__ = "Jan Frömberg"
@@ -37,6 +38,12 @@ urlpatterns = [
          views.start_harvesters, name="run-harvesters"),
     path('harvesters/stop',
          views.stop_harvesters, name="stop-harvesters"),
+    path('harvesters/schedules',
+         BulkScheduleView.as_view(), name="bulk-schedule"),
+    path('harvesters/config',
+         BulkConfigView.as_view(), name="bulk-config"),
+    path('harvesters/config-diff',
+         views.get_config_diff, name="config-diff"),
     path('harvesters/<str:name>/',
          HarvesterDetailsView.as_view(), name="harvester-detail"),
     path('harvesters/<str:name>/start/',
@@ -45,6 +52,10 @@ urlpatterns = [
          views.stop_harvest, name="stop-harvest"),
     path('harvesters/<str:name>/status/',
          views.get_harvester_state, name="harvester-status"),
+    path('harvesters/<str:name>/state/',
+         HarvesterStateView.as_view(), name="harvester-state-push"),
+    path('harvesters/<str:name>/log/',
+         views.get_harvester_log, name="harvester-log"),
     path('harvesters/status',
          views.get_harvester_states, name="all-harvester-status"),
     path('harvesters/<str:name>/schedule/',
@@ -53,6 +64,7 @@ urlpatterns = [
         'harvesters/<str:name>/harvesterapiinfo',
         views.harvester_api_info,
         name="harvester-api-info"),
+    path('logs/', views.search_logs, name="log-search"),
     path('users/',
          UserView.as_view(), name="users"),
     path('users/<int:pk>/',
@@ -2,7 +2,7 @@
 This is the views module which encapsulates the backend logic
 which will be riggered via the corresponding path (url).
 """
-import collections
+import datetime
 import json
 import logging
 
@@ -12,28 +12,40 @@ from django.contrib.auth.decorators import login_required
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.contrib.auth.models import User
 from django.contrib.messages.views import SuccessMessageMixin
-from django.http import HttpResponse, HttpResponseRedirect, JsonResponse
+from django.http import (Http404, HttpResponse, HttpResponseRedirect,
+                         JsonResponse, StreamingHttpResponse)
 from django.shortcuts import get_object_or_404, render
 from django.urls import reverse
 from django.views.generic import RedirectView
 from django.views.generic.base import View
 from django.views.generic.edit import FormMixin
 from rest_framework import generics, permissions, status
-from rest_framework.authentication import (BasicAuthentication,
-                                           TokenAuthentication)
-from rest_framework.decorators import api_view, permission_classes
+from rest_framework.authentication import BasicAuthentication
+from rest_framework.decorators import (api_view, permission_classes,
+                                       renderer_classes)
+from rest_framework.exceptions import ValidationError
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.renderers import BrowsableAPIRenderer
 from rest_framework.response import Response
 
+from api import (bulk_config, bulk_schedule, config_diff, harvester_cache,
+                 health, log_index, registry)
+from api.admission import dequeue, release, start_harvests
+from api.authentication import CachedTokenAuthentication
+from api.constants import HarvesterApiConstantsV7
 from api.constants import HCCJSONConstants as HCCJC
 from api.forms import (HarvesterForm, SchedulerForm, UploadFileForm,
-                       ValidateFileForm, create_config_fields,
-                       create_config_form)
-from api.harvester_api import InitHarvester
+                       create_config_fields, create_config_form)
+from api.harvester_api import InitHarvester, call_harvester_apis
+from api.harvester_api_strategy import push_harvester_state
 from api.mixins import AjaxableResponseMixin
 from api.models import Harvester
+from api.pagination import CountedPaginator, HarvesterCursorPagination
 from api.permissions import IsOwner
-from api.serializers import HarvesterSerializer, UserSerializer
+from api.renderers import FastJSONRenderer, FastJsonResponse
+from api.serializers import (BulkConfigSerializer, BulkScheduleSerializer,
+                             HarvesterSerializer, UserSerializer)
+from api.summary import get_summary
 
 __author__ = "Jan Frömberg, Laura Höhle"
 __copyright__ = "Copyright 2018, GeRDI Project"
@@ -113,8 +125,10 @@ def stop_harvester(request, name):
     :return: an HttpResponseRedirect to the Main HCC page
     """
     harvester = get_object_or_404(Harvester, name=name)
+    dequeue([harvester])
     api = InitHarvester(harvester).get_harvester_api()
     response = api.stop_harvest()
+    release()
     messages.add_message(request, messages.INFO,
                          name + ': ' + str(response.data[harvester.name]))
     return HttpResponseRedirect(reverse('hcc_gui'))
@@ -130,8 +144,7 @@ def start_harvester(request, name):
     :return: an HttpResponseRedirect to the Main HCC page
     """
     harvester = get_object_or_404(Harvester, name=name)
-    api = InitHarvester(harvester).get_harvester_api()
-    response = api.start_harvest()
+    _harvester, response = start_harvests([harvester])[0]
     messages.add_message(request, messages.INFO,
                          name + ': ' + str(response.data[harvester.name]))
     return HttpResponseRedirect(reverse('hcc_gui'))
@@ -147,12 +160,15 @@ def start_selected_harvesters(request, hnames):
     :return: an HttpResponseRedirect to the Main HCC page
     """
     names = hnames.split('-')
-    for name in names:
-        harvester = get_object_or_404(Harvester, name=name)
-        api = InitHarvester(harvester).get_harvester_api()
-        response = api.start_harvest()
+    found = {harvester.name: harvester for harvester in
+             Harvester.objects.filter(name__in=names)}
+    missing = [name for name in names if name not in found]
+    if missing:
+        raise Http404('No Harvester matches: {}'.format(', '.join(missing)))
+    harvesters = [found[name] for name in names]
+    for harvester, response in start_harvests(harvesters):
         messages.add_message(request, messages.INFO,
-                             name + ': ' + str(response.data[harvester.name]))
+                             harvester.name + ': ' + str(response.data[harvester.name]))
     return HttpResponseRedirect(reverse('hcc_gui'))
 
 
@@ -173,36 +189,113 @@ def reset_harvester(request, name):
     return HttpResponseRedirect(reverse('hcc_gui'))
 
 
+def parse_log_date(request):
+    """
+    This function parses the optional date query parameter of a log request.
+
+    :param request: the request
+    :return: a date or None if no date was requested
+    :raises ValueError: if the date does not match the harvester log format
+    """
+    date_string = request.GET.get('date')
+    if not date_string:
+        return None
+    return datetime.datetime.strptime(
+        date_string, HarvesterApiConstantsV7.HARVESTER_LOG_FORMAT).date()
+
+
 @login_required
 def get_all_harvester_log(request):
     """
     This function gets the logfile for each harvester.
+    An optional ?date=YYYY-MM-DD parameter selects the day (default: today).
 
     :param request: the request
     :return: JSON Feedback Array
     """
+    try:
+        date = parse_log_date(request)
+    except ValueError:
+        return HttpResponse('Invalid date. Use the format YYYY-MM-DD.',
+                            status=status.HTTP_400_BAD_REQUEST)
     feedback = {}
     feedback[HCCJC.LOG_DATA] = {}
-    harvesters = Harvester.objects.all()
-    for harvester in harvesters:
-        if harvester.enabled:
-            api = InitHarvester(harvester).get_harvester_api()
-            response = api.harvester_log()
-            feedback[HCCJC.LOG_DATA][harvester.name] = response.data[harvester.name][HCCJC.LOGS]
+    harvesters = Harvester.objects.filter(enabled=True)
+    for harvester, response in call_harvester_apis(harvesters, 'harvester_log', date):
+        feedback[HCCJC.LOG_DATA][harvester.name] = response.data[harvester.name][HCCJC.LOGS]
+    feedback['log_date'] = date or datetime.date.today()
     return render(request, "hcc/harvester_logs.html", feedback)
 
 
+def config_diff_harvesters(names):
+    """
+    Return the harvesters to compare: the given comma separated names
+    or all enabled harvesters.
+    """
+    if names:
+        return Harvester.objects.filter(name__in=names.split(','))
+    return Harvester.objects.filter(enabled=True)
+
+
+@login_required
+def harvester_config_diff(request):
+    """
+    This function shows the configuration parameters which differ between
+    the harvesters. An optional ?names= parameter (comma separated harvester
+    names) selects the harvesters (default: all enabled harvesters).
+    """
+    harvesters = config_diff_harvesters(request.GET.get('names'))
+    return render(request, "hcc/harvester_config_diff.html",
+                  config_diff.config_diff(harvesters))
+
+
+def search_log_index(params):
+    """
+    Search the structured logs with the query parameters q (full text),
+    since (ISO 8601), limit and the exact filters of log_index.FILTERS.
+
+    :return: a dictionary with the number of records and the records,
+        the newest first
+    """
+    filters = {field: params[field] for field in log_index.FILTERS
+               if params.get(field)}
+    results = log_index.search(query=params.get('q'),
+                               since=params.get('since'),
+                               limit=params.get('limit'), **filters)
+    return {'count': len(results), 'results': results}
+
+
 @login_required
 def get_hcc_log(request):
-    """ A function to get the hcc logfile -> [settings.py] ./log/debug.log """
-    filename = settings.LOGGING['handlers']['filedebug']['filename']
-    content = filename + "<br>"
-    with open(filename, 'r') as file:
-        content += file.read().replace('\n', '<br>')
-    response = HttpResponse(content, content_type='text/plain')
-    response['Content-Disposition'] = 'attachment; filename={0}'.format(
-        filename)
-    return response
+    """
+    A function to search the structured hcc logs (see search_log_index),
+    e.g. ?q=timeout&harvester=name&level=warning.
+    """
+    try:
+        feedback = search_log_index(request.GET)
+    except ValueError as err:
+        return FastJsonResponse({'message': str(err)},
+                                status=status.HTTP_400_BAD_REQUEST)
+    return FastJsonResponse(feedback)
+
+
+@login_required
+def hcc_log_search(request):
+    """
+    This function renders the search form and the matching records of the
+    structured hcc logs (see search_log_index).
+
+    :param request: the request
+    :return: an HttpResponse of the hcc logs modal
+    """
+    feedback = {'query': request.GET,
+                'levels': ('DEBUG', 'INFO', 'WARNING', 'ERROR', 'CRITICAL'),
+                'harvesters': Harvester.objects.values_list('name', flat=True)}
+    try:
+        feedback.update(search_log_index(request.GET))
+    except ValueError as err:
+        feedback['error'] = str(err)
+    return render(request, "hcc/hcc_logs.html", feedback)
 
 
 @login_required
@@ -218,7 +311,7 @@ def get_harvester_progress(request, name):
     api = InitHarvester(harvester).get_harvester_api()
     response = api.harvester_progress()
     feedback[harvester.name] = response.data[harvester.name]
-    return JsonResponse(feedback, status=response.status_code)
+    return FastJsonResponse(feedback, status=response.status_code)
 
 
 @login_required
@@ -231,7 +324,7 @@ def harvester_status_history(request, name):
     api = InitHarvester(harvester).get_harvester_api()
     response = api.status_history()
     feedback["message"] = response.data
-    return JsonResponse(feedback)
+    return FastJsonResponse(feedback)
 
 
 @login_required
@@ -242,19 +335,16 @@ def start_all_harvesters(request):
     :param request: the request
     :return: an HttpResponseRedirect to the Main HCC page
     """
-    harvesters = Harvester.objects.all()
-    for harvester in harvesters:
-        if harvester.enabled:
-            api = InitHarvester(harvester).get_harvester_api()
-            response = api.start_harvest()
-            if HCCJC.HEALTH in response.data[harvester.name]:
-                msg = harvester.name + ': ' + response.data[harvester.name][
-                    HCCJC.HEALTH]
-                messages.add_message(request, messages.INFO, msg)
-            else:
-                msg = harvester.name + ': ' + str(
-                    response.data[harvester.name])
-                messages.add_message(request, messages.INFO, msg)
+    harvesters = Harvester.objects.filter(enabled=True)
+    for harvester, response in start_harvests(harvesters):
+        if HCCJC.HEALTH in response.data[harvester.name]:
+            msg = harvester.name + ': ' + response.data[harvester.name][
+                HCCJC.HEALTH]
+            messages.add_message(request, messages.INFO, msg)
+        else:
+            msg = harvester.name + ': ' + str(
+                response.data[harvester.name])
+            messages.add_message(request, messages.INFO, msg)
 
     return HttpResponseRedirect(reverse('hcc_gui'))
 
@@ -267,19 +357,19 @@ def abort_all_harvesters(request):
     :param request: the request
     :return: an HttpResponseRedirect to the Main HCC page
     """
-    harvesters = Harvester.objects.all()
-    for harvester in harvesters:
-        if harvester.enabled:
-            api = InitHarvester(harvester).get_harvester_api()
-            response = api.stop_harvest()
-            if HCCJC.HEALTH in response.data[harvester.name]:
-                msg = harvester.name + ': ' + response.data[harvester.name][
-                    HCCJC.HEALTH]
-                messages.add_message(request, messages.INFO, msg)
-            else:
-                msg = harvester.name + ': ' + str(
-                    response.data[harvester.name])
-                messages.add_message(request, messages.INFO, msg)
+    harvesters = Harvester.objects.filter(enabled=True)
+    dequeue(harvesters)
+    stopped = call_harvester_apis(harvesters, 'stop_harvest')
+    release()
+    for harvester, response in stopped:
+        if HCCJC.HEALTH in response.data[harvester.name]:
+            msg = harvester.name + ': ' + response.data[harvester.name][
+                HCCJC.HEALTH]
+            messages.add_message(request, messages.INFO, msg)
+        else:
+            msg = harvester.name + ': ' + str(
+                response.data[harvester.name])
+            messages.add_message(request, messages.INFO, msg)
     return HttpResponseRedirect(reverse('hcc_gui'))
 
 
@@ -358,49 +448,40 @@ def home(request):
     # if user is logged in
     if request.user.is_authenticated:
         forms = {}
-        response = None
-        harvesters = Harvester.objects.all()
-        num_harvesters = len(harvesters)
-        num_enabled_harvesters = 0
-        num_disabled_harvesters = 0
-        # get status of each enabled harvester
-        for harvester in harvesters:
-            # TODO do that call at client side!!
-            if harvester.enabled:
-                num_enabled_harvesters += 1
-                api = InitHarvester(harvester).get_harvester_api()
-                response = api.harvester_status()
-                forms[harvester.name] = create_form(response, harvester.name)
-                if response:
-                    feedback[harvester.name] = response.data[harvester.name]
-                else:
-                    feedback[harvester.name] = {}
-                    feedback[harvester.name][HCCJC.GUI_STATUS] = HCCJC.WARNING
-                    err = 'Error : no response object'
-                    feedback[harvester.name][HCCJC.HEALTH] = err
-            else:
-                num_disabled_harvesters += 1
-
-        # get total amount of docs
-        sum_harvested = 0
-        sum_max_docs = 0
-        for harvester in feedback.values():
-            if isinstance(harvester, dict):
-                for (_k, _v) in harvester.items():
-                    if _k == HCCJC.CACHED_DOCS:
-                        sum_harvested += int(_v)
-                    if _k == HCCJC.MAX_DOCUMENTS:
-                        if _v != 'N/A':
-                            sum_max_docs += int(_v)
-
-        feedback['sum_harvested'] = sum_harvested
-        feedback['sum_maxdocs'] = sum_max_docs
-        feedback['num_disabled_harvesters'] = num_disabled_harvesters
-        feedback['num_enabled_harvesters'] = num_enabled_harvesters
-        feedback['num_harvesters'] = num_harvesters
+        summary = get_summary()
+        # only one page of enabled and of disabled harvesters is rendered,
+        # the counts and totals of the whole fleet come from the summary
+        enabled_page = CountedPaginator(
+            Harvester.objects.filter(enabled=True),
+            settings.DASHBOARD_PAGE_SIZE,
+            summary['num_enabled_harvesters']).get_page(
+                request.GET.get('page'))
+        disabled_page = CountedPaginator(
+            Harvester.objects.filter(enabled=False),
+            settings.DASHBOARD_PAGE_SIZE,
+            summary['num_disabled_harvesters']).get_page(
+                request.GET.get('disabled_page'))
+        enabled_harvesters = list(enabled_page)
+        harvesters = enabled_harvesters + list(disabled_page)
+        # the page is rendered from the database only, the cards get
+        # their status from the all-harvester-status endpoint (see hcc.js)
+        for harvester in enabled_harvesters:
+            forms[harvester.name] = create_form(None, harvester.name)
+            feedback[harvester.name] = {
+                HCCJC.STATUS: HCCJC.LOADING,
+                HCCJC.GUI_STATUS: HCCJC.INFO,
+                HCCJC.HEALTH: HCCJC.OK,
+                HCCJC.MAX_DOCUMENTS: HCCJC.N_A,
+                HCCJC.PROGRESS_CURRENT: 0,
+            }
+
+        for key in ('num_harvesters', 'num_enabled_harvesters',
+                    'num_disabled_harvesters', 'sum_harvested',
+                    'sum_maxdocs', 'states'):
+            feedback[key] = summary[key]
         msg = '{} enabled Harvesters with total amount \
-               of harvested Items so far: {}'.format(num_enabled_harvesters,
-                                                     sum_harvested)
+               of harvested Items so far: {}'.format(
+                   summary['num_enabled_harvesters'], summary['sum_harvested'])
         messages.add_message(request, messages.INFO, msg)
 
         # init form
@@ -412,6 +493,10 @@ def home(request):
         return render(
             request, 'hcc/index.html', {
                 'harvesters': harvesters,
+                'enabled_page': enabled_page,
+                'disabled_page': disabled_page,
+                'page_names': ','.join(
+                    harvester.name for harvester in enabled_harvesters),
                 'status': feedback,
                 'forms': forms,
                 'theme': theme,
@@ -424,6 +509,26 @@ def home(request):
     })
 
 
+def liveness(request):
+    """
+    Liveness check for load balancers and orchestrators.
+    Answers without touching the database or a harvester.
+    """
+    return FastJsonResponse({'status': health.OK})
+
+
+def readiness(request):
+    """
+    Readiness check for load balancers and orchestrators.
+    Checks the database, the poller heartbeat and the snapshot age,
+    but never calls a harvester.
+    """
+    ready, report = health.readiness()
+    return FastJsonResponse(
+        report, status=status.HTTP_200_OK if ready
+        else status.HTTP_503_SERVICE_UNAVAILABLE)
+
+
 @login_required
 def update_session(request):
     """
@@ -463,9 +568,7 @@ def start_harvesters(request, format=None):
     """
     feedback = {}
     harvesters = Harvester.objects.all()
-    for harvester in harvesters:
-        api = InitHarvester(harvester).get_harvester_api()
-        response = api.start_harvest()
+    for harvester, response in start_harvests(harvesters):
         feedback[harvester.name] = response.data[harvester.name]
     return Response(feedback, status=status.HTTP_200_OK)
 
@@ -477,8 +580,8 @@ def start_harvest(request, name, format=None):
     Start harvest via POST request to an harvester url-endpoint.
     """
     harvester = Harvester.objects.get(name=name)
-    api = InitHarvester(harvester).get_harvester_api()
-    return api.start_harvest()
+    _harvester, response = start_harvests([harvester])[0]
+    return response
 
 
 @api_view(['POST'])
@@ -488,8 +591,11 @@ def stop_harvest(request, name, format=None):
     Stop harvest via POST request to an harvester url-endpoint.
     """
     harvester = Harvester.objects.get(name=name)
+    dequeue([harvester])
     api = InitHarvester(harvester).get_harvester_api()
-    return api.stop_harvest()
+    response = api.stop_harvest()
+    release()
+    return response
 
 
 @api_view(['POST'])
@@ -500,15 +606,17 @@ def stop_harvesters(request, format=None):
     """
     feedback = {}
     harvesters = Harvester.objects.all()
-    for harvester in harvesters:
-        api = InitHarvester(harvester).get_harvester_api()
-        response = api.stop_harvest()
+    dequeue(harvesters)
+    stopped = call_harvester_apis(harvesters, 'stop_harvest')
+    release()
+    for harvester, response in stopped:
         feedback[harvester.name] = response.data[harvester.name]
     return Response(feedback, status=status.HTTP_200_OK)
 
 
 @api_view(['GET'])
 @permission_classes((IsAuthenticated, ))
+@renderer_classes((FastJSONRenderer, BrowsableAPIRenderer))
 def get_harvester_state(request, name, format=None):
     """
     View to show an harvester state via GET request.
@@ -520,124 +628,101 @@ def get_harvester_state(request, name, format=None):
 
 @api_view(['GET'])
 @permission_classes((IsAuthenticated, ))
+def get_harvester_log(request, name, format=None):
+    """
+    View to show the log of an harvester via GET request.
+    An optional ?date=YYYY-MM-DD parameter selects the day (default: today).
+    """
+    harvester = get_object_or_404(Harvester, name=name)
+    try:
+        date = parse_log_date(request)
+    except ValueError:
+        return Response({harvester.name: {
+            HCCJC.LOGS: 'Invalid date. Use the format YYYY-MM-DD.'
+        }}, status=status.HTTP_400_BAD_REQUEST)
+    api = InitHarvester(harvester).get_harvester_api()
+    return api.harvester_log(date)
+
+
+@api_view(['GET'])
+@permission_classes((IsAuthenticated, ))
+@renderer_classes((FastJSONRenderer, BrowsableAPIRenderer))
 def get_harvester_states(request, format=None):
     """
     View to show all harvester states via GET request.
+    The optional query parameter names (comma separated harvester names)
+    restricts the states, e.g. to the harvesters of a dashboard page.
     """
     feedback = {}
     harvesters = Harvester.objects.all()
-    for harvester in harvesters:
-        api = InitHarvester(harvester).get_harvester_api()
-        response = api.harvester_status()
+    names = request.query_params.get('names')
+    if names:
+        harvesters = harvesters.filter(name__in=names.split(','))
+    for harvester, response in call_harvester_apis(harvesters, 'harvester_status'):
         feedback[harvester.name] = response.data[harvester.name]
     return Response(feedback, status=status.HTTP_200_OK)
 
 
+@api_view(['GET'])
+@permission_classes((IsAuthenticated, ))
+@renderer_classes((FastJSONRenderer, BrowsableAPIRenderer))
+def search_logs(request, format=None):
+    """
+    View to search the structured hcc logs via GET request, e.g.
+    ?q=timeout&harvester=name&level=warning&since=2019-08-27.
+    Further filters: logger, request_id, user, status and limit.
+    """
+    try:
+        feedback = search_log_index(request.query_params)
+    except ValueError as err:
+        return Response({'message': str(err)},
+                        status=status.HTTP_400_BAD_REQUEST)
+    return Response(feedback, status=status.HTTP_200_OK)
+
+
+@api_view(['GET'])
+@permission_classes((IsAuthenticated, ))
+@renderer_classes((FastJSONRenderer, BrowsableAPIRenderer))
+def get_config_diff(request, format=None):
+    """
+    View to show the configuration parameters which differ between harvesters
+    via GET request. The optional query parameter names (comma separated
+    harvester names) selects the harvesters (default: all enabled harvesters).
+    """
+    harvesters = config_diff_harvesters(request.query_params.get('names'))
+    return Response(config_diff.config_diff(harvesters),
+                    status=status.HTTP_200_OK)
+
+
 @login_required
 def harvester_data_to_file(request):
     """
-    Function that gets data of all harvesters in the database and returns it
-    through a file.
+    Function that streams the data of all harvesters in the database as
+    a file, a JSON array or NDJSON (?format=ndjson, one harvester per line).
     """
-    data = list(Harvester.objects.values('name', 'notes', 'url', 'enabled'))
-
-    return JsonResponse(data, safe=False)
+    if request.GET.get('format') == registry.NDJSON:
+        content = registry.export_ndjson(Harvester.objects.all())
+        content_type = registry.CONTENT_TYPES[registry.NDJSON]
+    else:
+        content = registry.export_json(Harvester.objects.all())
+        content_type = registry.CONTENT_TYPES[registry.JSON]
+    return StreamingHttpResponse(content, content_type=content_type)
 
 
 @login_required
 def upload_file(request):
     """
     This function handles POST requests to upload a file
-    containing harvester data and add it to the database
-    """
-    data = {}
-    f = request.FILES['upload_file']
-    # Check if file type is correct and get the content
-    if f.content_type == 'application/json':
-        try:
-            content = json.load(f)
-        except json.JSONDecodeError:
-            message = (
-                'Upload failed. '
-                'File content was either wrong formatted or empty. '
-                'Must be a JSON array of objects with harvester data.'
-            )
-            messages.warning(request, message)
-            return HttpResponseRedirect(reverse('hcc_gui'))
-    else:
-        message = (
-            'Upload failed. '
-            'File type could not been handled. '
-            'Must be a JSON file!'
-        )
-        messages.warning(request, message)
+    containing harvester data (a JSON array or NDJSON) and add it to the
+    database. The file is parsed and imported batch by batch.
+    """
+    try:
+        registry.import_records(registry.parse(request.FILES['upload_file']),
+                                request.user)
+    except registry.RegistryError as err:
+        messages.warning(request, str(err))
         return HttpResponseRedirect(reverse('hcc_gui'))
 
-    required_keys = ('name', 'notes', 'url', 'enabled')
-    for harvester_data in content:
-        # 'content' should be a list of dictionaries
-        if not isinstance(harvester_data, collections.Mapping):
-            message = (
-                'Validation failed. '
-                'File content could not been handled.'
-                'Should be a list of dictionaries!'
-            )
-            messages.warning(request, message)
-            return HttpResponseRedirect(reverse('hcc_gui'))
-
-        # The json file should contain the required harvester data
-        if not all(key in harvester_data for key in required_keys):
-            message = (
-                'Validation failed. '
-                'Key missmatch! Required: name, notes, url, enabled'
-            )
-            messages.warning(request, message)
-            return HttpResponseRedirect(reverse('hcc_gui'))
-
-        data = harvester_data.copy()
-        if Harvester.objects.filter(name=harvester_data['name']).exists():
-            # Harvester already exists -> update harvester
-            harvester = Harvester.objects.get(name=harvester_data['name'])
-            data['notes'] = harvester.notes  # Notes should not be updated
-            if ((harvester.url == harvester_data['url']
-                 and harvester.enabled == harvester_data['enabled'])):
-                continue
-            elif not harvester.url == harvester_data['url']:
-                if Harvester.objects.filter(
-                        url=harvester_data['url']).exists():
-                    # The url should be unique. Leave the existing harvester data
-                    # and ignore the new one.
-                    continue
-                # Create new Harvester with new url
-                harvester = Harvester(owner=request.user)
-                counter = 1
-                while True:
-                    # Loop until the harvester name is not already used
-                    postfix = '_{}'.format(counter)
-                    temp_name = harvester_data['name'] + postfix
-                    if not Harvester.objects.filter(name=temp_name).exists():
-                        data['name'] = temp_name
-                        break
-                    counter += 1
-        elif Harvester.objects.filter(url=harvester_data['url']).exists():
-            # The url should be unique. Leave the existing harvester data
-            # and ignore the new one
-            continue
-        else:
-            # Create a new harvester
-            harvester = Harvester(owner=request.user)
-
-        form = ValidateFileForm(data, instance=harvester)
-        if form.is_valid():
-            form.save()
-        else:
-            message = (
-                'Validation failed. '
-                'Content data could not been saved.'
-            )
-            messages.warning(request, message)
-            return HttpResponseRedirect(reverse('hcc_gui'))
-
     messages.success(request, 'Upload successful!')
     return HttpResponseRedirect(reverse('hcc_gui'))
 
@@ -653,22 +738,125 @@ def upload_file_form(request):
     return render(request, "hcc/file_upload_form.html", data)
 
 
+def filter_harvesters(queryset, params):
+    """
+    Filter harvesters via enabled, owner, name__startswith and url_host.
+
+    :param queryset: a harvester queryset
+    :param params: a dictionary of filters, e.g. the query parameters
+    :return: the filtered queryset
+    """
+    if 'enabled' in params:
+        enabled = params['enabled'].lower()
+        if enabled not in ('true', 'false', '1', '0'):
+            raise ValidationError(
+                {'enabled': 'Must be one of true, false, 1 or 0.'})
+        queryset = queryset.filter(enabled=enabled in ('true', '1'))
+    if 'owner' in params:
+        queryset = queryset.filter(owner__username=params['owner'])
+    if 'name__startswith' in params:
+        queryset = queryset.filter(
+            name__startswith=params['name__startswith'])
+    if 'url_host' in params:
+        queryset = queryset.filter(url_host=params['url_host'].lower())
+    return queryset
+
+
 class HarvesterCreateView(generics.ListCreateAPIView):
     """
     This class handles the GET and POST requests
     to create/register a new harvester
     to our Harvester Control Center REST-API.
+    Harvester lists can be filtered via ?enabled=, ?owner=,
+    ?name__startswith= and ?url_host= and are paginated by a cursor.
     """
-    authentication_classes = (BasicAuthentication, TokenAuthentication)
-    queryset = Harvester.objects.all()
+    authentication_classes = (BasicAuthentication, CachedTokenAuthentication)
+    queryset = Harvester.objects.select_related('owner')
     serializer_class = HarvesterSerializer
     permission_classes = (permissions.IsAuthenticated, IsOwner)
+    pagination_class = HarvesterCursorPagination
+
+    def get_queryset(self):
+        """Filter the harvesters by the given query parameters."""
+        return filter_harvesters(super().get_queryset(),
+                                 self.request.query_params)
 
     def perform_create(self, serializer):
         """Save the post data when creating a new harvester."""
         serializer.save(owner=self.request.user)
 
 
+class BulkScheduleView(generics.GenericAPIView):
+    """
+    This class handles POST requests to set the schedules of many
+    harvesters at once, either desired crontabs by harvester name or
+    the same crontabs for all harvesters matching a filter (see
+    HarvesterCreateView). The current crontabs are fetched and changed
+    concurrently, only the difference is applied. Only enabled harvesters
+    of the requesting user are changed. The response reports the outcome
+    of every harvester.
+    """
+    authentication_classes = (BasicAuthentication, CachedTokenAuthentication)
+    queryset = Harvester.objects.filter(enabled=True)
+    serializer_class = BulkScheduleSerializer
+    permission_classes = (permissions.IsAuthenticated, )
+
+    def post(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+        harvesters = self.get_queryset().filter(owner=request.user)
+        report = {}
+        if 'schedules' in data:
+            found = {harvester.name: harvester for harvester in
+                     harvesters.filter(name__in=list(data['schedules']))}
+            schedules = {}
+            for name, crontabs in data['schedules'].items():
+                if name in found:
+                    schedules[found[name]] = crontabs
+                else:
+                    report[name] = {'status': bulk_schedule.FAILED,
+                                    'error': 'no enabled harvester of yours'}
+        else:
+            schedules = {harvester: data['crontabs'] for harvester in
+                         filter_harvesters(harvesters, data['filter'])}
+        report.update(bulk_schedule.apply_schedules(schedules))
+        return Response(report, status=status.HTTP_200_OK)
+
+
+class BulkConfigView(generics.GenericAPIView):
+    """
+    This class handles POST requests to push the same config changes
+    ('section.key': value) to many harvesters at once, either by harvester
+    name or to all harvesters matching a filter (see HarvesterCreateView).
+    The changes are pushed concurrently to the harvesters with a supported
+    library version. Only enabled harvesters of the requesting user are
+    changed. The response reports the outcome of every harvester.
+    """
+    authentication_classes = (BasicAuthentication, CachedTokenAuthentication)
+    queryset = Harvester.objects.filter(enabled=True)
+    serializer_class = BulkConfigSerializer
+    permission_classes = (permissions.IsAuthenticated, )
+
+    def post(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+        harvesters = self.get_queryset().filter(owner=request.user)
+        report = {}
+        if 'names' in data:
+            harvesters = list(harvesters.filter(name__in=data['names']))
+            found = {harvester.name for harvester in harvesters}
+            for name in data['names']:
+                if name not in found:
+                    report[name] = {'status': bulk_config.FAILED,
+                                    'error': 'no enabled harvester of yours'}
+        else:
+            harvesters = filter_harvesters(harvesters, data['filter'])
+        report.update(bulk_config.push_configs(harvesters, data['changes']))
+        return Response(report, status=status.HTTP_200_OK)
+
+
 class HarvesterDetailsView(generics.RetrieveUpdateDestroyAPIView):
     """
     This class handles GET, PUT, PATCH and DELETE requests.
@@ -676,17 +864,47 @@ class HarvesterDetailsView(generics.RetrieveUpdateDestroyAPIView):
     """
     authentication_classes = (BasicAuthentication, )
     lookup_field = 'name'
-    queryset = Harvester.objects.all()
+    queryset = Harvester.objects.select_related('owner')
     serializer_class = HarvesterSerializer
     permission_classes = (permissions.IsAuthenticated, IsOwner)
 
 
+class HarvesterStateView(generics.GenericAPIView):
+    """
+    This class handles POST requests of harvesters (or a sidecar)
+    pushing their state document, i.e. the body of their GET / response,
+    whenever it changes. The state is served as status snapshot without
+    polling the harvester, which is only polled if it stays silent.
+    Only the owner of a harvester may push its state.
+    """
+    authentication_classes = (BasicAuthentication, CachedTokenAuthentication)
+    lookup_field = 'name'
+    queryset = Harvester.objects.select_related('owner')
+    permission_classes = (permissions.IsAuthenticated, IsOwner)
+
+    def post(self, request, *args, **kwargs):
+        harvester = self.get_object()
+        if not harvester.enabled:
+            return Response({harvester.name: 'disabled'},
+                            status=status.HTTP_423_LOCKED)
+        try:
+            snapshot = push_harvester_state(harvester, request.data)
+        except ValueError as err:
+            return Response({harvester.name: str(err)},
+                            status=status.HTTP_400_BAD_REQUEST)
+        LOGGER.debug("%s pushed its state.", harvester.name)
+        # the harvest may have finished
+        release()
+        return Response(snapshot[harvester_cache.DATA],
+                        status=status.HTTP_200_OK)
+
+
 class UserView(generics.ListAPIView):
     """
     View to list the control center registered users.
     """
     authentication_classes = (BasicAuthentication, )
-    queryset = User.objects.all()
+    queryset = User.objects.prefetch_related('harvester')
     serializer_class = UserSerializer
 
 
@@ -695,7 +913,7 @@ class UserDetailsView(generics.RetrieveAPIView):
     View to retrieve a user instance.
     """
     authentication_classes = (BasicAuthentication, )
-    queryset = User.objects.all()
+    queryset = User.objects.prefetch_related('harvester')
     serializer_class = UserSerializer
 
 
@@ -811,11 +1029,8 @@ class ConfigHarvesterView(LoginRequiredMixin, View,
                 "message": "There have been no changes!"
             })
 
-        message = response.data[harvester.name][HCCJC.HEALTH]["message"]
-        data["message"] = message
-        data["status"] = response.data[harvester.name][HCCJC.HEALTH]["status"]
-        if ("Cannot change value" in message) and ("Set parameter" in message):
-            data["status"] = "some issues"
+        data["status"], data["message"] = bulk_config.config_status(
+            response.data[harvester.name][HCCJC.HEALTH])
 
         return JsonResponse(data)
 
@@ -0,0 +1,105 @@
+"""
+This module holds the warm-up of the shared cache after a deploy. It is
+started in the background by ApiConfig.ready() of every server process, so
+the first dashboard loads are served at steady-state latency. Only one
+worker of a fleet warms the cache, the others find its lock.
+"""
+import logging
+import os
+import random
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection
+
+from api import harvester_cache
+
+__author__ = "Jan Frömberg"
+__copyright__ = "Copyright 2018, GeRDI Project"
+__credits__ = ["Jan Frömberg"]
+__license__ = "Apache 2.0"
+__maintainer__ = "Jan Frömberg"
+__email__ = "jan.froemberg@tu-dresden.de"
+
+# Get an instance of a logger
+LOGGER = logging.getLogger(__name__)
+
+# entry points (basename of argv[0]) of processes serving requests
+SERVERS = ('gunicorn', 'uvicorn', 'uwsgi', 'daphne')
+LOCK_KEY = "hcc:warmup:lock"
+# seconds one worker holds the warm-up for all workers
+LOCK_TTL = 60
+# maximum seconds a worker waits before its warm-up, so the workers
+# started at the same moment do not race for the lock
+JITTER = 5
+
+
+def is_server_process():
+    """
+    Return True if this process serves requests, i.e. it is a worker of a
+    known application server or the runserver child process. Management
+    commands, test runners and scripts are no server processes.
+    """
+    if os.path.basename(sys.argv[0]) in SERVERS:
+        return True
+    return 'runserver' in sys.argv and os.environ.get('RUN_MAIN') == 'true'
+
+
+def warm_up():
+    """
+    Warm the shared cache, unless another worker holds the warm-up lock:
+    compute the fleet summary, probe the library version (/versions) of
+    every enabled harvester concurrently and fetch the status of the
+    harvesters without a snapshot.
+
+    :return: the number of enabled harvesters, None if another worker
+        warms the cache
+    """
+    # avoid import cycles, the models are loaded when the app is ready
+    from api.harvester_api import InitHarvester, call_harvester_apis
+    from api.models import Harvester
+    from api.summary import get_summary
+
+    if not cache.add(LOCK_KEY, os.getpid(), LOCK_TTL):
+        LOGGER.debug("Warm-up skipped, another worker warms the cache.")
+        return None
+
+    harvesters = list(Harvester.objects.filter(enabled=True))
+    get_summary()
+
+    if harvesters:
+        workers = min(settings.HARVESTER_API_WORKERS, len(harvesters))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            list(executor.map(InitHarvester, harvesters))
+
+    snapshots = harvester_cache.get_snapshots(harvesters)
+    missing = [harvester for harvester in harvesters
+               if harvester.name not in snapshots]
+    call_harvester_apis(missing, 'harvester_status')
+    LOGGER.info("Warm-up done: %d harvesters, %d status snapshots fetched.",
+                len(harvesters), len(missing))
+    return len(harvesters)
+
+
+def run():
+    """Run the warm-up after a random delay, errors are logged only."""
+    try:
+        time.sleep(random.uniform(0, JITTER))
+        warm_up()
+    except Exception:
+        LOGGER.exception("Warm-up failed.")
+    finally:
+        connection.close()
+
+
+def start():
+    """Start the warm-up in a background thread, if it is enabled."""
+    if not settings.WARM_UP or not is_server_process():
+        return None
+    thread = threading.Thread(target=run, name='hcc-warm-up', daemon=True)
+    thread.start()
+    return thread
@@ -6,5 +6,21 @@ python3 manage.py makemigrations --noinput && python3 manage.py migrate
 #load initial auth data with user:gerdi pw:gerdigerdi
 python3 manage.py loaddata initial_superuser.json
 
+# keep the harvester status snapshots fresh (disable with HCC_POLLER=False)
+if [ "$HCC_POLLER" != "False" ]; then
+    python3 manage.py poll_harvesters &
+fi
+
+# HCC_SERVER=asgi serves the application with uvicorn workers,
+# otherwise sync WSGI workers are used (default)
+GUNICORN_WORKERS=${GUNICORN_WORKERS:-3}
+GUNICORN_THREADS=${GUNICORN_THREADS:-1}
+
 # service nginx start & Start Gunicorn processes
-nginx & gunicorn hcc_py.wsgi --bind 0.0.0.0:8000 --workers 3
+if [ "$HCC_SERVER" = "asgi" ]; then
+    nginx & gunicorn hcc_py.asgi:application --bind 0.0.0.0:8000 --workers $GUNICORN_WORKERS \
+        --worker-class uvicorn.workers.UvicornWorker
+else
+    nginx & gunicorn hcc_py.wsgi --bind 0.0.0.0:8000 --workers $GUNICORN_WORKERS \
+        --threads $GUNICORN_THREADS
+fi
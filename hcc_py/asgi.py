@@ -0,0 +1,30 @@
+"""
+ASGI config for hcc_py project.
+
+It exposes the ASGI callable as a module-level variable named ``application``.
+
+For more information on this file, see
+https://docs.djangoproject.com/en/3.0/howto/deployment/asgi/
+"""
+
+import os
+
+from django.core.asgi import get_asgi_application
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "hcc_py.settings")
+
+_application = get_asgi_application()
+
+
+async def application(scope, receive, send):
+    if scope['type'] == 'http':
+        headers = dict(scope['headers'])
+        script_name = headers.get(b'x-script-name', b'').decode('latin1')
+        if script_name:
+            scope = dict(scope, root_path=script_name)
+
+        scheme = headers.get(b'x-scheme', b'').decode('latin1')
+        if scheme:
+            scope = dict(scope, scheme=scheme)
+
+    await _application(scope, receive, send)
@@ -10,7 +10,11 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/2.0/ref/settings/
 """
 
+import atexit
 import os
+import shutil
+import sys
+import tempfile
 
 from django.contrib.messages import constants as message_constants
 
@@ -47,6 +51,12 @@ CSRF_TRUSTED_ORIGINS = os.environ.get('ALLOWED_HOSTS', 'localhost').split(',')
 
 # Logging configuration
 LOGLEVEL = os.environ.get('LOGLEVEL', 'info').upper()
+# Directory of the log files and the log search index,
+# test runs log into a temporary directory which is removed at exit
+LOG_DIR = os.environ.get('LOG_DIR', './log')
+if 'test' in sys.argv:
+    LOG_DIR = tempfile.mkdtemp(prefix='hcc-test-log-')
+    atexit.register(shutil.rmtree, LOG_DIR, True)
 LOGGING = {
     'version': 1,
     'disable_existing_loggers': False,
@@ -59,6 +69,9 @@ LOGGING = {
             'format': '{asctime} {levelname} {message}',
             'style': '{',
         },
+        'json': {
+            '()': 'api.structured_log.JSONFormatter',
+        },
     },
     'filters': {
         'require_debug_true': {
@@ -75,7 +88,7 @@ LOGGING = {
         'filedebug': {
             'class': 'logging.handlers.RotatingFileHandler',
             # 'filters': ['require_debug_true'],
-            'filename': './log/debug.log',
+            'filename': os.path.join(LOG_DIR, 'debug.log'),
             'maxBytes': 1024 * 1024 * 2,  # 2MB
             'backupCount': 3,
             'formatter': 'simple',
@@ -83,11 +96,20 @@ LOGGING = {
         'fileinfo': {
             'level': 'INFO',
             'class': 'logging.handlers.RotatingFileHandler',
-            'filename': './log/info.log',
+            'filename': os.path.join(LOG_DIR, 'info.log'),
             'maxBytes': 1024 * 1024 * 1,  # 1MB
             'backupCount': 3,
             'formatter': 'verbose',
         },
+        # structured logs, indexed for the log search (see LOG_INDEX)
+        'filejson': {
+            'level': 'INFO',
+            'class': 'logging.handlers.RotatingFileHandler',
+            'filename': os.path.join(LOG_DIR, 'hcc.jsonl'),
+            'maxBytes': 1024 * 1024 * 5,  # 5MB
+            'backupCount': 3,
+            'formatter': 'json',
+        },
     },
     'loggers': {
         '': {
@@ -95,13 +117,95 @@ LOGGING = {
             'level': LOGLEVEL,
         },
         'api': {
-            'handlers': ['filedebug'],
+            'handlers': ['filedebug', 'filejson'],
             'level': 'INFO',
             'propagate': True,
         },
     },
 }
 
+# Calls of harvesters and requests taking SLOW seconds or longer are logged
+# as warnings with their latency.
+STRUCTURED_LOG = {
+    'SLOW': float(os.environ.get('LOG_SLOW_SECONDS', 2)),
+}
+
+# Full text index of the structured logs for the log search,
+# lines older than MAX_AGE days are dropped.
+LOG_INDEX = {
+    'PATH': os.environ.get('LOG_INDEX_PATH',
+                           os.path.join(LOG_DIR, 'index.sqlite3')),
+    'MAX_AGE': int(os.environ.get('LOG_INDEX_MAX_AGE', 14)),
+    'MAX_RESULTS': 500,
+}
+
+# The handlers of LOGGING write from a listener thread, request threads
+# only queue their records. Records are dropped if more than MAX_SIZE
+# records are waiting, e.g. on a slow disk.
+LOGGING_CONFIG = 'api.log_queue.configure'
+LOG_QUEUE = {
+    'ENABLED': os.environ.get('LOG_QUEUE', 'True') == 'True',
+    'MAX_SIZE': int(os.environ.get('LOG_QUEUE_SIZE', 10000)),
+}
+
+# On-disk cache for harvester logs. Logs of past days are immutable and
+# will be served from this cache, today's log expires after TODAY_TTL seconds.
+HARVESTER_LOG_CACHE = {
+    'DIR': os.environ.get('HARVESTER_LOG_CACHE_DIR',
+                          os.path.join(BASE_DIR, 'cache/', 'logs')),
+    'MAX_SIZE': int(os.environ.get('HARVESTER_LOG_CACHE_MAX_SIZE',
+                                   1024 * 1024 * 50)),  # 50MB
+    'TODAY_TTL': int(os.environ.get('HARVESTER_LOG_CACHE_TODAY_TTL', 60)),
+}
+
+# Maximum number of concurrent requests to harvesters
+# for fleet-wide calls like status, start or stop of all harvesters
+HARVESTER_API_WORKERS = int(os.environ.get('HARVESTER_API_WORKERS', 16))
+
+# Central harvest scheduler of the poller: the HCC starts every enabled
+# harvester without a crontab of its own once a day, spread across a window
+# of WINDOW seconds from START (local time) with a random jitter of up to
+# JITTER seconds. Remove the crontabs of the harvesters to let the HCC
+# schedule them.
+HARVEST_SCHEDULE = {
+    'ENABLED': os.environ.get('HARVEST_SCHEDULE', 'False') == 'True',
+    'START': os.environ.get('HARVEST_WINDOW_START', '00:00'),
+    'WINDOW': int(os.environ.get('HARVEST_WINDOW', 6 * 60 * 60)),
+    'JITTER': int(os.environ.get('HARVEST_JITTER', 10 * 60)),
+}
+
+# Maximum number of concurrent harvests, globally and per owner (0: no limit).
+# Further starts are queued and started by the poller when harvests finish.
+# A start counts as running for START_GRACE seconds until the status shows it.
+HARVEST_CONCURRENCY = {
+    'MAX': int(os.environ.get('MAX_CONCURRENT_HARVESTS', 0)),
+    'MAX_PER_OWNER': int(os.environ.get('MAX_CONCURRENT_HARVESTS_PER_OWNER', 0)),
+    'START_GRACE': int(os.environ.get('HARVEST_START_GRACE', 2 * 60)),
+}
+
+# ETA of harvests without a remainingHarvestTime: smoothing factor of the
+# throughput, min. seconds between two samples and lifetime of the samples
+HARVEST_ETA = {
+    'ALPHA': float(os.environ.get('HARVEST_ETA_ALPHA', 0.3)),
+    'MIN_INTERVAL': 2,
+    'TTL': 60 * 60,
+}
+
+# Readiness check (health/ready): max. age in seconds of the poller
+# heartbeat and of its last poll, skipped if the poller is disabled
+HEALTH = {
+    'POLLER': os.environ.get('HCC_POLLER', 'True') != 'False',
+    'HEARTBEAT_MAX_AGE': int(os.environ.get('HEALTH_HEARTBEAT_MAX_AGE', 60)),
+    'SNAPSHOT_MAX_AGE': int(os.environ.get('HEALTH_SNAPSHOT_MAX_AGE', 2 * 5 * 60)),
+}
+
+# Warm the shared cache in the background of one fresh server worker
+# (harvester versions, status snapshots and the dashboard summary)
+WARM_UP = os.environ.get('HCC_WARM_UP', 'True') == 'True'
+
+# Number of harvesters per page of the dashboard (card, list and table view)
+DASHBOARD_PAGE_SIZE = int(os.environ.get('DASHBOARD_PAGE_SIZE', 50))
+
 # Configure Django to run in subpath
 # https://docs.djangoproject.com/en/2.0/ref/settings/#std:setting-FORCE_SCRIPT_NAME
 FORCE_SCRIPT_NAME = os.environ.get('FORCE_SCRIPT_NAME', '')
@@ -123,7 +227,7 @@ INSTALLED_APPS = [
     'django.contrib.messages',
     'django.contrib.staticfiles',
     'rest_framework',
-    'api',
+    'api.apps.ApiConfig',
     'rest_framework.authtoken',
     'drf_yasg',
     'crispy_forms',
@@ -150,7 +254,7 @@ REST_FRAMEWORK = {
     ),
     'DEFAULT_AUTHENTICATION_CLASSES': (
         'rest_framework.authentication.SessionAuthentication',
-        'rest_framework.authentication.TokenAuthentication',
+        'api.authentication.CachedTokenAuthentication',
     ),
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'DEFAULT_SCHEMA_CLASS': 'rest_framework.schemas.coreapi.AutoSchema',
@@ -163,10 +267,15 @@ MIDDLEWARE = [
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'api.structured_log.RequestLogMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
+# gzip JSON responses in Django, e.g. if there is no nginx in front of it
+if os.environ.get('GZIP_JSON_RESPONSES', 'True') == 'True':
+    MIDDLEWARE.insert(1, 'api.middleware.JSONGZipMiddleware')
+
 MESSAGE_STORAGE = 'django.contrib.messages.storage.fallback.FallbackStorage'
 
 MESSAGE_TAGS = {
@@ -198,6 +307,7 @@ TEMPLATES = [
 ]
 
 WSGI_APPLICATION = 'hcc_py.wsgi.application'
+ASGI_APPLICATION = 'hcc_py.asgi.application'
 
 
 # Database
@@ -213,6 +323,74 @@ DATABASES = {
 }
 
 
+# Cache shared by all worker processes for harvester status snapshots,
+# library versions and configuration data. The file based default needs no
+# external service. Set CACHE_BACKEND and CACHE_LOCATION to use memcached
+# (django.core.cache.backends.memcached.MemcachedCache) or redis
+# (django_redis.cache.RedisCache) instead.
+CACHES = {
+    'default': {
+        'BACKEND': os.environ.get(
+            'CACHE_BACKEND',
+            'django.core.cache.backends.filebased.FileBasedCache'),
+        'LOCATION': os.environ.get(
+            'CACHE_LOCATION',
+            os.path.join(BASE_DIR, 'cache/', 'shared')),
+    }
+}
+
+# Concurrent identical GET requests to a harvester share one request.
+# With SHARED they are also shared across worker processes via the cache:
+# the others WAIT seconds for the result, which is kept for RESULT_TTL seconds.
+SINGLE_FLIGHT = {
+    'SHARED': os.environ.get('SINGLE_FLIGHT_SHARED', 'False') == 'True',
+    'WAIT': 10,
+    'RESULT_TTL': 1,
+    'POLL': 0.05,
+}
+
+# The users of API tokens are cached for TTL seconds in the shared cache
+# and for LOCAL_TTL seconds in an LRU of LOCAL_SIZE tokens per process.
+# Deleted tokens and changed users are dropped immediately, other worker
+# processes may accept them for LOCAL_TTL seconds.
+TOKEN_CACHE = {
+    'TTL': int(os.environ.get('TOKEN_CACHE_TTL', 5 * 60)),
+    'LOCAL_TTL': int(os.environ.get('TOKEN_CACHE_LOCAL_TTL', 5)),
+    'LOCAL_SIZE': 1024,
+}
+
+# Time to live of the shared harvester cache entries in seconds
+HCC_CACHE_TTL = {
+    'SNAPSHOT': int(os.environ.get('CACHE_TTL_SNAPSHOT', 10)),
+    # snapshots pushed by harvesters, polling is the fallback afterwards
+    'PUSHED': int(os.environ.get('CACHE_TTL_PUSHED', 5 * 60)),
+    # expired snapshots are served while they are refreshed in the background
+    'MAX_STALE': int(os.environ.get('CACHE_TTL_MAX_STALE', 2 * 60)),
+    'VERSION': int(os.environ.get('CACHE_TTL_VERSION', 60 * 60)),
+    # failed version detections, e.g. unreachable harvesters
+    'VERSION_UNKNOWN': int(os.environ.get('CACHE_TTL_VERSION_UNKNOWN', 30)),
+    'CONFIG': int(os.environ.get('CACHE_TTL_CONFIG', 5 * 60)),
+    # flattened configs of the config diff, kept short to spot changes
+    'FLAT_CONFIG': int(os.environ.get('CACHE_TTL_FLAT_CONFIG', 30)),
+    # fleet summary (counts, states, document totals) of the dashboard
+    'SUMMARY': int(os.environ.get('CACHE_TTL_SUMMARY', 10)),
+}
+
+
+# Intervals (in seconds) of the adaptive status poller (manage.py poll_harvesters)
+POLL_INTERVALS = {
+    # harvesting, queued or initializing harvesters
+    'ACTIVE': int(os.environ.get('POLL_INTERVAL_ACTIVE', 5)),
+    # idle harvesters, unless their next harvest starts earlier
+    'IDLE': int(os.environ.get('POLL_INTERVAL_IDLE', 5 * 60)),
+    # first retry of unreachable harvesters, doubled on every failure
+    'UNREACHABLE': int(os.environ.get('POLL_INTERVAL_UNREACHABLE', 10)),
+    'MAX': int(os.environ.get('POLL_INTERVAL_MAX', 60 * 60)),
+    # how often the poller looks for due harvesters
+    'TICK': 1,
+}
+
+
 # Password validation
 # https://docs.djangoproject.com/en/2.0/ref/settings/#auth-password-validators
 
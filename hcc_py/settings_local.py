@@ -5,6 +5,12 @@ from hcc_py.settings import *  # noqa: F401, F403
 
 if 'test' in sys.argv:
     logging.disable(logging.CRITICAL)
+    # never share cached harvester data between test runs
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
 
 # SECURITY WARNING: don't run with debug turned on in production!
 DEBUG = True
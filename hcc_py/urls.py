@@ -58,6 +58,8 @@ SCHEMA_VIEW = get_schema_view(
 urlpatterns = [
     path('', views.index, name='home'),
     path('hcc/', views.home, name='hcc_gui'),
+    path('health/live', views.liveness, name='health-live'),
+    path('health/ready', views.readiness, name='health-ready'),
     path('hcc/updatesession', views.update_session, name='update-session'),
     path('hcc/<str:name>/etls', views.harvester_status_history, name='etls'),
     path(
@@ -92,7 +94,9 @@ urlpatterns = [
     path('hcc/startall', views.start_all_harvesters, name='start-harvesters'),
     path('hcc/abortall', views.abort_all_harvesters, name='abort-harvesters'),
     path('hcc/logs', views.get_all_harvester_log, name='harvesters-log'),
+    path('hcc/configdiff', views.harvester_config_diff, name='config-diff'),
     path('hcc/hcclog', views.get_hcc_log, name='hcc-log'),
+    path('hcc/hcclog/search', views.hcc_log_search, name='hcc-log-search'),
     path(
         'hcc/<str:name>/progress',
         views.get_harvester_progress,